@@ -0,0 +1,45 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""First-call latency of the solvers, with and without a compilation cache."""
+from typing import Callable
+
+import jax.numpy as jnp
+
+from ott.geometry import pointcloud
+from ott.solvers import linear, quadratic
+
+NUM_POINTS = 1_000
+
+
+def bench_cold_linear_solve(run_cold: Callable, points: Callable):
+  """First call of the linear solver on a point cloud."""
+  x, y = points(NUM_POINTS, 2)
+
+  def solve(x: jnp.ndarray, y: jnp.ndarray) -> jnp.ndarray:
+    geom = pointcloud.PointCloud(x, y)
+    return linear.solve(geom).reg_ot_cost
+
+  _ = run_cold(solve, x, y)
+
+
+def bench_cold_quadratic_solve(run_cold: Callable, points: Callable):
+  """First call of the Gromov-Wasserstein solver on two point clouds."""
+  x, y = points(NUM_POINTS // 4, 2)
+
+  def solve(x: jnp.ndarray, y: jnp.ndarray) -> jnp.ndarray:
+    geom_xx = pointcloud.PointCloud(x)
+    geom_yy = pointcloud.PointCloud(y)
+    return quadratic.solve(geom_xx, geom_yy).reg_gw_cost
+
+  _ = run_cold(solve, x, y)
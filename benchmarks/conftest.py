@@ -0,0 +1,178 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Shared fixtures of the benchmarks.
+
+Every benchmark compiles its function ahead of time and only times the
+execution of the compiled function, so that the steady-state runtime is
+reported separately from the tracing and compilation times. The latter, along
+with the memory footprint, are stored in the ``extra_info`` of the
+benchmarks, which is written to the JSON report of ``--benchmark-json``.
+The cold-start benchmarks instead time the first call, compilation included,
+and are meant to be run with and without ``--compilation-cache-dir``.
+"""
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pytest
+
+import jax
+import jax.numpy as jnp
+
+from ott import utils
+
+SIZES = (1_000, 10_000, 100_000)
+DIMS = (2, 16, 64)
+
+Points = Tuple[jnp.ndarray, jnp.ndarray]
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+  """Add the ``--max-size`` and ``--compilation-cache-dir`` options."""
+  parser.addoption(
+      "--max-size",
+      type=int,
+      default=10_000,
+      help="Skip the benchmarks with more points.",
+  )
+  parser.addoption(
+      "--compilation-cache-dir",
+      default=None,
+      help="Enable the persistent compilation cache in this directory.",
+  )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+  """Enable the compilation cache, before any function is compiled."""
+  cache_dir = config.getoption("--compilation-cache-dir")
+  if cache_dir is not None:
+    utils.enable_compilation_cache(cache_dir)
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+  """Run the benchmarks taking ``n`` and ``dim`` across all sizes and dims."""
+  if "n" in metafunc.fixturenames:
+    metafunc.parametrize("n", SIZES)
+  if "dim" in metafunc.fixturenames:
+    metafunc.parametrize("dim", DIMS)
+
+
+@pytest.fixture()
+def max_size(request: pytest.FixtureRequest) -> int:
+  """Largest number of points, set by ``--max-size``."""
+  return request.config.getoption("--max-size")
+
+
+@pytest.fixture()
+def check_size(max_size: int) -> Callable[[int], None]:
+  """Skip a benchmark whose size is larger than ``--max-size``."""
+
+  def check(n: int) -> None:
+    if n > max_size:
+      pytest.skip(f"Size `{n}` is larger than `--max-size={max_size}`.")
+
+  return check
+
+
+@pytest.fixture()
+def run_jitted(benchmark) -> Callable[..., Any]:
+  """Benchmark the steady-state runtime of a jitted function.
+
+  The returned function compiles ``fn`` for ``args`` ahead of time, records
+  the tracing and compilation times and the memory footprint, runs the
+  compiled function once to warm up, and only then benchmarks it.
+  """
+
+  def run(fn: Callable[..., Any], *args: Any) -> Any:
+    start = time.perf_counter()
+    lowered = jax.jit(fn).lower(*args)
+    traced = time.perf_counter()
+    compiled = lowered.compile()
+    done = time.perf_counter()
+
+    benchmark.extra_info["backend"] = jax.default_backend()
+    benchmark.extra_info["trace_time"] = traced - start
+    benchmark.extra_info["compile_time"] = done - traced
+    benchmark.extra_info.update(_memory_info(compiled))
+
+    jax.block_until_ready(compiled(*args))
+    out = benchmark(lambda: jax.block_until_ready(compiled(*args)))
+
+    peak = _device_peak_bytes()
+    if peak is not None:
+      benchmark.extra_info["device_peak_bytes"] = peak
+    return out
+
+  return run
+
+
+@pytest.fixture()
+def run_cold(benchmark) -> Callable[..., Any]:
+  """Benchmark the first call of a jitted function, including compilation.
+
+  The in-memory caches of JAX are cleared before each round, so that every
+  round traces and compiles ``fn``, or loads it from the persistent
+  compilation cache, if enabled with ``--compilation-cache-dir``.
+  """
+
+  def run(fn: Callable[..., Any], *args: Any) -> Any:
+    cache_dir = jax.config.jax_compilation_cache_dir
+    benchmark.extra_info["backend"] = jax.default_backend()
+    benchmark.extra_info["compilation_cache"] = cache_dir is not None
+    return benchmark.pedantic(
+        lambda: jax.block_until_ready(jax.jit(fn)(*args)),
+        setup=jax.clear_caches,
+        rounds=5,
+        warmup_rounds=1,
+    )
+
+  return run
+
+
+@pytest.fixture()
+def points(check_size: Callable[[int], None]) -> Callable[..., Points]:
+  """Two Gaussian point clouds with ``n`` points in dimension ``dim``."""
+
+  def sample(n: int, dim: int, seed: int = 0) -> Points:
+    check_size(n)
+    rng_x, rng_y = jax.random.split(jax.random.key(seed))
+    x = jax.random.normal(rng_x, (n, dim))
+    y = jax.random.normal(rng_y, (n, dim)) + 0.5
+    return x, y
+
+  return sample
+
+
+def _memory_info(compiled: jax.stages.Compiled) -> Dict[str, int]:
+  """Memory footprint of a compiled function, as estimated by XLA."""
+  try:
+    analysis = compiled.memory_analysis()
+  except NotImplementedError:
+    return {}
+  if analysis is None:
+    return {}
+  info = {
+      "argument_bytes": analysis.argument_size_in_bytes,
+      "output_bytes": analysis.output_size_in_bytes,
+      "temp_bytes": analysis.temp_size_in_bytes,
+  }
+  info["peak_bytes"] = sum(info.values())
+  return info
+
+
+def _device_peak_bytes() -> Optional[int]:
+  """Peak memory in use on the default device, not available on CPU."""
+  stats = jax.devices()[0].memory_stats()
+  if stats is None:
+    return None
+  return stats.get("peak_bytes_in_use")
@@ -0,0 +1,41 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Applications of the kernel of a point cloud, the hot path of Sinkhorn."""
+from typing import Callable, Optional, Tuple
+
+import pytest
+
+import jax.numpy as jnp
+
+from ott.geometry import pointcloud
+
+
+@pytest.mark.parametrize("axis", [0, 1])
+@pytest.mark.parametrize("batch_size", [None, 1024])
+def bench_apply_lse_kernel(
+    run_jitted: Callable, points: Callable, n: int, dim: int,
+    batch_size: Optional[int], axis: int
+):
+  """Log-sum-exp kernel application, with and without batching."""
+  if batch_size is None and n > 10_000:
+    pytest.skip("The cost matrix does not fit in memory.")
+  x, y = points(n, dim)
+  f, g = jnp.zeros(n), jnp.zeros(n)
+
+  def apply(x: jnp.ndarray, y: jnp.ndarray, f: jnp.ndarray,
+            g: jnp.ndarray) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    geom = pointcloud.PointCloud(x, y, epsilon=1e-1, batch_size=batch_size)
+    return geom.apply_lse_kernel(f, g, geom.epsilon, axis=axis)
+
+  _ = run_jitted(apply, x, y, f, g)
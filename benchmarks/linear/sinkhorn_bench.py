@@ -0,0 +1,73 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Sinkhorn iterations in the log and kernel domains, on point clouds."""
+from typing import Callable, Optional
+
+import pytest
+
+import jax
+import jax.numpy as jnp
+
+from ott.geometry import pointcloud
+from ott.problems.linear import linear_problem
+from ott.solvers.linear import sinkhorn, sinkhorn_lr
+
+# a fixed number of iterations, so that all runs do the same work
+NUM_ITERATIONS = 100
+
+
+@pytest.mark.parametrize("batch_size", [None, 1024])
+@pytest.mark.parametrize("lse_mode", [True, False])
+def bench_sinkhorn(
+    run_jitted: Callable, points: Callable, n: int, dim: int, lse_mode: bool,
+    batch_size: Optional[int]
+):
+  """Fixed number of Sinkhorn iterations on two point clouds."""
+  if batch_size is None and n > 10_000:
+    pytest.skip("The cost matrix does not fit in memory.")
+  x, y = points(n, dim)
+  solver = sinkhorn.Sinkhorn(
+      lse_mode=lse_mode,
+      inner_iterations=10,
+      min_iterations=NUM_ITERATIONS,
+      max_iterations=NUM_ITERATIONS,
+  )
+
+  def solve(x: jnp.ndarray, y: jnp.ndarray) -> sinkhorn.SinkhornOutput:
+    geom = pointcloud.PointCloud(x, y, batch_size=batch_size)
+    return solver(linear_problem.LinearProblem(geom))
+
+  out = run_jitted(solve, x, y)
+  assert out.n_iters == NUM_ITERATIONS
+
+
+@pytest.mark.parametrize("rank", [2, 10])
+def bench_lr_sinkhorn(
+    run_jitted: Callable, points: Callable, n: int, dim: int, rank: int
+):
+  """Fixed number of low-rank Sinkhorn iterations on two point clouds."""
+  x, y = points(n, dim)
+  solver = sinkhorn_lr.LRSinkhorn(
+      rank=rank,
+      inner_iterations=10,
+      min_iterations=NUM_ITERATIONS,
+      max_iterations=NUM_ITERATIONS,
+  )
+
+  def solve(x: jnp.ndarray, y: jnp.ndarray) -> sinkhorn_lr.LRSinkhornOutput:
+    geom = pointcloud.PointCloud(x, y)
+    prob = linear_problem.LinearProblem(geom)
+    return solver(prob, rng=jax.random.key(0))
+
+  _ = run_jitted(solve, x, y)
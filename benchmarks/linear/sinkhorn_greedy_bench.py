@@ -0,0 +1,72 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Greedy block-coordinate updates against full Sinkhorn sweeps.
+
+The benchmarked problem is a warm restart: the potentials of a solved problem
+are used to initialize a problem in which only a few weights have changed,
+so that most marginal constraints are already satisfied.
+"""
+from typing import Callable, Optional, Tuple
+
+import pytest
+
+import jax
+import jax.numpy as jnp
+
+from ott.geometry import pointcloud
+from ott.problems.linear import linear_problem
+from ott.solvers.linear import sinkhorn, sinkhorn_greedy
+
+Problem = Tuple[linear_problem.LinearProblem, Tuple[jnp.ndarray, jnp.ndarray]]
+
+
+@pytest.fixture(scope="module", params=[1024, 4096])
+def problem(request) -> Problem:
+  """Warm restart of a solved problem in which a few weights changed."""
+  n = request.param
+  rng_x, rng_y, rng_ids = jax.random.split(jax.random.key(0), 3)
+  x = jax.random.normal(rng_x, (n, 3))
+  y = jax.random.normal(rng_y, (n, 3)) + 0.5
+  geom = pointcloud.PointCloud(x, y, epsilon=1e-2)
+
+  out = sinkhorn.Sinkhorn(threshold=1e-5)(linear_problem.LinearProblem(geom))
+  # move the mass of a few points
+  ids = jax.random.choice(rng_ids, n, (16,), replace=False)
+  a = jnp.ones(n).at[ids].set(4.0)
+  prob = linear_problem.LinearProblem(geom, a=a / a.sum())
+  return prob, (out.f, out.g)
+
+
+@pytest.mark.parametrize("block_size", [None, 16, 128])
+def bench_warm_restart(
+    benchmark, run_jitted: Callable, problem: Problem, block_size: Optional[int]
+):
+  """Greedy or full Sinkhorn updates on a warm restart, until convergence."""
+  prob, init = problem
+  n, m = prob.geom.shape
+  if block_size is None:
+    solver = sinkhorn.Sinkhorn(max_iterations=20000)
+    # two sweeps per iteration, one more per error computation
+    entries_per_iter = 2 * n * m + n * m / solver.inner_iterations
+  else:
+    solver = sinkhorn_greedy.GreedySinkhorn(
+        block_size=block_size, inner_iterations=100, max_iterations=20000
+    )
+    # the marginals are refreshed with two sweeps per error computation
+    entries_per_iter = block_size * (n + m) + 2 * n * m / 100
+
+  out = run_jitted(lambda prob, init: solver(prob, init=init), prob, init)
+  benchmark.extra_info["converged"] = bool(out.converged)
+  benchmark.extra_info["n_iters"] = int(out.n_iters)
+  benchmark.extra_info["cost_entries"] = int(out.n_iters * entries_per_iter)
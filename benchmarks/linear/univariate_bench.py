@@ -0,0 +1,42 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Univariate solvers, applied to each dimension of the point clouds."""
+from typing import Callable
+
+import pytest
+
+import jax.numpy as jnp
+
+from ott.geometry import pointcloud
+from ott.solvers import linear
+from ott.solvers.linear import univariate
+
+
+@pytest.mark.parametrize("uniform", [True, False])
+def bench_solve_univariate(
+    run_jitted: Callable, points: Callable, n: int, dim: int, uniform: bool
+):
+  """Univariate solver with uniform or non-uniform weights."""
+  x, y = points(n, dim)
+  # non-uniform weights use the quantile solver
+  a = jnp.ones(n) if uniform else jnp.linspace(1.0, 2.0, n)
+  a = a / jnp.sum(a)
+
+  def solve(
+      x: jnp.ndarray, y: jnp.ndarray, a: jnp.ndarray
+  ) -> univariate.UnivariateOutput:
+    geom = pointcloud.PointCloud(x, y)
+    return linear.solve_univariate(geom, a=a)
+
+  _ = run_jitted(solve, x, y, a)
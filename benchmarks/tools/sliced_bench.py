@@ -0,0 +1,38 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Sliced Wasserstein distances with random projections."""
+from typing import Callable
+
+import pytest
+
+import jax
+import jax.numpy as jnp
+
+from ott.tools import sliced
+
+
+@pytest.mark.parametrize("n_proj", [16, 256])
+def bench_sliced_wasserstein(
+    run_jitted: Callable, points: Callable, n: int, dim: int, n_proj: int
+):
+  """Sliced Wasserstein distance with ``n_proj`` projections."""
+  x, y = points(n, dim)
+
+  def distance(x: jnp.ndarray, y: jnp.ndarray) -> jnp.ndarray:
+    cost, _ = sliced.sliced_wasserstein(
+        x, y, n_proj=n_proj, rng=jax.random.key(0)
+    )
+    return cost
+
+  _ = run_jitted(distance, x, y)
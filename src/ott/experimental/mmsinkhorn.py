@@ -18,6 +18,7 @@ import jax.numpy as jnp
 import jax.tree_util as jtu
 import numpy as np
 
+from ott import utils
 from ott.geometry import costs, epsilon_scheduler, pointcloud
 from ott.math import fixed_point_loop
 from ott.math import utils as mu
@@ -231,6 +232,8 @@ class MMSinkhorn:
       gradients have been stopped. This is useful when carrying out first order
       differentiation, and is only valid mathematically when the algorithm has
       converged with a low tolerance.
+    telemetry: Channel receiving the error and :math:`\varepsilon` every time
+      the error is computed. See :class:`~ott.utils.Telemetry`.
   """
 
   def __init__(
@@ -241,6 +244,7 @@ class MMSinkhorn:
       min_iterations: int = 0,
       max_iterations: int = 2000,
       use_danskin: bool = True,
+      telemetry: Optional[utils.Telemetry] = None,
   ):
     self.threshold = threshold
     self.inner_iterations = inner_iterations
@@ -248,6 +252,7 @@ class MMSinkhorn:
     self.max_iterations = max_iterations
     self.norm_error = norm_error
     self.use_danskin = use_danskin
+    self.telemetry = telemetry
 
   def __call__(
       self,
@@ -392,6 +397,16 @@ def run(
         lambda *_: jnp.inf, state, cost_t, a_s, epsilon
     )
     errors = state.errors.at[iteration // solver.inner_iterations, :].set(err)
+    if solver.telemetry is not None and compute_error is not False:
+      solver.telemetry.record(
+          type(solver).__name__,
+          iteration // solver.inner_iterations, {
+              "iteration": iteration,
+              "error": err,
+              "epsilon": epsilon,
+          },
+          when=compute_error
+      )
     return state.set(errors=errors)
 
   fix_point = fixed_point_loop.fixpoint_iter_backprop
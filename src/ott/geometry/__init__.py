@@ -19,8 +19,11 @@ from . import (
     geometry,
     graph,
     grid,
+    neighbors,
     pointcloud,
     regularizers,
     segment,
     semidiscrete_pointcloud,
+    sharded,
+    truncated,
 )
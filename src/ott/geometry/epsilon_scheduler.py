@@ -16,7 +16,7 @@ from typing import Optional
 import jax.numpy as jnp
 import jax.tree_util as jtu
 
-__all__ = ["Epsilon", "DEFAULT_EPSILON_SCALE"]
+__all__ = ["Epsilon", "AdaptiveEpsilon", "DEFAULT_EPSILON_SCALE"]
 
 #: Scaling applied to statistic (mean/std) of cost to compute default epsilon.
 DEFAULT_EPSILON_SCALE = 0.05
@@ -71,3 +71,74 @@ class Epsilon:
   @classmethod
   def tree_unflatten(cls, aux_data, children):  # noqa: D102
     return cls(*children, **aux_data)
+
+
+@jtu.register_pytree_node_class
+class AdaptiveEpsilon(Epsilon):
+  r"""Scheduler that decreases epsilon once the solver has converged.
+
+  Rather than decaying the multiple of the ``target`` at every iteration, the
+  multiple is only decayed, by a factor ``decay``, once the error of the solver
+  at the current regularization drops below ``tol``. The current multiple is
+  part of the solver's state, e.g.,
+  :class:`~ott.solvers.linear.sinkhorn.SinkhornState`, which is initialized
+  with :meth:`init_multiple` and updated with :meth:`update_multiple`.
+
+  When called with an iteration number, e.g., by solvers that do not carry its
+  state, this scheduler falls back to the geometric decay of
+  :class:`~ott.geometry.epsilon_scheduler.Epsilon`.
+
+  Args:
+    target: The epsilon regularizer that is targeted.
+    init: Initial value, understood as a multiple of the ``target``.
+    decay: Geometric decay factor, :math:`< 1` if ``init > 1``.
+    tol: Tolerance on the error below which the multiple is decayed.
+  """
+
+  def __init__(
+      self,
+      target: jnp.array,
+      init: float = 1.0,
+      decay: float = 0.5,
+      tol: float = 1e-2,
+  ):
+    super().__init__(target, init=init, decay=decay)
+    assert init <= 1.0 or decay < 1.0, \
+        f"Decay must be < 1 when init > 1, found {decay}."
+    self.tol = tol
+
+  def init_multiple(self) -> jnp.ndarray:
+    """Initial multiple of the :attr:`target`."""
+    return jnp.maximum(jnp.asarray(self.init, dtype=float), 1.0)
+
+  def update_multiple(
+      self, multiple: jnp.ndarray, error: jnp.ndarray
+  ) -> jnp.ndarray:
+    """Decay the multiple if the error is below the tolerance.
+
+    Args:
+      multiple: Current multiple of the :attr:`target`.
+      error: Error of the solver at the current regularization.
+
+    Returns:
+      The updated multiple, which is never smaller than :math:`1`.
+    """
+    decayed = jnp.maximum(multiple * self.decay, 1.0)
+    return jnp.where(error < self.tol, decayed, multiple)
+
+  def at(self, multiple: jnp.ndarray) -> jnp.ndarray:
+    """Regularizer value at a given multiple of the :attr:`target`."""
+    return multiple * self.target
+
+  def __repr__(self) -> str:
+    return (
+        f"{self.__class__.__name__}(target={self.target:.4f}, "
+        f"init={self.init:.4f}, decay={self.decay:.4f}, tol={self.tol:.4f})"
+    )
+
+  def tree_flatten(self):  # noqa: D102
+    return (self.target,), {
+        "init": self.init,
+        "decay": self.decay,
+        "tol": self.tol
+    }
@@ -133,6 +133,7 @@ class Geodesic(geometry.Geometry):
         **kwargs
     )
 
+  @geometry._counted("kernel")
   def apply_kernel(
       self,
       vec: jnp.ndarray,
@@ -153,6 +154,23 @@ class Geodesic(geometry.Geometry):
         self.scaled_laplacian, vec, self.chebyshev_coeffs, 0.5 * self.eigval
     )
 
+  def _evaluation_stats(
+      self, evaluation: geometry.Evaluation, num_vecs: int
+  ) -> geometry.KernelStats:
+    if evaluation != "kernel":
+      return super()._evaluation_stats(evaluation, num_vecs)
+    n, _ = self.shape
+    itemsize = jnp.dtype(self.dtype).itemsize
+    laplacian = self.scaled_laplacian
+    nnz = laplacian.nse if isinstance(laplacian, jesp.BCOO) else n ** 2
+    # 1 product with the Laplacian per Chebyshev polynomial
+    order = self.chebyshev_coeffs.shape[0]
+    return geometry._stats(
+        evaluation,
+        flops=2 * order * nnz * num_vecs,
+        num_bytes=itemsize * order * (nnz + 2 * n * num_vecs),
+    )
+
   @property
   def kernel_matrix(self) -> jnp.ndarray:  # noqa: D102
     n, _ = self.shape
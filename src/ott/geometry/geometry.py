@@ -11,8 +11,21 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import contextlib
 import functools
-from typing import TYPE_CHECKING, Any, Callable, Literal, Optional, Tuple, Union
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 if TYPE_CHECKING:
   from ott.geometry import low_rank
@@ -21,12 +34,157 @@ import jax
 import jax.numpy as jnp
 import jax.scipy as jsp
 import jax.tree_util as jtu
+import numpy as np
 
 from ott import utils
 from ott.geometry import epsilon_scheduler as eps_scheduler
 from ott.math import utils as mu
 
-__all__ = ["Geometry"]
+__all__ = ["Geometry", "KernelStats", "StatsTracker", "track_stats"]
+
+Evaluation = Literal["lse_kernel", "kernel", "cost"]
+
+
+class KernelStats(NamedTuple):
+  """Number of evaluations of the kernel and of the cost.
+
+  The number of floating point operations and of bytes are estimated from the
+  shapes of the geometry, see :func:`track_stats`.
+
+  Args:
+    num_lse_kernel: Number of calls to
+      :meth:`~ott.geometry.geometry.Geometry.apply_lse_kernel`.
+    num_kernel: Number of calls to
+      :meth:`~ott.geometry.geometry.Geometry.apply_kernel`.
+    num_cost: Number of calls to
+      :meth:`~ott.geometry.geometry.Geometry.apply_cost`.
+    flops: Estimated number of floating point operations.
+    num_bytes: Estimated number of bytes read from memory.
+  """
+  num_lse_kernel: Union[int, jnp.ndarray] = 0
+  num_kernel: Union[int, jnp.ndarray] = 0
+  num_cost: Union[int, jnp.ndarray] = 0
+  flops: Union[float, jnp.ndarray] = 0.0
+  num_bytes: Union[float, jnp.ndarray] = 0.0
+
+  @classmethod
+  def zeros(cls) -> "KernelStats":
+    """Statistics with zero arrays, used as the initial value of a loop."""
+    ints = [jnp.zeros((), dtype=int) for _ in range(3)]
+    return cls(*ints, jnp.zeros(()), jnp.zeros(()))
+
+  def add(
+      self,
+      other: "KernelStats",
+      where: Union[bool, jnp.ndarray] = True
+  ) -> "KernelStats":
+    """Add statistics.
+
+    Args:
+      other: Statistics to add.
+      where: Whether to add ``other``, can be traced.
+
+    Returns:
+      The summed statistics.
+    """
+    if where is not True:
+      other = jtu.tree_map(lambda x: jnp.where(where, x, 0), other)
+    return KernelStats(*(x + y for x, y in zip(self, other)))
+
+
+class StatsTracker:
+  """Statistics of the evaluations traced within :func:`track_stats`."""
+
+  def __init__(self):
+    self.stats = KernelStats()
+
+
+_TRACKING = threading.local()
+
+
+@contextlib.contextmanager
+def track_stats() -> Iterator[StatsTracker]:
+  """Track the evaluations of the kernel and of the cost.
+
+  The calls to :meth:`~ott.geometry.geometry.Geometry.apply_lse_kernel`,
+  :meth:`~ott.geometry.geometry.Geometry.apply_kernel` and
+  :meth:`~ott.geometry.geometry.Geometry.apply_cost` are counted when they
+  are traced, along with an estimate of the number of floating point
+  operations and of bytes read, which depends on the type of the geometry,
+  e.g., a :class:`~ott.geometry.pointcloud.PointCloud` which computes its cost
+  on the fly does not read a cost matrix. Calls made by another one, e.g.,
+  by a geometry to the kernel of a sub-geometry, are not counted.
+
+  The calls are counted when they are traced, not when they are executed:
+  a function traced once but executed several times, such as the body of a
+  :func:`~jax.lax.scan` or :func:`~jax.lax.while_loop`, is counted once, and a
+  call to a :func:`~jax.jit`-compiled function whose trace is cached is not
+  counted at all. The caller must accumulate the statistics of such functions
+  in the traced computation, as
+  :attr:`~ott.solvers.linear.sinkhorn.Sinkhorn.track_stats` does with the
+  body of its loop. This makes the tracking free at run time and leaves the
+  numerics unchanged.
+
+  Yields:
+    The tracker, whose :attr:`StatsTracker.stats` are updated in the context.
+  """
+  trackers = _trackers()
+  tracker = StatsTracker()
+  trackers.append(tracker)
+  try:
+    yield tracker
+  finally:
+    trackers.remove(tracker)
+
+
+def _trackers() -> List[StatsTracker]:
+  if not hasattr(_TRACKING, "trackers"):
+    _TRACKING.trackers = []
+    _TRACKING.depth = 0
+  return _TRACKING.trackers
+
+
+def _counted(evaluation: Evaluation) -> Callable[[Callable], Callable]:
+  """Count the outermost calls of a method in the active trackers."""
+
+  def decorator(fn: Callable) -> Callable:
+
+    @functools.wraps(fn)
+    def wrapper(self: "Geometry", *args: Any, **kwargs: Any) -> Any:
+      trackers = _trackers()
+      if not trackers:
+        return fn(self, *args, **kwargs)
+
+      outermost = _TRACKING.depth == 0
+      _TRACKING.depth += 1
+      try:
+        out = fn(self, *args, **kwargs)
+      finally:
+        _TRACKING.depth -= 1
+
+      if outermost:
+        arr = args[0] if args else next(iter(kwargs.values()))
+        num_vecs = int(np.prod(jnp.shape(arr)[1:]))
+        stats = self._evaluation_stats(evaluation, num_vecs)
+        for tracker in trackers:
+          tracker.stats = tracker.stats.add(stats)
+      return out
+
+    return wrapper
+
+  return decorator
+
+
+def _stats(
+    evaluation: Evaluation, flops: float, num_bytes: float
+) -> KernelStats:
+  return KernelStats(
+      num_lse_kernel=int(evaluation == "lse_kernel"),
+      num_kernel=int(evaluation == "kernel"),
+      num_cost=int(evaluation == "cost"),
+      flops=float(flops),
+      num_bytes=float(num_bytes),
+  )
 
 
 @jtu.register_pytree_node_class
@@ -204,6 +362,11 @@ class Geometry:
     """Whether geometry cost/kernel should be recomputed on the fly."""
     return False
 
+  @property
+  def compute_dtype(self) -> Optional[jnp.dtype]:
+    """Reduced data type used to evaluate the cost and kernel, if any."""
+    return None
+
   @property
   def is_symmetric(self) -> bool:
     """Whether geometry cost/kernel is a symmetric matrix."""
@@ -245,6 +408,25 @@ class Geometry:
     aux_data["scale_cost"] = scale_cost
     return type(self).tree_unflatten(aux_data, children)
 
+  def set_epsilon(
+      self, epsilon: Union[float, eps_scheduler.Epsilon]
+  ) -> "Geometry":
+    """Return a copy of the geometry with a different epsilon.
+
+    Args:
+      epsilon: Absolute regularization or scheduler. It is not rescaled by the
+        statistics of the cost, even if ``relative_epsilon`` was set.
+
+    Returns:
+      The geometry with the new epsilon.
+    """
+    if not isinstance(epsilon, eps_scheduler.Epsilon):
+      epsilon = eps_scheduler.Epsilon(epsilon)
+    children, aux_data = self.tree_flatten()
+    new_geom = type(self).tree_unflatten(aux_data, children)
+    new_geom._epsilon_init = epsilon
+    return new_geom
+
   def copy_epsilon(self, other: "Geometry") -> "Geometry":
     """Copy the epsilon parameters from another geometry."""
     children, aux_data = self.tree_flatten()
@@ -257,6 +439,7 @@ class Geometry:
   # are implemented here in their default form, either in lse (using directly
   # cost matrices in stabilized form) or kernel mode (using kernel matrices).
 
+  @_counted("lse_kernel")
   def apply_lse_kernel(
       self,
       f: jnp.ndarray,
@@ -298,6 +481,7 @@ class Geometry:
     remove = f if axis == 1 else g
     return w_res - jnp.where(jnp.isfinite(remove), remove, 0), w_sgn
 
+  @_counted("kernel")
   def apply_kernel(
       self,
       vec: jnp.ndarray,
@@ -380,7 +564,8 @@ class Geometry:
       log_marginal: jnp.ndarray,
       iteration: Optional[int] = None,
       axis: int = 0,
-  ) -> jnp.ndarray:
+      return_marginal: bool = False,
+  ) -> Union[jnp.ndarray, Tuple[jnp.ndarray, jnp.ndarray]]:
     """Carry out one Sinkhorn update for potentials, i.e. in log space.
 
     Args:
@@ -389,13 +574,26 @@ class Geometry:
       log_marginal: targeted marginal
       iteration: used to compute epsilon from schedule, if provided.
       axis: axis along which the update should be carried out.
+      return_marginal: whether to also return the marginal, along ``axis``, of
+        the transport matrix defined by the input potentials ``f`` and ``g``.
+        It is recovered from the log-sum-exp computed for the update, and
+        therefore requires no additional application of the kernel.
 
     Returns:
-      new potential value, g if axis=0, f if axis is 1.
+      new potential value, g if axis=0, f if axis is 1. If ``return_marginal``,
+      also return the marginal, of size num_b if axis=0, num_a if axis is 1.
     """
     eps = self.epsilon_scheduler(iteration)
     app_lse = self.apply_lse_kernel(f, g, eps, axis=axis)[0]
-    return eps * log_marginal - jnp.where(jnp.isfinite(app_lse), app_lse, 0)
+    potential = eps * log_marginal - jnp.where(
+        jnp.isfinite(app_lse), app_lse, 0
+    )
+    if not return_marginal:
+      return potential
+
+    h = f if axis == 1 else g
+    marginal = jnp.exp((app_lse + jnp.where(jnp.isfinite(h), h, 0)) / eps)
+    return potential, marginal
 
   def update_scaling(
       self,
@@ -565,6 +763,7 @@ class Geometry:
     """
     return self.apply_cost(arr, axis=axis, fn=lambda x: x ** 2)
 
+  @_counted("cost")
   def apply_cost(
       self,
       arr: jnp.ndarray,
@@ -596,6 +795,29 @@ class Geometry:
     )
     return jax.vmap(app, in_axes=1, out_axes=1)(arr)
 
+  def _evaluation_stats(
+      self, evaluation: Evaluation, num_vecs: int
+  ) -> KernelStats:
+    """Estimate the statistics of one evaluation of the kernel or the cost.
+
+    Args:
+      evaluation: Which method is evaluated.
+      num_vecs: Number of vectors to which the kernel or the cost is applied.
+
+    Returns:
+      The statistics of the evaluation.
+    """
+    n, m = self.shape
+    itemsize = jnp.dtype(self.dtype).itemsize
+    # each entry of the matrix is read once, the log-sum-exp also
+    # adds the potentials and exponentiates
+    flops_per_entry = 4 if evaluation == "lse_kernel" else 2
+    return _stats(
+        evaluation,
+        flops=flops_per_entry * n * m * num_vecs,
+        num_bytes=itemsize * (n * m + (n + m) * num_vecs),
+    )
+
   def _apply_cost_to_vec(
       self,
       vec: jnp.ndarray,
@@ -112,6 +112,7 @@ class Graph(geometry.Geometry):
 
     return cls(laplacian, t=t, **kwargs)
 
+  @geometry._counted("kernel")
   def apply_kernel(
       self,
       vec: jnp.ndarray,
@@ -186,6 +187,23 @@ class Graph(geometry.Geometry):
         state=state,
     )[1]
 
+  def _evaluation_stats(
+      self, evaluation: geometry.Evaluation, num_vecs: int
+  ) -> geometry.KernelStats:
+    if evaluation != "kernel":
+      return super()._evaluation_stats(evaluation, num_vecs)
+    n, _ = self.shape
+    itemsize = jnp.dtype(self.dtype).itemsize
+    # Cholesky factorization, then 1 triangular solve per step
+    flops_per_step = 2 * n ** 2
+    if self.numerical_scheme == "crank_nicolson":
+      flops_per_step += 2 * n ** 2
+    return geometry._stats(
+        evaluation,
+        flops=n ** 3 / 3 + self.n_steps * flops_per_step * num_vecs,
+        num_bytes=itemsize * n ** 2 * (1 + self.n_steps),
+    )
+
   @property
   def kernel_matrix(self) -> jnp.ndarray:  # noqa: D102
     n, _ = self.shape
@@ -144,6 +144,7 @@ class Grid(geometry.Geometry):
     return True
 
   # Reimplemented functions to be used in regularized OT
+  @geometry._counted("lse_kernel")
   def apply_lse_kernel(
       self,
       f: jnp.ndarray,
@@ -208,6 +209,19 @@ class Grid(geometry.Geometry):
     softmax_res = eps * utils.logsumexp(centered_cost, axis=1)
     return jnp.transpose(softmax_res, indices), None
 
+  def _evaluation_stats(
+      self, evaluation: geometry.Evaluation, num_vecs: int
+  ) -> geometry.KernelStats:
+    # the kernel and the cost are applied separably along each dimension
+    itemsize = jnp.dtype(self.dtype).itemsize
+    flops_per_entry = 4 if evaluation == "lse_kernel" else 2
+    return geometry._stats(
+        evaluation,
+        flops=flops_per_entry * self.num_a * sum(self.grid_size) * num_vecs,
+        num_bytes=itemsize *
+        (sum(n ** 2 for n in self.grid_size) + 2 * self.num_a * num_vecs),
+    )
+
   def _apply_cost_to_vec(
       self,
       vec: jnp.ndarray,
@@ -260,6 +274,7 @@ class Grid(geometry.Geometry):
       ).transpose(ind)
     return accum_vec.ravel()
 
+  @geometry._counted("kernel")
   def apply_kernel(
       self,
       vec: jnp.ndarray,
@@ -11,7 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Any, Callable, Literal, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Literal, Optional, Tuple, Union
 
 import jax
 import jax.numpy as jnp
@@ -20,7 +20,7 @@ from ott import utils
 from ott.geometry import costs, geometry
 from ott.math import utils as mu
 
-__all__ = ["LRCGeometry", "LRKGeometry"]
+__all__ = ["LRCGeometry", "LRKGeometry", "LogLRKGeometry"]
 
 
 @jax.tree_util.register_pytree_node_class
@@ -176,6 +176,23 @@ class LRCGeometry(geometry.Geometry):
     out = jnp.linalg.multi_dot([c1, c2.T, vec])
     return out + bias * jnp.sum(vec) * jnp.ones_like(out)
 
+  def _evaluation_stats(
+      self, evaluation: geometry.Evaluation, num_vecs: int
+  ) -> geometry.KernelStats:
+    n, m = self.shape
+    rank = self.cost_rank
+    if evaluation == "cost":
+      # the cost is applied through its factors
+      itemsize = jnp.dtype(self.dtype).itemsize
+      return geometry._stats(
+          evaluation,
+          flops=2 * rank * (n + m) * num_vecs,
+          num_bytes=itemsize * (n + m) * (rank + num_vecs),
+      )
+    # the cost matrix is materialized from its factors
+    stats = super()._evaluation_stats(evaluation, num_vecs)
+    return stats._replace(flops=stats.flops + 2 * n * m * rank)
+
   @property
   def _max_cost_matrix(self) -> jnp.ndarray:
     fn = utils.batched_vmap(
@@ -245,11 +262,12 @@ class LRKGeometry(geometry.Geometry):
 
   .. note::
     This constructor is not meant to be called by the user,
-    please use the :meth:`from_pointcloud` method instead.
+    please use the :meth:`from_pointcloud` or :meth:`from_nystrom` methods
+    instead.
 
   Args:
-    k1: Array of shape ``[num_a, r]`` with positive features.
-    k2: Array of shape ``[num_b, r]`` with positive features.
+    k1: Array of shape ``[num_a, r]`` with features.
+    k2: Array of shape ``[num_b, r]`` with features.
     epsilon: Epsilon regularization.
     kwargs: Keyword arguments for :class:`~ott.geometry.geometry.Geometry`.
   """
@@ -312,6 +330,169 @@ class LRKGeometry(geometry.Geometry):
 
     return cls(k1, k2, epsilon=eps)
 
+  @classmethod
+  def from_nystrom(
+      cls,
+      x: jnp.ndarray,
+      y: jnp.ndarray,
+      *,
+      cost_fn: Optional[costs.CostFn] = None,
+      epsilon: float = 1.0,
+      rank: int = 100,
+      landmarks: Literal["kmeans++", "leverage"] = "kmeans++",
+      ridge: float = 1e-6,
+      nonnegative: bool = True,
+      rng: Optional[jax.Array] = None,
+  ) -> "LRKGeometry":
+    r"""Nyström approximation of a Gibbs kernel :cite:`williams:01`.
+
+    The kernel :math:`K = \exp(-C / \varepsilon)` is approximated from its
+    evaluations on ``rank`` landmarks :math:`z` selected among the points
+    :math:`x` and :math:`y`, as
+
+    .. math::
+
+      K \approx K_{xz} K_{zz}^{\dagger} K_{zy},
+
+    whose factors cost :math:`O((n + m) r)` memory, as well as
+    :math:`O((n + m) r)` time to apply the kernel at each Sinkhorn iteration.
+    The approximation is accurate when the kernel is positive definite, e.g.,
+    for the :class:`~ott.geometry.costs.SqEuclidean` cost, and when the
+    points are well covered by the landmarks. Unlike random features, the
+    approximated kernel can have negative entries, which make the
+    kernel-mode Sinkhorn iterations diverge. With ``nonnegative = True``, the
+    factors are extended with the square root of the diagonal :math:`r` of
+    the residual :math:`R = K - K_{xz} K_{zz}^{\dagger} K_{zy}`. Since
+    :math:`R` is positive semi-definite for a positive definite kernel,
+    :math:`|R_{ij}| \leq \sqrt{r_i r_j}`, and the approximation
+    :math:`\tilde{K} = K_{xz} K_{zz}^{\dagger} K_{zy} + \sqrt{r} \sqrt{r}^T`
+    satisfies :math:`K \leq \tilde{K} \leq K + 2 \sqrt{r} \sqrt{r}^T`
+    entrywise. Use :meth:`kernel_error` to assess the approximation before
+    solving in kernel mode.
+
+    Args:
+      x: Array of shape ``[n, d]``.
+      y: Array of shape ``[m, d]``.
+      cost_fn: Symmetric cost function. If :obj:`None`, use
+        :class:`~ott.geometry.costs.SqEuclidean`.
+      epsilon: Epsilon regularization of the kernel.
+      rank: Number of landmarks.
+      landmarks: How to select the landmarks:
+
+        - ``'kmeans++'`` - k-means++ seeding of the points, using the
+          squared Euclidean distance.
+        - ``'leverage'`` - sampling without replacement proportionally to
+          the approximate ridge leverage scores of the points
+          :cite:`musco:17`, estimated from ``rank`` uniformly sampled points.
+      ridge: Eigenvalues of :math:`K_{zz}` smaller than ``ridge`` times the
+        largest one are discarded. Also used as the regularization of the
+        leverage scores.
+      nonnegative: Whether to append the square root of the diagonal of the
+        residual to the features, which keeps the approximated kernel positive
+        at the cost of one additional rank.
+      rng: Random key used for seeding.
+
+    Returns:
+      Low-rank kernel geometry.
+    """
+    if cost_fn is None:
+      cost_fn = costs.SqEuclidean()
+    points = jnp.concatenate([x, y], axis=0)
+    assert rank <= points.shape[0], \
+        f"`rank={rank}` is larger than the number of points."
+    rng = utils.default_prng_key(rng)
+
+    def kernel(u: jnp.ndarray, v: jnp.ndarray) -> jnp.ndarray:
+      return jnp.exp(-cost_fn.all_pairs(u, v) / epsilon)
+
+    if landmarks == "kmeans++":
+      from ott.geometry import pointcloud
+      from ott.tools import k_means
+      z = k_means._k_means_plus_plus(pointcloud.PointCloud(points), rank, rng)
+    elif landmarks == "leverage":
+      z = _leverage_landmarks(rng, points, kernel, rank, ridge=ridge)
+    else:
+      raise NotImplementedError(landmarks)
+
+    k_zz = kernel(z, z)
+    s, v = jnp.linalg.eigh(0.5 * (k_zz + k_zz.T))
+    is_kept = s > ridge * jnp.max(s)
+    # `W = K_zz^{-1/2}`, restricted to the well-conditioned eigenvectors
+    w = v * jnp.where(is_kept, 1.0 / jnp.sqrt(jnp.where(is_kept, s, 1.0)), 0.0)
+    k1, k2 = kernel(x, z) @ w, kernel(y, z) @ w
+
+    if nonnegative:
+      diag = jax.vmap(lambda p: kernel(p[None], p[None])[0, 0])
+      r1 = jnp.maximum(diag(x) - jnp.sum(k1 ** 2, axis=-1), 0.0)
+      r2 = jnp.maximum(diag(y) - jnp.sum(k2 ** 2, axis=-1), 0.0)
+      k1 = jnp.c_[k1, jnp.sqrt(r1)]
+      k2 = jnp.c_[k2, jnp.sqrt(r2)]
+    return cls(k1, k2, epsilon=epsilon)
+
+  def kernel_error(
+      self,
+      x: jnp.ndarray,
+      y: jnp.ndarray,
+      cost_fn: Optional[costs.CostFn] = None,
+      *,
+      num_samples: int = 1024,
+      rng: Optional[jax.Array] = None,
+  ) -> Dict[str, jnp.ndarray]:
+    r"""Estimate the error of the approximation of the Gibbs kernel.
+
+    The approximation :math:`\tilde{K}` is compared to
+    :math:`K = \exp(-C / \varepsilon)` on ``num_samples`` random entries,
+    and its factors to the diagonal of the kernels of :math:`x` and of
+    :math:`y`, in :math:`O((n + m) r)` time. For a Nyström approximation of
+    a positive definite kernel with ``nonnegative = False``, the residual
+    :math:`K - \tilde{K}` of the points is positive semi-definite, which
+    bounds all of its entries by the ``'max_diag_error'``. With
+    ``nonnegative = True``, the diagonals are exact and the entries are
+    overestimated by at most twice the largest diagonal of that residual.
+
+    Args:
+      x: Array of shape ``[n, d]`` used to construct the geometry.
+      y: Array of shape ``[m, d]`` used to construct the geometry.
+      cost_fn: Cost function. If :obj:`None`, use
+        :class:`~ott.geometry.costs.SqEuclidean`.
+      num_samples: Number of sampled entries of the kernel.
+      rng: Random key used for seeding.
+
+    Returns:
+      A dictionary with the following errors:
+
+      - ``'max_abs_error'`` - maximum absolute error of the sampled entries.
+      - ``'rel_error'`` - relative Frobenius error of the sampled entries.
+      - ``'max_diag_error'`` - maximum absolute error of the diagonals.
+      - ``'negative_fraction'`` - fraction of negative sampled entries,
+        which can make the kernel-mode Sinkhorn iterations diverge.
+    """
+    if cost_fn is None:
+      cost_fn = costs.SqEuclidean()
+    rng_x, rng_y = jax.random.split(utils.default_prng_key(rng))
+    n, m = self.shape
+    row_ixs = jax.random.randint(rng_x, (num_samples,), 0, n)
+    col_ixs = jax.random.randint(rng_y, (num_samples,), 0, m)
+
+    cost = jax.vmap(cost_fn)(x[row_ixs], y[col_ixs])
+    exact = jnp.exp(-cost / self.epsilon)
+    approx = jnp.sum(self.k1[row_ixs] * self.k2[col_ixs], axis=-1)
+    err = exact - approx
+
+    diag_err = jnp.concatenate([
+        jnp.exp(-jax.vmap(cost_fn)(x, x) / self.epsilon) -
+        jnp.sum(self.k1 ** 2, axis=-1),
+        jnp.exp(-jax.vmap(cost_fn)(y, y) / self.epsilon) -
+        jnp.sum(self.k2 ** 2, axis=-1),
+    ])
+    return {
+        "max_abs_error": jnp.max(jnp.abs(err)),
+        "rel_error": jnp.linalg.norm(err) / jnp.linalg.norm(exact),
+        "max_diag_error": jnp.max(jnp.abs(diag_err)),
+        "negative_fraction": jnp.mean(approx < 0.0),
+    }
+
+  @geometry._counted("kernel")
   def apply_kernel(  # noqa: D102
       self,
       vec: jnp.ndarray,
@@ -322,6 +503,20 @@ class LRKGeometry(geometry.Geometry):
       return self.k2 @ (self.k1.T @ vec)
     return self.k1 @ (self.k2.T @ vec)
 
+  def _evaluation_stats(
+      self, evaluation: geometry.Evaluation, num_vecs: int
+  ) -> geometry.KernelStats:
+    if evaluation != "kernel":
+      return super()._evaluation_stats(evaluation, num_vecs)
+    n, m = self.shape
+    itemsize = jnp.dtype(self.dtype).itemsize
+    # the kernel is applied through its factors
+    return geometry._stats(
+        evaluation,
+        flops=2 * self.rank * (n + m) * num_vecs,
+        num_bytes=itemsize * (n + m) * (self.rank + num_vecs),
+    )
+
   @property
   def kernel_matrix(self) -> jnp.ndarray:  # noqa: D102
     return self.k1 @ self.k2.T
@@ -357,12 +552,182 @@ class LRKGeometry(geometry.Geometry):
     return cls(*children, **aux_data)
 
 
+@jax.tree_util.register_pytree_node_class
+class LogLRKGeometry(geometry.Geometry):
+  r"""Low-rank kernel geometry with positive features stored in log-space.
+
+  The kernel is approximated as :math:`K_{ij} \approx \sum_k
+  \exp(\phi_{ik} + \psi_{jk})`, where :math:`\phi` and :math:`\psi` are the
+  logarithms of positive features. Unlike :class:`LRKGeometry`, which only
+  supports ``lse_mode=False``, the log-sum-exp of the kernel is computed as
+
+  .. math::
+
+    \log \sum_j K_{ij} e^{g_j / \varepsilon} \approx \log \sum_k
+    e^{\phi_{ik}} \sum_j e^{\psi_{jk} + g_j / \varepsilon},
+
+  with two nested log-sum-exps costing :math:`O((n + m) r)`, which neither
+  overflow nor underflow at small :math:`\varepsilon`. The features
+  approximate the kernel for :attr:`epsilon`, the ``eps`` passed to
+  :meth:`apply_lse_kernel` only scales the potentials.
+
+  .. note::
+    This constructor is not meant to be called by the user,
+    please use the :meth:`from_pointcloud` method instead.
+
+  Args:
+    log_k1: Array of shape ``[num_a, r]`` with the log-features.
+    log_k2: Array of shape ``[num_b, r]`` with the log-features.
+    epsilon: Epsilon regularization.
+    kwargs: Keyword arguments for :class:`~ott.geometry.geometry.Geometry`.
+  """
+
+  def __init__(
+      self,
+      log_k1: jnp.ndarray,
+      log_k2: jnp.ndarray,
+      epsilon: Optional[float] = None,
+      **kwargs: Any
+  ):
+    super().__init__(epsilon=epsilon, relative_epsilon=None, **kwargs)
+    self.log_k1 = log_k1
+    self.log_k2 = log_k2
+
+  @classmethod
+  def from_pointcloud(
+      cls,
+      x: jnp.ndarray,
+      y: jnp.ndarray,
+      *,
+      epsilon: float = 1.0,
+      rank: int = 100,
+      rng: Optional[jax.Array] = None
+  ) -> "LogLRKGeometry":
+    r"""Positive features of the Gaussian kernel :cite:`scetbon:20`.
+
+    The features approximate :math:`\exp(-\|x - y\|_2^2 / \varepsilon)`,
+    as in :meth:`LRKGeometry.from_pointcloud` with ``kernel = 'gaussian'``,
+    but are never exponentiated.
+
+    Args:
+      x: Array of shape ``[n, d]``.
+      y: Array of shape ``[m, d]``.
+      epsilon: Epsilon regularization of the kernel.
+      rank: Rank of the approximation.
+      rng: Random key used for seeding.
+
+    Returns:
+      Low-rank kernel geometry with features in log-space.
+    """
+    rng = utils.default_prng_key(rng)
+    r = jnp.maximum(
+        jnp.linalg.norm(x, axis=-1).max(),
+        jnp.linalg.norm(y, axis=-1).max()
+    )
+    log_k1 = _log_gaussian_kernel(rng, x, rank, eps=epsilon, R=r)
+    log_k2 = _log_gaussian_kernel(rng, y, rank, eps=epsilon, R=r)
+    return cls(log_k1, log_k2, epsilon=epsilon)
+
+  @geometry._counted("lse_kernel")
+  def apply_lse_kernel(  # noqa: D102
+      self,
+      f: jnp.ndarray,
+      g: jnp.ndarray,
+      eps: float,
+      vec: Optional[jnp.ndarray] = None,
+      axis: int = 0
+  ) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    if axis == 0:
+      h, log_k, log_k_other = f, self.log_k1, self.log_k2
+    else:
+      h, log_k, log_k_other = g, self.log_k2, self.log_k1
+
+    # first sum over the points, then over the features
+    z = h[:, None] / eps + log_k
+    if vec is None:
+      lse = mu.logsumexp(log_k_other + mu.logsumexp(z, axis=0), axis=1)
+      return eps * lse, jnp.array([1.0])
+    lse, sgn = mu.logsumexp(z, axis=0, b=vec[:, None], return_sign=True)
+    lse, sgn = mu.logsumexp(
+        log_k_other + lse, axis=1, b=sgn[None, :], return_sign=True
+    )
+    return eps * lse, sgn
+
+  @geometry._counted("kernel")
+  def apply_kernel(  # noqa: D102
+      self,
+      vec: jnp.ndarray,
+      eps: Optional[float] = None,
+      axis: int = 0,
+  ) -> jnp.ndarray:
+    k1, k2 = jnp.exp(self.log_k1), jnp.exp(self.log_k2)
+    if axis == 0:
+      return k2 @ (k1.T @ vec)
+    return k1 @ (k2.T @ vec)
+
+  def _evaluation_stats(
+      self, evaluation: geometry.Evaluation, num_vecs: int
+  ) -> geometry.KernelStats:
+    if evaluation == "cost":
+      return super()._evaluation_stats(evaluation, num_vecs)
+    n, m = self.shape
+    itemsize = jnp.dtype(self.dtype).itemsize
+    # the kernel is applied through its factors
+    flops_per_entry = 4 if evaluation == "lse_kernel" else 2
+    return geometry._stats(
+        evaluation,
+        flops=flops_per_entry * self.rank * (n + m) * num_vecs,
+        num_bytes=itemsize * (n + m) * (self.rank + num_vecs),
+    )
+
+  @property
+  def kernel_matrix(self) -> jnp.ndarray:  # noqa: D102
+    return jnp.exp(-self.cost_matrix / self.epsilon)
+
+  @property
+  def cost_matrix(self) -> jnp.ndarray:  # noqa: D102
+    # shift the features of each point so that their largest entry is 0
+    max1 = jnp.max(self.log_k1, axis=1, keepdims=True)
+    max2 = jnp.max(self.log_k2, axis=1, keepdims=True)
+    kernel = jnp.exp(self.log_k1 - max1) @ jnp.exp(self.log_k2 - max2).T
+    return -self.epsilon * (jnp.log(kernel) + max1 + max2.T)
+
+  @property
+  def rank(self) -> int:  # noqa: D102
+    return self.log_k1.shape[1]
+
+  @property
+  def shape(self) -> Tuple[int, int]:  # noqa: D102
+    return self.log_k1.shape[0], self.log_k2.shape[0]
+
+  @property
+  def dtype(self) -> jnp.dtype:  # noqa: D102
+    return self.log_k1.dtype
+
+  def tree_flatten(self):  # noqa: D102
+    return [self.log_k1, self.log_k2, self._epsilon_init], {}
+
+  @classmethod
+  def tree_unflatten(cls, aux_data, children):  # noqa: D102
+    return cls(*children, **aux_data)
+
+
 def _gaussian_kernel(
     rng: jax.Array,
     x: jnp.ndarray,
     n_features: int,
     eps: float,
     R: jnp.ndarray,
+) -> jnp.ndarray:
+  return jnp.exp(_log_gaussian_kernel(rng, x, n_features, eps=eps, R=R))
+
+
+def _log_gaussian_kernel(
+    rng: jax.Array,
+    x: jnp.ndarray,
+    n_features: int,
+    eps: float,
+    R: jnp.ndarray,
 ) -> jnp.ndarray:
   _, d = x.shape
   cost_fn = costs.SqEuclidean()
@@ -376,9 +741,36 @@ def _gaussian_kernel(
   norm_u = cost_fn.norm(u)
 
   tmp = -2.0 * (cost / eps) + (norm_u / (eps * q))
-  phi = (2 * q) ** (d / 4) * jnp.exp(tmp)
+  log_phi = (d / 4) * jnp.log(2 * q) + tmp
 
-  return (1.0 / jnp.sqrt(n_features)) * phi
+  return log_phi - 0.5 * jnp.log(n_features)
+
+
+def _leverage_landmarks(
+    rng: jax.Array,
+    points: jnp.ndarray,
+    kernel: Callable[[jnp.ndarray, jnp.ndarray], jnp.ndarray],
+    rank: int,
+    ridge: float,
+) -> jnp.ndarray:
+  rng_pilot, rng_sample = jax.random.split(rng, 2)
+  num_points = points.shape[0]
+  pilot_ixs = jax.random.choice(
+      rng_pilot, num_points, shape=(rank,), replace=False
+  )
+  pilot = points[pilot_ixs]
+
+  # ridge leverage scores, up to a constant, estimated from the pilot points
+  k_np = kernel(points, pilot)
+  k_pp = kernel(pilot, pilot) + ridge * jnp.eye(rank, dtype=k_np.dtype)
+  diag = jax.vmap(lambda p: kernel(p[None], p[None])[0, 0])(points)
+  scores = diag - jnp.sum(k_np * jnp.linalg.solve(k_pp, k_np.T).T, axis=-1)
+  scores = jnp.maximum(scores, ridge)
+
+  # sampling without replacement using the Gumbel top-k trick
+  gumbel = jax.random.gumbel(rng_sample, (num_points,), dtype=scores.dtype)
+  _, ixs = jax.lax.top_k(jnp.log(scores) + gumbel, rank)
+  return points[ixs]
 
 
 def _arccos_kernel(
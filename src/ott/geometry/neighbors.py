@@ -0,0 +1,340 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import math
+from typing import Any, Optional, Tuple
+
+import jax
+import jax.numpy as jnp
+import jax.tree_util as jtu
+import numpy as np
+
+from ott import utils
+from ott.geometry import costs
+
+__all__ = ["BruteForceIndex", "IVFIndex"]
+
+
+@jtu.register_pytree_node_class
+class BruteForceIndex:
+  r"""Exact nearest-neighbor index for the hard :term:`c-transform`.
+
+  Given points :math:`y_j` with a potential :math:`g_j` and weights
+  :math:`b_j`, the index returns, for each query :math:`x`, the index
+
+  .. math::
+
+    j^\star(x) = \arg\min_{j : b_j > 0} c(x, y_j) - g_j,
+
+  from which follows the hard :term:`c-transform`
+  :math:`f(x) = c(x, y_{j^\star}) - g_{j^\star}`. For the
+  :class:`~ott.geometry.costs.SqEuclidean` and
+  :class:`~ott.geometry.costs.NegDotProduct` costs, this is a nearest-neighbor
+  search in squared Euclidean distance between augmented points, which absorb
+  the shift by the potential:
+
+  - :class:`~ott.geometry.costs.SqEuclidean`,
+    :math:`\tilde{x} = (x, 0)` and
+    :math:`\tilde{y}_j = (y_j, \sqrt{\max_k g_k - g_j})`.
+  - :class:`~ott.geometry.costs.NegDotProduct`,
+    :math:`\tilde{x} = (x, 1, 0)` and
+    :math:`\tilde{y}_j = (y_j, g_j, \sqrt{R^2 - \|y_j\|^2 - g_j^2})`, where
+    :math:`R^2 = \max_k \|y_k\|^2 + g_k^2`.
+
+  The points are compared to the queries ``batch_size`` at a time, so that the
+  memory is :math:`O(n \cdot \text{batch_size})` for :math:`n` queries
+  instead of :math:`O(nm)`.
+
+  Args:
+    y: Array of shape ``[m, d]``.
+    g: Potential of shape ``[m,]``. If :obj:`None`, use zeros, i.e., search
+      for the nearest neighbors.
+    b: Weights of shape ``[m,]``. Points with a zero weight are never
+      returned. If :obj:`None`, all points can be returned.
+    cost_fn: Cost function, either :class:`~ott.geometry.costs.SqEuclidean`
+      or :class:`~ott.geometry.costs.NegDotProduct`. If :obj:`None`, use
+      :class:`~ott.geometry.costs.SqEuclidean`.
+    batch_size: Number of points compared to the queries at once.
+      If :obj:`None`, compare all points at once.
+  """
+
+  def __init__(
+      self,
+      y: jnp.ndarray,
+      g: Optional[jnp.ndarray] = None,
+      b: Optional[jnp.ndarray] = None,
+      cost_fn: Optional[costs.CostFn] = None,
+      batch_size: Optional[int] = None,
+  ):
+    cost_fn = costs.SqEuclidean() if cost_fn is None else cost_fn
+    assert isinstance(cost_fn, (costs.SqEuclidean, costs.NegDotProduct)), \
+        f"Cost `{type(cost_fn).__name__}` is not supported."
+    self.y = y
+    self.g = jnp.zeros(y.shape[0], dtype=y.dtype) if g is None else g
+    self.b = b
+    self.cost_fn = cost_fn
+    self.batch_size = batch_size
+
+  def __call__(self, x: jnp.ndarray, k: Optional[int] = None) -> jnp.ndarray:
+    """Search the points minimizing the shifted cost.
+
+    Args:
+      x: Queries of shape ``[n, d]``.
+      k: Number of points returned per query. If :obj:`None`, only return
+        the minimizer.
+
+    Returns:
+      The indices of shape ``[n,]`` of the points minimizing
+      :math:`c(x_i, y_j) - g_j` or, if ``k`` is passed, the indices of shape
+      ``[n, k]`` of the ``k`` smallest values, in increasing order.
+    """
+    ixs = self._search(self._augment_x(x), 1 if k is None else k)
+    return ixs[:, 0] if k is None else ixs
+
+  def c_transform(self, x: jnp.ndarray) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    """Compute the hard :term:`c-transform` of the potential.
+
+    Args:
+      x: Queries of shape ``[n, d]``.
+
+    Returns:
+      The :term:`c-transform` of shape ``[n,]`` and the indices of the points
+      attaining it, of shape ``[n,]``.
+    """
+    ixs = jnp.minimum(self(x), self.y.shape[0] - 1)
+    cost = jax.vmap(self.cost_fn)(x, self.y[ixs])
+    return cost - self.g[ixs], ixs
+
+  @property
+  def mask(self) -> jnp.ndarray:
+    """Boolean mask of shape ``[m,]`` of the points that can be returned."""
+    if self.b is None:
+      return jnp.ones(self.y.shape[0], dtype=bool)
+    return self.b > 0.0
+
+  def _augment_x(self, x: jnp.ndarray) -> jnp.ndarray:
+    num_extra = 1 if isinstance(self.cost_fn, costs.SqEuclidean) else 2
+    extra = jnp.zeros((x.shape[0], num_extra), dtype=x.dtype)
+    if num_extra == 2:
+      extra = extra.at[:, 0].set(1.0)
+    return jnp.concatenate([x, extra], axis=1)
+
+  def _augment_y(self) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    """Augmented points and their squared norms, infinite if masked."""
+    y, mask = self.y, self.mask
+    g = jnp.where(mask, self.g, jnp.max(self.g, where=mask, initial=-jnp.inf))
+    if isinstance(self.cost_fn, costs.SqEuclidean):
+      extra = jnp.sqrt(jnp.max(g) - g)[:, None]
+    else:
+      norms = jnp.sum(y ** 2, axis=1) + g ** 2
+      extra = jnp.stack([g, jnp.sqrt(jnp.max(norms) - norms)], axis=1)
+    y = jnp.concatenate([y, extra], axis=1)
+    sq_norms = jnp.where(mask, jnp.sum(y ** 2, axis=1), jnp.inf)
+    return y, sq_norms
+
+  def _search(self, x: jnp.ndarray, k: int) -> jnp.ndarray:
+
+    def update(
+        carry: Tuple[jnp.ndarray, jnp.ndarray],
+        block: Tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray],
+    ) -> Tuple[Tuple[jnp.ndarray, jnp.ndarray], None]:
+      best, best_ixs = carry
+      y, sq_norms, offset = block
+      # the squared norm of the queries does not change the minimizers
+      dists = sq_norms[None, :] - 2.0 * jnp.dot(x, y.T)
+      neg_dists, ixs = jax.lax.top_k(-dists, min(k, batch_size))
+      neg_best, pos = jax.lax.top_k(
+          jnp.concatenate([-best, neg_dists], axis=1), k
+      )
+      best_ixs = jnp.concatenate([best_ixs, ixs + offset], axis=1)
+      best_ixs = jnp.take_along_axis(best_ixs, pos, axis=1)
+      return (-neg_best, best_ixs), None
+
+    y, sq_norms = self._augment_y()
+    m = y.shape[0]
+    assert k <= m, f"Cannot search `{k}` out of `{m}` points."
+    batch_size = m if self.batch_size is None else min(self.batch_size, m)
+    num_blocks = -(-m // batch_size)
+    pad = num_blocks * batch_size - m
+    y = jnp.pad(y, ((0, pad), (0, 0))).reshape(num_blocks, batch_size, -1)
+    sq_norms = jnp.pad(sq_norms, (0, pad), constant_values=jnp.inf)
+    sq_norms = sq_norms.reshape(num_blocks, batch_size)
+    offsets = jnp.arange(num_blocks) * batch_size
+
+    n = x.shape[0]
+    init = (
+        jnp.full((n, k), jnp.inf, dtype=x.dtype),
+        jnp.zeros((n, k), dtype=int),
+    )
+    (_, ixs), _ = jax.lax.scan(update, init, (y, sq_norms, offsets))
+    return ixs
+
+  def tree_flatten(self):  # noqa: D102
+    return [self.y, self.g, self.b], {
+        "cost_fn": self.cost_fn,
+        "batch_size": self.batch_size
+    }
+
+  @classmethod
+  def tree_unflatten(cls, aux_data, children):  # noqa: D102
+    return cls(*children, **aux_data)
+
+
+@jtu.register_pytree_node_class
+class IVFIndex(BruteForceIndex):
+  r"""Approximate nearest-neighbor index for the hard :term:`c-transform`.
+
+  The augmented points of :class:`BruteForceIndex` are clustered using
+  :func:`~ott.tools.k_means.k_means`, and each query is only compared to the
+  points of the ``num_probes`` clusters whose centroids are the closest to it,
+  i.e., an inverted file index. For :math:`k` clusters of at most :math:`L`
+  points, a query costs :math:`O(k + \text{num_probes} \cdot L)` instead
+  of :math:`O(m)`. Use :meth:`build` to construct the index. If fewer
+  probed points than requested have a positive weight, the remaining
+  indices are ``m``.
+
+  Args:
+    y: Array of shape ``[m, d]``.
+    g: Potential of shape ``[m,]``. If :obj:`None`, use zeros.
+    b: Weights of shape ``[m,]``. Points with a zero weight are never
+      returned. If :obj:`None`, all points can be returned.
+    cost_fn: Cost function, either :class:`~ott.geometry.costs.SqEuclidean`
+      or :class:`~ott.geometry.costs.NegDotProduct`. If :obj:`None`, use
+      :class:`~ott.geometry.costs.SqEuclidean`.
+    batch_size: Number of queries processed at once. If :obj:`None`, process
+      all queries at once.
+    centroids: Centroids of the augmented points of shape ``[k, d']``.
+    lists: Indices of the points of each cluster of shape ``[k, L]``, padded
+      with ``m``.
+    num_probes: Number of clusters compared to each query.
+  """
+
+  def __init__(
+      self,
+      y: jnp.ndarray,
+      g: Optional[jnp.ndarray] = None,
+      b: Optional[jnp.ndarray] = None,
+      cost_fn: Optional[costs.CostFn] = None,
+      batch_size: Optional[int] = None,
+      *,
+      centroids: jnp.ndarray,
+      lists: jnp.ndarray,
+      num_probes: int = 1,
+  ):
+    super().__init__(y, g=g, b=b, cost_fn=cost_fn, batch_size=batch_size)
+    self.centroids = centroids
+    self.lists = lists
+    self.num_probes = num_probes
+
+  @classmethod
+  def build(
+      cls,
+      y: jnp.ndarray,
+      g: Optional[jnp.ndarray] = None,
+      b: Optional[jnp.ndarray] = None,
+      cost_fn: Optional[costs.CostFn] = None,
+      batch_size: Optional[int] = None,
+      *,
+      num_clusters: Optional[int] = None,
+      num_probes: int = 1,
+      rng: Optional[jax.Array] = None,
+      **kwargs: Any,
+  ) -> "IVFIndex":
+    r"""Cluster the points and build the index.
+
+    Since the size of the largest cluster determines the shape of the
+    index, it must be built outside of :func:`~jax.jit`.
+
+    Args:
+      y: Array of shape ``[m, d]``.
+      g: Potential of shape ``[m,]``. If :obj:`None`, use zeros.
+      b: Weights of shape ``[m,]``. If :obj:`None`, all points can be
+        returned.
+      cost_fn: Cost function, either :class:`~ott.geometry.costs.SqEuclidean`
+        or :class:`~ott.geometry.costs.NegDotProduct`.
+      batch_size: Number of queries processed at once.
+      num_clusters: Number of clusters. If :obj:`None`, use
+        :math:`\lceil \sqrt{m} \rceil`.
+      num_probes: Number of clusters compared to each query. Clusters left
+        empty by :func:`~ott.tools.k_means.k_means` are discarded.
+      rng: Random key used to initialize the clustering.
+      kwargs: Keyword arguments for :func:`~ott.tools.k_means.k_means`.
+
+    Returns:
+      The index.
+    """
+    from ott.tools import k_means
+
+    assert num_probes > 0, f"`num_probes={num_probes}` must be positive."
+    index = BruteForceIndex(y, g=g, b=b, cost_fn=cost_fn)
+    points, _ = index._augment_y()
+    m = points.shape[0]
+    if num_clusters is None:
+      num_clusters = math.ceil(math.sqrt(m))
+    res = k_means.k_means(points, k=num_clusters, rng=rng, **kwargs)
+
+    assignment = np.asarray(res.assignment)
+    sizes = np.bincount(assignment, minlength=num_clusters)
+    order = np.argsort(assignment, kind="stable")
+    starts = np.cumsum(sizes) - sizes
+    positions = np.arange(m) - starts[assignment[order]]
+    lists = np.full((num_clusters, sizes.max()), m)
+    lists[assignment[order], positions] = order
+
+    is_nonempty = sizes > 0
+    return cls(
+        index.y,
+        g=index.g,
+        b=b,
+        cost_fn=index.cost_fn,
+        batch_size=batch_size,
+        centroids=res.centroids[is_nonempty],
+        lists=jnp.asarray(lists[is_nonempty]),
+        num_probes=min(num_probes, int(is_nonempty.sum())),
+    )
+
+  def _search(self, x: jnp.ndarray, k: int) -> jnp.ndarray:
+
+    def search(x: jnp.ndarray) -> jnp.ndarray:
+      dists = centroid_sq_norms - 2.0 * jnp.dot(self.centroids, x)
+      _, probes = jax.lax.top_k(-dists, self.num_probes)
+      candidates = self.lists[probes].ravel()
+      dists = sq_norms[candidates] - 2.0 * jnp.dot(y[candidates], x)
+      _, ixs = jax.lax.top_k(-dists, k)
+      return candidates[ixs]
+
+    num_candidates = self.num_probes * self.lists.shape[1]
+    assert k <= num_candidates, \
+        f"Cannot search `{k}` out of `{num_candidates}` candidates, " \
+        "consider increasing `num_probes`."
+
+    y, sq_norms = self._augment_y()
+    # padding of the lists, only returned if too few candidates are valid
+    y = jnp.pad(y, ((0, 1), (0, 0)))
+    sq_norms = jnp.pad(sq_norms, (0, 1), constant_values=jnp.inf)
+    centroid_sq_norms = jnp.sum(self.centroids ** 2, axis=1)
+
+    n = x.shape[0]
+    if self.batch_size is None or self.batch_size >= n:
+      return jax.vmap(search)(x)
+    return utils.batched_vmap(search, batch_size=self.batch_size)(x)
+
+  def tree_flatten(self):  # noqa: D102
+    children, aux_data = super().tree_flatten()
+    aux_data["num_probes"] = self.num_probes
+    return [*children, self.centroids, self.lists], aux_data
+
+  @classmethod
+  def tree_unflatten(cls, aux_data, children):  # noqa: D102
+    *children, centroids, lists = children
+    return cls(*children, centroids=centroids, lists=lists, **aux_data)
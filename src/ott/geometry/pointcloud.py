@@ -44,6 +44,20 @@ class PointCloud(geometry.Geometry):
       ``batch_size`` lines at a time, used on a vector and discarded.
       The online computation is particularly useful for big point clouds
       whose cost matrix does not fit in memory.
+    tile_size: Size of the tiles along the reduced axis in the online mode.
+      If :obj:`None`, each of the ``batch_size`` lines of the cost matrix is
+      computed at once. Otherwise, the lines are computed ``tile_size``
+      entries at a time, i.e., in blocks of shape ``[batch_size, tile_size]``,
+      and reduced in a streaming fashion, e.g., using a running maximum and sum
+      for :meth:`apply_lse_kernel`. This bounds the memory footprint when
+      both :math:`n` and :math:`m` are large. Ignored if ``batch_size`` is
+      :obj:`None`.
+    compute_dtype: Reduced data type, e.g., :obj:`jax.numpy.bfloat16`, used
+      in the online mode to compute the pairwise costs and their exponentials.
+      The log-sum-exp and kernel products are still accumulated in the
+      :attr:`dtype` of the point cloud. If :obj:`None`, use the :attr:`dtype`.
+      :class:`~ott.solvers.linear.sinkhorn.Sinkhorn` falls back to full
+      precision near convergence.
     scale_cost: option to rescale the cost matrix. Implemented scalings are
       'median', 'mean', 'max_cost', 'max_norm' and 'max_bound'.
       Alternatively, a float factor can be given to rescale the cost such
@@ -57,6 +71,8 @@ class PointCloud(geometry.Geometry):
       y: Optional[jnp.ndarray] = None,
       cost_fn: Optional[costs.CostFn] = None,
       batch_size: Optional[int] = None,
+      tile_size: Optional[int] = None,
+      compute_dtype: Optional[jnp.dtype] = None,
       scale_cost: Union[float, Literal["mean", "max_norm", "max_bound",
                                        "max_cost", "median"]] = 1.0,
       **kwargs: Any,
@@ -69,8 +85,13 @@ class PointCloud(geometry.Geometry):
     if batch_size is not None:
       assert batch_size > 0, f"`batch_size={batch_size}` must be positive."
     self._batch_size = batch_size
+    if tile_size is not None:
+      assert tile_size > 0, f"`tile_size={tile_size}` must be positive."
+    self._tile_size = tile_size
+    self._compute_dtype = compute_dtype
     self._scale_cost = scale_cost
 
+  @geometry._counted("lse_kernel")
   def apply_lse_kernel(  # noqa: D102
       self,
       f: jnp.ndarray,
@@ -85,23 +106,58 @@ class PointCloud(geometry.Geometry):
     def apply(x: jnp.ndarray, y: jnp.ndarray, f: jnp.ndarray,
               g: jnp.ndarray) -> Tuple[jnp.ndarray, jnp.ndarray]:
       x, y = jnp.atleast_2d(x), jnp.atleast_2d(y)
-      cost = self.cost_fn.all_pairs(x, y) * inv_scale_cost
+      cost = self._pairwise_cost(x, y) * inv_scale_cost
       cost = cost.squeeze(1 - axis)
       # axis=-1
-      res, sgn = mu.logsumexp((f + g - cost) / eps, b=vec, return_sign=True)
+      res, sgn = self._logsumexp((f + g - cost) / eps, b=vec)
+      return eps * res, sgn
+
+    def apply_tiled(
+        z: jnp.ndarray, h: jnp.ndarray, tiles: Tuple[jnp.ndarray, ...]
+    ) -> Tuple[jnp.ndarray, jnp.ndarray]:
+
+      def body_fn(
+          carry: Tuple[jnp.ndarray, jnp.ndarray], tile: Tuple[jnp.ndarray, ...]
+      ) -> Tuple[Tuple[jnp.ndarray, jnp.ndarray], None]:
+        z_tile, h_tile, vec_tile = tile
+        cost = self._tile_cost(z, z_tile, axis) * inv_scale_cost
+        res, sgn = self._logsumexp((h + h_tile - cost) / eps, b=vec_tile)
+        # merge with the running (signed) log-sum-exp
+        res, sgn = mu.logsumexp(
+            jnp.stack([carry[0], res]),
+            b=jnp.stack([carry[1], sgn]),
+            return_sign=True
+        )
+        return (res, sgn), None
+
+      init = (jnp.array(-jnp.inf, dtype=h.dtype), jnp.ones((), dtype=h.dtype))
+      (res, sgn), _ = jax.lax.scan(body_fn, init, tiles)
       return eps * res, sgn
 
     inv_scale_cost = self.inv_scale_cost
-    in_axes = (None, 0, None, 0) if axis == 0 else (0, None, 0, None)
-    batched_apply = utils.batched_vmap(
-        apply,
-        batch_size=self.batch_size,
-        in_axes=in_axes,
-    )
-    w_res, w_sgn = batched_apply(self.x, self.y, f, g)
+    if self._tile_size is None:
+      in_axes = (None, 0, None, 0) if axis == 0 else (0, None, 0, None)
+      batched_apply = utils.batched_vmap(
+          apply,
+          batch_size=self.batch_size,
+          in_axes=in_axes,
+      )
+      w_res, w_sgn = batched_apply(self.x, self.y, f, g)
+    else:
+      (z, z_red), (h, h_red) = self._split_axes(axis, (f, g))
+      tiles = (
+          self._to_tiles(z_red),
+          self._to_tiles(h_red, fill_value=-jnp.inf),
+          None if vec is None else self._to_tiles(vec, fill_value=0.0),
+      )
+      batched_apply = utils.batched_vmap(
+          apply_tiled, batch_size=self.batch_size, in_axes=(0, 0, None)
+      )
+      w_res, w_sgn = batched_apply(z, h, tiles)
     remove = f if axis == 1 else g
     return w_res - jnp.where(jnp.isfinite(remove), remove, 0), w_sgn
 
+  @geometry._counted("kernel")
   def apply_kernel(  # noqa: D102
       self,
       vec: jnp.ndarray,
@@ -115,17 +171,43 @@ class PointCloud(geometry.Geometry):
 
     def apply(x: jnp.ndarray, y: jnp.ndarray, vec: jnp.ndarray) -> jnp.ndarray:
       x, y = jnp.atleast_2d(x), jnp.atleast_2d(y)
-      cost = self.cost_fn.all_pairs(x, y) * inv_scale_cost
+      cost = self._pairwise_cost(x, y) * inv_scale_cost
       cost = cost.squeeze(1 - axis)
-      return jnp.dot(jnp.exp(-cost / eps), vec)
+      return jnp.dot(self._exp(-cost / eps), vec)
+
+    def fn(cost: jnp.ndarray) -> jnp.ndarray:
+      return self._exp(-cost * inv_scale_cost / eps)
 
     inv_scale_cost = self.inv_scale_cost
+    if self._tile_size is not None:
+      return self._apply_tiled(vec, axis=axis, fn=fn)
+
     in_axes = (None, 0, None) if axis == 0 else (0, None, None)
     batched_apply = utils.batched_vmap(
         apply, batch_size=self.batch_size, in_axes=in_axes
     )
     return batched_apply(self.x, self.y, vec)
 
+  def _evaluation_stats(
+      self, evaluation: geometry.Evaluation, num_vecs: int
+  ) -> geometry.KernelStats:
+    if not self.is_online:
+      return super()._evaluation_stats(evaluation, num_vecs)
+    n, m = self.shape
+    dim = self.x.shape[1]
+    itemsize = jnp.dtype(self.compute_dtype or self.dtype).itemsize
+    # the cost is recomputed for each entry, ~3 FLOPs per dimension for the
+    # usual costs, and the points are re-read for each batch
+    flops_per_entry = 3 * dim
+    flops_per_entry += (4 if evaluation == "lse_kernel" else 2) * num_vecs
+    batch_size = n if self.batch_size is None else self.batch_size
+    num_batches = -(-n // batch_size)
+    return geometry._stats(
+        evaluation,
+        flops=flops_per_entry * n * m,
+        num_bytes=itemsize * ((n + num_batches * m) * dim + (n + m) * num_vecs),
+    )
+
   def _apply_cost_to_vec(
       self,
       vec: jnp.ndarray,
@@ -137,7 +219,7 @@ class PointCloud(geometry.Geometry):
 
     def apply(x: jnp.ndarray, y: jnp.ndarray, arr: jnp.ndarray) -> jnp.ndarray:
       x, y = jnp.atleast_2d(x), jnp.atleast_2d(y)
-      cost = self.cost_fn.all_pairs(x, y) * scale_cost
+      cost = self._pairwise_cost(x, y) * scale_cost
       cost = cost.squeeze(1 - axis)
       if fn is not None:
         cost = fn(cost)
@@ -161,12 +243,120 @@ class PointCloud(geometry.Geometry):
           vec, axis=axis, fn=fn, is_linear=is_linear
       )
 
+    if self._tile_size is not None:
+      return self._apply_tiled(
+          vec,
+          axis=axis,
+          fn=lambda cost:
+          (cost * scale_cost if fn is None else fn(cost * scale_cost))
+      )
+
     in_axes = (None, 0, None) if axis == 0 else (0, None, None)
     batched_apply = utils.batched_vmap(
         apply, batch_size=self.batch_size, in_axes=in_axes
     )
     return batched_apply(self.x, self.y, vec)
 
+  def _apply_tiled(
+      self,
+      vec: jnp.ndarray,
+      axis: int,
+      fn: Callable[[jnp.ndarray], jnp.ndarray],
+  ) -> jnp.ndarray:
+    """Apply ``fn`` of the unscaled cost to ``vec``, one tile at a time."""
+
+    def apply(z: jnp.ndarray, tiles: Tuple[jnp.ndarray, ...]) -> jnp.ndarray:
+
+      def body_fn(carry: jnp.ndarray,
+                  tile: Tuple[jnp.ndarray, ...]) -> Tuple[jnp.ndarray, None]:
+        z_tile, vec_tile = tile
+        cost = self._tile_cost(z, z_tile, axis)
+        return carry + jnp.dot(fn(cost), vec_tile), None
+
+      init = jnp.zeros(vec.shape[1:], dtype=vec.dtype)
+      res, _ = jax.lax.scan(body_fn, init, tiles)
+      return res
+
+    (z, z_red), _ = self._split_axes(axis)
+    tiles = self._to_tiles(z_red), self._to_tiles(vec, fill_value=0.0)
+    batched_apply = utils.batched_vmap(
+        apply, batch_size=self.batch_size, in_axes=(0, None)
+    )
+    return batched_apply(z, tiles)
+
+  def _split_axes(
+      self,
+      axis: int,
+      potentials: Optional[Tuple[jnp.ndarray, jnp.ndarray]] = None,
+  ) -> Tuple[Tuple[jnp.ndarray, jnp.ndarray], Tuple[Optional[jnp.ndarray],
+                                                    Optional[jnp.ndarray]]]:
+    """Split points and potentials into the kept and the reduced axis."""
+    f, g = (None, None) if potentials is None else potentials
+    if axis == 0:
+      return (self.y, self.x), (g, f)
+    return (self.x, self.y), (f, g)
+
+  def _tile_cost(
+      self, z: jnp.ndarray, z_tile: jnp.ndarray, axis: int
+  ) -> jnp.ndarray:
+    """Unscaled cost between a point and a tile of the reduced axis."""
+    if axis == 0:
+      return self._pairwise_cost(z_tile, z[None])[:, 0]
+    return self._pairwise_cost(z[None], z_tile)[0]
+
+  def _pairwise_cost(self, x: jnp.ndarray, y: jnp.ndarray) -> jnp.ndarray:
+    """Unscaled cost between ``x`` and ``y``, in the :attr:`compute_dtype`."""
+    if self._compute_dtype is None:
+      return self.cost_fn.all_pairs(x, y)
+    x, y = x.astype(self._compute_dtype), y.astype(self._compute_dtype)
+    return self.cost_fn.all_pairs(x, y).astype(self.dtype)
+
+  def _exp(self, z: jnp.ndarray) -> jnp.ndarray:
+    """Exponential of ``z``, in the :attr:`compute_dtype`."""
+    if self._compute_dtype is None:
+      return jnp.exp(z)
+    return jnp.exp(z.astype(self._compute_dtype)).astype(z.dtype)
+
+  def _logsumexp(
+      self,
+      z: jnp.ndarray,
+      b: Optional[jnp.ndarray] = None,
+  ) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    """Signed log-sum-exp over the last axis.
+
+    The exponentials are computed in the :attr:`compute_dtype`, while the
+    maximum and the sum are computed in the data type of ``z``.
+    """
+    if self._compute_dtype is None:
+      return mu.logsumexp(z, b=b, axis=-1, return_sign=True)
+    z_max = jnp.max(z, axis=-1, keepdims=True)
+    z_max = jax.lax.stop_gradient(jnp.where(jnp.isfinite(z_max), z_max, 0.0))
+    exp_z = self._exp(z - z_max)
+    if b is not None:
+      exp_z = b * exp_z
+    s = jnp.sum(exp_z, axis=-1)
+    return jnp.log(jnp.abs(s)) + z_max[..., 0], jnp.sign(s)
+
+  def _to_tiles(
+      self,
+      arr: jnp.ndarray,
+      fill_value: Optional[float] = None,
+  ) -> jnp.ndarray:
+    """Reshape ``arr`` to ``[num_tiles, tile_size, ...]``.
+
+    The first axis is padded with ``fill_value`` or, if :obj:`None`, by
+    repeating its last element, which keeps the padded costs finite.
+    """
+    n = arr.shape[0]
+    tile_size = min(self._tile_size, n)
+    num_tiles = -(-n // tile_size)
+    pad_width = [(0, num_tiles * tile_size - n)] + [(0, 0)] * (arr.ndim - 1)
+    if fill_value is None:
+      arr = jnp.pad(arr, pad_width, mode="edge")
+    else:
+      arr = jnp.pad(arr, pad_width, constant_values=fill_value)
+    return arr.reshape(num_tiles, tile_size, *arr.shape[1:])
+
   def _apply_sqeucl_cost(
       self,
       vec: jnp.ndarray,
@@ -244,6 +434,8 @@ class PointCloud(geometry.Geometry):
         self.cost_fn,
     ), {
         "batch_size": self._batch_size,
+        "tile_size": self._tile_size,
+        "compute_dtype": self._compute_dtype,
         "scale_cost": self._scale_cost,
         "relative_epsilon": self._relative_epsilon,
     }
@@ -447,6 +639,22 @@ class PointCloud(geometry.Geometry):
     """Whether the cost/kernel is computed on-the-fly."""
     return self.batch_size is not None
 
+  @property
+  def compute_dtype(self) -> Optional[jnp.dtype]:  # noqa: D102
+    if self.is_online:
+      return self._compute_dtype
+    return None
+
+  def set_compute_dtype(
+      self, compute_dtype: Optional[jnp.dtype]
+  ) -> "PointCloud":
+    """Modify the data type used to compute the costs in the online mode."""
+    if compute_dtype == self._compute_dtype:
+      return self
+    children, aux_data = self.tree_flatten()
+    aux_data["compute_dtype"] = compute_dtype
+    return type(self).tree_unflatten(aux_data, children)
+
   @property
   def diag_cost(self) -> jnp.ndarray:
     """Diagonal of the cost matrix."""
@@ -17,7 +17,7 @@ from typing import Callable, Optional, Tuple
 import jax
 import jax.numpy as jnp
 
-__all__ = ["segment_point_cloud"]
+__all__ = ["segment_point_cloud", "pad_point_cloud"]
 
 
 def segment_point_cloud(
@@ -108,11 +108,7 @@ def segment_point_cloud(
          num_per_segment).repeat(num_per_segment, total_repeat_length=num)
     )
 
-  if padding_vector is None:
-    padding_vector = jnp.zeros((1, dim))
-
-  x = jnp.concatenate((x, padding_vector))
-  a = jnp.concatenate((a, jnp.zeros((1,))))
+  x, a = pad_point_cloud(x, a, num + 1, padding_vector)
   segmented_a, segmented_x = [], []
 
   for i in range(num_segments):
@@ -130,6 +126,42 @@ def segment_point_cloud(
   return segmented_x, segmented_a, jnp.array(num_per_segment, dtype=int)
 
 
+def pad_point_cloud(
+    x: jnp.ndarray,
+    a: Optional[jnp.ndarray] = None,
+    size: Optional[int] = None,
+    padding_vector: Optional[jnp.ndarray] = None,
+) -> Tuple[jnp.ndarray, jnp.ndarray]:
+  """Pad a point cloud with points of zero weight.
+
+  Args:
+    x: Array of input points, of shape ``[num_x, ndim]``.
+    a: Array of shape ``[num_x,]`` containing the weights of the points.
+      If :obj:`None`, use uniform weights.
+    size: Number of points after padding, at least ``num_x``. If :obj:`None`,
+      don't pad.
+    padding_vector: vector to be used to pad the point cloud, see
+      :func:`segment_point_cloud`. If ``None``, vector of 0s of shape
+      ``[1, ndim]`` is used.
+
+  Returns:
+    The padded ``x`` of shape ``[size, ndim]`` and ``a`` of shape ``[size,]``.
+  """
+  num, dim = x.shape
+  if a is None:
+    a = jnp.full((num,), fill_value=1.0 / num, dtype=x.dtype)
+  if size is None:
+    size = num
+  assert size >= num, f"Cannot pad `{num}` points to `size={size}`."
+  if padding_vector is None:
+    padding_vector = jnp.zeros((1, dim), dtype=x.dtype)
+
+  padding = jnp.broadcast_to(padding_vector, (size - num, dim))
+  x = jnp.concatenate([x, padding.astype(x.dtype)])
+  a = jnp.concatenate([a, jnp.zeros((size - num,), dtype=a.dtype)])
+  return x, a
+
+
 def _segment_interface(
     x: jnp.ndarray,
     y: jnp.ndarray,
@@ -0,0 +1,251 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Any, Callable, Optional, Tuple
+
+import jax
+import jax.numpy as jnp
+import jax.sharding as jsh
+import jax.tree_util as jtu
+
+from ott.geometry import geometry, pointcloud
+
+try:
+  from jax import shard_map
+except ImportError:
+  from jax.experimental.shard_map import shard_map
+
+__all__ = ["ShardedPointCloud"]
+
+
+@jtu.register_pytree_node_class
+class ShardedPointCloud(pointcloud.PointCloud):
+  r"""Point cloud whose points are partitioned across the devices of a mesh.
+
+  The points ``x`` are partitioned along the ``x_axis`` of the ``mesh`` and
+  the points ``y`` along its ``y_axis``, so that each device only holds a
+  block of each point cloud. The kernel is applied with
+  :func:`~jax.experimental.shard_map.shard_map`: each device computes the
+  log-sum-exp of its block of the kernel, using the online computations of
+  :class:`~ott.geometry.pointcloud.PointCloud`, and the partial results are
+  combined across devices with a numerically stable all-reduce,
+
+  .. math::
+
+    \log \sum_d e^{\ell_d} = M + \log \sum_d e^{\ell_d - M},
+    \quad M = \max_d \ell_d.
+
+  The potentials are partitioned like their points, i.e., ``f`` along the
+  ``x_axis`` and ``g`` along the ``y_axis``, and stay partitioned throughout
+  the :class:`~ott.solvers.linear.sinkhorn.Sinkhorn` iterations. On CPU,
+  several devices can be emulated by setting
+  ``XLA_FLAGS=--xla_force_host_platform_device_count=8``.
+
+  Args:
+    x: Array of shape ``[n, d]``.
+    y: Array of shape ``[m, d]``. If :obj:`None`, use ``x``.
+    mesh: Device mesh.
+    x_axis: Name of the mesh axis along which ``x`` is partitioned.
+      If :obj:`None`, ``x`` is replicated.
+    y_axis: Name of the mesh axis along which ``y`` is partitioned.
+      If :obj:`None`, ``y`` is replicated.
+    kwargs: Keyword arguments for
+      :class:`~ott.geometry.pointcloud.PointCloud`. If ``batch_size`` or
+      ``tile_size`` are passed, they are used to compute the block of each
+      device.
+  """
+
+  def __init__(
+      self,
+      x: jnp.ndarray,
+      y: Optional[jnp.ndarray] = None,
+      *,
+      mesh: jsh.Mesh,
+      x_axis: Optional[str] = None,
+      y_axis: Optional[str] = None,
+      **kwargs: Any,
+  ):
+    super().__init__(x, y, **kwargs)
+    assert x_axis is None or x_axis != y_axis, \
+        "Points `x` and `y` must be partitioned along different mesh axes."
+    for arr, name in [(self.x, x_axis), (self.y, y_axis)]:
+      size = 1 if name is None else mesh.shape[name]
+      assert arr.shape[0] % size == 0, \
+          f"Number of points `{arr.shape[0]}` must be divisible by the " \
+          f"size `{size}` of the mesh axis `{name!r}`, consider padding " \
+          "the points with zero weights."
+    self.mesh = mesh
+    self.x_axis = x_axis
+    self.y_axis = y_axis
+
+  def sharding(self, axis: int = 1) -> jsh.NamedSharding:
+    """Sharding of the arrays indexed by the points.
+
+    Args:
+      axis: Sharding of the arrays indexed by ``x``, such as ``a`` and ``f``,
+        if ``axis = 1``, and by ``y``, such as ``b`` and ``g``, otherwise.
+
+    Returns:
+      The sharding.
+    """
+    return jsh.NamedSharding(self.mesh, self._spec(axis))
+
+  @geometry._counted("lse_kernel")
+  def apply_lse_kernel(  # noqa: D102
+      self,
+      f: jnp.ndarray,
+      g: jnp.ndarray,
+      eps: float,
+      vec: Optional[jnp.ndarray] = None,
+      axis: int = 0
+  ) -> Tuple[jnp.ndarray, jnp.ndarray]:
+
+    def apply(
+        x: jnp.ndarray, y: jnp.ndarray, f: jnp.ndarray, g: jnp.ndarray,
+        vec: Optional[jnp.ndarray], inv_scale_cost: jnp.ndarray
+    ) -> Tuple[jnp.ndarray, jnp.ndarray]:
+      geom = self._local_geometry(x, y, 1.0 / inv_scale_cost)
+      res, sgn = geom.apply_lse_kernel(f, g, eps, vec=vec, axis=axis)
+      # add back the potential removed from the partial log-sum-exp
+      h = f if axis == 1 else g
+      h = jnp.where(jnp.isfinite(h), h, 0.0)
+      res = (res + h) / eps
+      sgn = jnp.ones_like(res) if vec is None else sgn
+      # combine the partial log-sum-exp of all blocks
+      res_max = jax.lax.stop_gradient(res)
+      if reduce_axis is not None:
+        res_max = jax.lax.pmax(res_max, reduce_axis)
+      res_max = jnp.where(jnp.isfinite(res_max), res_max, 0.0)
+      total = sgn * jnp.exp(res - res_max)
+      if reduce_axis is not None:
+        total = jax.lax.psum(total, reduce_axis)
+      res = eps * (res_max + jnp.log(jnp.abs(total))) - h
+      return res, jnp.sign(total)
+
+    reduce_axis = self.x_axis if axis == 0 else self.y_axis
+    out_spec = self._spec(axis)
+    vec_spec = None if vec is None else self._spec(1 - axis)
+    res, sgn = self._shard_map(
+        apply,
+        in_specs=(
+            self._spec(1, 2),
+            self._spec(0, 2),
+            self._spec(1),
+            self._spec(0),
+            vec_spec,
+            jsh.PartitionSpec(),
+        ),
+        out_specs=(out_spec, out_spec),
+    )(self.x, self.y, f, g, vec, jnp.asarray(self.inv_scale_cost))
+    if vec is None:
+      return res, jnp.array([1.0])
+    return res, sgn
+
+  @geometry._counted("kernel")
+  def apply_kernel(  # noqa: D102
+      self,
+      vec: jnp.ndarray,
+      eps: Optional[float] = None,
+      axis: int = 0
+  ) -> jnp.ndarray:
+
+    def apply(
+        x: jnp.ndarray, y: jnp.ndarray, vec: jnp.ndarray,
+        inv_scale_cost: jnp.ndarray
+    ) -> jnp.ndarray:
+      geom = self._local_geometry(x, y, 1.0 / inv_scale_cost)
+      res = geom.apply_kernel(vec, eps, axis=axis)
+      return res if reduce_axis is None else jax.lax.psum(res, reduce_axis)
+
+    if eps is None:
+      eps = self.epsilon
+    reduce_axis = self.x_axis if axis == 0 else self.y_axis
+    return self._shard_map(
+        apply,
+        in_specs=(
+            self._spec(1, 2),
+            self._spec(0, 2),
+            self._spec(1 - axis),
+            jsh.PartitionSpec(),
+        ),
+        out_specs=self._spec(axis),
+    )(self.x, self.y, vec, jnp.asarray(self.inv_scale_cost))
+
+  def _apply_cost_to_vec(  # noqa: D102
+      self,
+      vec: jnp.ndarray,
+      axis: int = 0,
+      fn: Optional[Callable[[jnp.ndarray], jnp.ndarray]] = None,
+      is_linear: bool = False,
+      scale_cost: Optional[float] = None,
+  ) -> jnp.ndarray:
+
+    def apply(
+        x: jnp.ndarray, y: jnp.ndarray, vec: jnp.ndarray,
+        scale_cost: jnp.ndarray
+    ) -> jnp.ndarray:
+      geom = self._local_geometry(x, y, 1.0)
+      res = geom._apply_cost_to_vec(
+          vec, axis=axis, fn=fn, is_linear=is_linear, scale_cost=scale_cost
+      )
+      return res if reduce_axis is None else jax.lax.psum(res, reduce_axis)
+
+    # when computing the online properties, this is set to 1.0
+    if scale_cost is None:
+      scale_cost = self.inv_scale_cost
+    reduce_axis = self.x_axis if axis == 0 else self.y_axis
+    return self._shard_map(
+        apply,
+        in_specs=(
+            self._spec(1, 2),
+            self._spec(0, 2),
+            self._spec(1 - axis),
+            jsh.PartitionSpec(),
+        ),
+        out_specs=self._spec(axis),
+    )(self.x, self.y, vec, jnp.asarray(scale_cost))
+
+  def _local_geometry(
+      self, x: jnp.ndarray, y: jnp.ndarray, scale_cost: float
+  ) -> pointcloud.PointCloud:
+    """Point cloud of the block of a device, in the online mode."""
+    n, m = x.shape[0], y.shape[0]
+    return pointcloud.PointCloud(
+        x,
+        y,
+        cost_fn=self.cost_fn,
+        batch_size=max(n, m) if self._batch_size is None else self._batch_size,
+        tile_size=self._tile_size,
+        compute_dtype=self._compute_dtype,
+        epsilon=self.epsilon,
+        scale_cost=scale_cost,
+    )
+
+  def _spec(self, axis: int, ndim: int = 1) -> jsh.PartitionSpec:
+    """Spec of an array indexed by ``x`` if ``axis = 1``, else by ``y``."""
+    name = self.x_axis if axis == 1 else self.y_axis
+    return jsh.PartitionSpec(name, *((None,) * (ndim - 1)))
+
+  def _shard_map(self, fn: Callable[..., Any], **kwargs: Any) -> Callable:
+    return shard_map(fn, mesh=self.mesh, **kwargs)
+
+  @property
+  def is_online(self) -> bool:  # noqa: D102
+    return True
+
+  def tree_flatten(self):  # noqa: D102
+    children, aux_data = super().tree_flatten()
+    aux_data["mesh"] = self.mesh
+    aux_data["x_axis"] = self.x_axis
+    aux_data["y_axis"] = self.y_axis
+    return children, aux_data
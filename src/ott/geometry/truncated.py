@@ -0,0 +1,362 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Any, Callable, Optional, Tuple
+
+import jax
+import jax.experimental.sparse as jesp
+import jax.numpy as jnp
+import jax.tree_util as jtu
+
+from ott import utils
+from ott.geometry import geometry, pointcloud
+
+__all__ = ["TruncatedGeometry"]
+
+
+@jtu.register_pytree_node_class
+class TruncatedGeometry(geometry.Geometry):
+  r"""Geometry whose kernel is truncated to a sparse set of pairs.
+
+  At small :math:`\varepsilon`, most entries of the transport matrix
+  :math:`\exp((f_i + g_j - C_{ij}) / \varepsilon)` underflow. This geometry
+  only stores the pairs :math:`(i, j)` that carry non-negligible mass, as a
+  :class:`~jax.experimental.sparse.BCOO` cost matrix, so that applying the
+  kernel costs :math:`O(\text{nse})` instead of :math:`O(nm)`. The pairs that
+  are not stored have an infinite cost, i.e., a zero kernel entry.
+
+  Use :meth:`from_geometry` to select the pairs given the current dual
+  potentials, as done in the symmetric kernel truncation of multiscale
+  Sinkhorn :cite:`schmitzer:19`.
+
+  Args:
+    cost: Sparse cost matrix of shape ``[n, m]``. Stored entries with an
+      infinite cost are ignored, which allows for a fixed number of specified
+      elements.
+    kwargs: Keyword arguments for :class:`~ott.geometry.geometry.Geometry`.
+  """
+
+  def __init__(self, cost: jesp.BCOO, **kwargs: Any):
+    super().__init__(**kwargs)
+    self.cost = cost
+
+  @classmethod
+  def from_geometry(
+      cls,
+      geom: geometry.Geometry,
+      f: Optional[jnp.ndarray] = None,
+      g: Optional[jnp.ndarray] = None,
+      threshold: float = 10.0,
+      max_per_line: int = 32,
+      batch_size: Optional[int] = None,
+  ) -> "TruncatedGeometry":
+    r"""Truncate the kernel of a geometry around the dual potentials.
+
+    A pair :math:`(i, j)` is kept if its reduced cost
+    :math:`C_{ij} - f_i - g_j` is within :math:`\tau \varepsilon` of the
+    minimum of its row or of its column, i.e., if its entry in the transport
+    matrix is at least :math:`e^{-\tau}` times the largest entry of its row or
+    of its column. At most ``max_per_line`` pairs are kept per row and per
+    column, which bounds the number of specified elements by
+    ``(n + m) * max_per_line``.
+
+    Selecting the pairs requires a single pass over the cost matrix. For
+    a :class:`~ott.geometry.pointcloud.PointCloud`, the cost is computed
+    on the fly, ``batch_size`` lines at a time, and never materialized.
+
+    Args:
+      geom: Geometry to truncate.
+      f: Potential of shape ``[n,]``. If :obj:`None`, use zeros.
+      g: Potential of shape ``[m,]``. If :obj:`None`, use zeros.
+      threshold: Truncation threshold :math:`\tau`, relative to
+        :math:`\varepsilon`.
+      max_per_line: Maximum number of pairs kept per row and per column.
+      batch_size: Number of lines of the cost matrix computed at once.
+        If :obj:`None`, use the ``batch_size`` of the point cloud, if any,
+        or compute all lines at once.
+
+    Returns:
+      The truncated geometry, sharing the epsilon of ``geom``.
+    """
+    n, m = geom.shape
+    f = jnp.zeros(n, dtype=geom.dtype) if f is None else f
+    g = jnp.zeros(m, dtype=geom.dtype) if g is None else g
+    eps = geom.epsilon
+    if batch_size is None:
+      batch_size = getattr(geom, "batch_size", None)
+
+    # pairs selected along the rows (axis=1) and along the columns (axis=0)
+    row_cost, row_ixs, row_keep = _select_pairs(
+        geom,
+        g,
+        threshold * eps,
+        min(max_per_line, m),
+        axis=1,
+        batch_size=batch_size
+    )
+    col_cost, col_ixs, col_keep = _select_pairs(
+        geom,
+        f,
+        threshold * eps,
+        min(max_per_line, n),
+        axis=0,
+        batch_size=batch_size
+    )
+    k_row, k_col = row_ixs.shape[1], col_ixs.shape[1]
+
+    rows = jnp.concatenate([
+        jnp.repeat(jnp.arange(n), k_row),
+        col_ixs.ravel(),
+    ])
+    cols = jnp.concatenate([
+        row_ixs.ravel(),
+        jnp.repeat(jnp.arange(m), k_col),
+    ])
+    # drop the pairs selected along the columns already kept along the rows
+    dup = jnp.any((row_ixs[col_ixs] == jnp.arange(m)[:, None, None])
+                  & row_keep[col_ixs],
+                  axis=-1)
+    col_keep = col_keep & ~dup
+
+    keep = jnp.concatenate([row_keep.ravel(), col_keep.ravel()])
+    data = jnp.concatenate([row_cost.ravel(), col_cost.ravel()])
+    data = jnp.where(keep, data, jnp.inf)
+    cost = jesp.BCOO((data, jnp.stack([rows, cols], axis=-1)), shape=(n, m))
+
+    return cls(cost, epsilon=geom.epsilon_scheduler)
+
+  @property
+  def nse(self) -> int:
+    """Number of specified elements, including the ignored ones."""
+    return self.cost.nse
+
+  @property
+  def num_pairs(self) -> jnp.ndarray:
+    """Number of pairs with a finite cost."""
+    return jnp.sum(self._mask)
+
+  @property
+  def cost_matrix(self) -> jnp.ndarray:  # noqa: D102
+    n, m = self.shape
+    rows, cols = self._rows, self._cols
+    cost = jnp.full((n, m), fill_value=jnp.inf, dtype=self.dtype)
+    return cost.at[rows, cols].min(self._data)
+
+  @property
+  def kernel_matrix(self) -> jnp.ndarray:  # noqa: D102
+    return jnp.exp(-self.cost_matrix / self.epsilon)
+
+  @property
+  def shape(self) -> Tuple[int, int]:  # noqa: D102
+    return self.cost.shape
+
+  @property
+  def dtype(self) -> jnp.dtype:  # noqa: D102
+    return self.cost.dtype
+
+  @property
+  def is_symmetric(self) -> bool:  # noqa: D102
+    return False
+
+  @property
+  def inv_scale_cost(self) -> jnp.ndarray:  # noqa: D102
+    if utils.is_scalar(self._scale_cost):
+      return 1.0 / self._scale_cost
+    raise ValueError(f"Scaling {self._scale_cost} not implemented.")
+
+  @geometry._counted("kernel")
+  def apply_kernel(  # noqa: D102
+      self,
+      vec: jnp.ndarray,
+      eps: Optional[float] = None,
+      axis: int = 0,
+  ) -> jnp.ndarray:
+    if eps is None:
+      eps = self.epsilon
+    kernel = jnp.exp(-self._data / eps)
+    return self._apply(kernel, vec, axis=axis)
+
+  def _evaluation_stats(
+      self, evaluation: geometry.Evaluation, num_vecs: int
+  ) -> geometry.KernelStats:
+    # only the stored entries are read, along with their indices
+    n, m = self.shape
+    nnz = self.cost.nse
+    itemsize = jnp.dtype(self.dtype).itemsize
+    flops_per_entry = 4 if evaluation == "lse_kernel" else 2
+    return geometry._stats(
+        evaluation,
+        flops=flops_per_entry * nnz * num_vecs,
+        num_bytes=itemsize * (nnz + (n + m) * num_vecs) + 8 * nnz,
+    )
+
+  def _apply_cost_to_vec(
+      self,
+      vec: jnp.ndarray,
+      axis: int = 0,
+      fn: Optional[Callable[[jnp.ndarray], jnp.ndarray]] = None,
+      is_linear: bool = False,
+  ) -> jnp.ndarray:
+    """Apply ``[num_a, num_b]`` fn(cost) (or transpose) to vector.
+
+    Only the pairs with a finite cost contribute to the product.
+    """
+    del is_linear
+    cost = self._data if fn is None else fn(self._data)
+    cost = jnp.where(self._mask, cost, 0.0)
+    return self._apply(cost, vec, axis=axis)
+
+  def _apply(
+      self, data: jnp.ndarray, vec: jnp.ndarray, axis: int
+  ) -> jnp.ndarray:
+    n, m = self.shape
+    if axis == 0:
+      return jax.ops.segment_sum(data * vec[self._rows], self._cols, m)
+    return jax.ops.segment_sum(data * vec[self._cols], self._rows, n)
+
+  def _softmax(
+      self, f: jnp.ndarray, g: jnp.ndarray, eps: float,
+      vec: Optional[jnp.ndarray], axis: int
+  ) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    """Apply softmax row or column wise, weighted by vec."""
+    n, m = self.shape
+    rows, cols = self._rows, self._cols
+    z = jnp.where(self._mask, f[rows] + g[cols] - self._data, -jnp.inf) / eps
+    if axis == 0:
+      segment_ids, num_segments = cols, m
+      b = None if vec is None else vec[rows]
+    else:
+      segment_ids, num_segments = rows, n
+      b = None if vec is None else vec[cols]
+
+    res, sgn = _segment_logsumexp(z, segment_ids, num_segments, b=b)
+    if vec is None:
+      return eps * res, jnp.array([1.0])
+    return eps * res, sgn
+
+  def subset(  # noqa: D102
+      self,
+      row_ixs: Optional[jnp.ndarray] = None,
+      col_ixs: Optional[jnp.ndarray] = None
+  ) -> "TruncatedGeometry":
+    n, m = self.shape
+    rows, cols, keep = self._rows, self._cols, self._mask
+    if row_ixs is not None:
+      row_ixs = jnp.atleast_1d(row_ixs)
+      rows, keep = _reindex(rows, row_ixs, n, keep)
+      n = row_ixs.shape[0]
+    if col_ixs is not None:
+      col_ixs = jnp.atleast_1d(col_ixs)
+      cols, keep = _reindex(cols, col_ixs, m, keep)
+      m = col_ixs.shape[0]
+
+    # the number of specified elements is kept, the dropped pairs are
+    # given an infinite cost
+    data = jnp.where(keep, self.cost.data, jnp.inf)
+    cost = jesp.BCOO((data, jnp.stack([rows, cols], axis=-1)), shape=(n, m))
+    (_, *rest), aux_data = self.tree_flatten()
+    return type(self).tree_unflatten(aux_data, (cost, *rest))
+
+  @property
+  def _rows(self) -> jnp.ndarray:
+    return self.cost.indices[:, 0]
+
+  @property
+  def _cols(self) -> jnp.ndarray:
+    return self.cost.indices[:, 1]
+
+  @property
+  def _mask(self) -> jnp.ndarray:
+    return jnp.isfinite(self.cost.data)
+
+  @property
+  def _data(self) -> jnp.ndarray:
+    return self.cost.data * self.inv_scale_cost
+
+  def tree_flatten(self):  # noqa: D102
+    return (self.cost, self._epsilon_init), {
+        "scale_cost": self._scale_cost,
+        "relative_epsilon": self._relative_epsilon,
+    }
+
+  @classmethod
+  def tree_unflatten(cls, aux_data, children):  # noqa: D102
+    cost, epsilon = children
+    return cls(cost, epsilon=epsilon, **aux_data)
+
+
+def _select_pairs(
+    geom: geometry.Geometry,
+    h: jnp.ndarray,
+    threshold: float,
+    k: int,
+    axis: int,
+    batch_size: Optional[int] = None,
+) -> Tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray]:
+  """Select the ``k`` smallest reduced costs of each line of the cost matrix.
+
+  Lines are rows if ``axis=1`` and columns if ``axis=0``; ``h`` is the potential
+  along the reduced axis. Returns the costs, the indices along the reduced axis
+  and whether the reduced costs are within ``threshold`` of the line minimum.
+  """
+
+  def select(line: Any) -> Tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray]:
+    cost = line_cost(line)
+    neg_red, ixs = jax.lax.top_k(h - cost, k)
+    keep = neg_red[0] - neg_red <= threshold
+    return cost[ixs], ixs, keep
+
+  if isinstance(geom, pointcloud.PointCloud):
+    inv_scale_cost = geom.inv_scale_cost
+    z, z_red = (geom.y, geom.x) if axis == 0 else (geom.x, geom.y)
+
+    def line_cost(z_line: jnp.ndarray) -> jnp.ndarray:
+      return geom._tile_cost(z_line, z_red, axis) * inv_scale_cost
+  else:
+    z = geom.cost_matrix.T if axis == 0 else geom.cost_matrix
+
+    def line_cost(cost: jnp.ndarray) -> jnp.ndarray:
+      return cost
+
+  if batch_size is None:
+    return jax.vmap(select)(z)
+  return utils.batched_vmap(select, batch_size=batch_size)(z)
+
+
+def _reindex(
+    ixs: jnp.ndarray, subset_ixs: jnp.ndarray, size: int, keep: jnp.ndarray
+) -> Tuple[jnp.ndarray, jnp.ndarray]:
+  """Map indices in ``[0, size)`` to their position in ``subset_ixs``.
+
+  ``subset_ixs`` are assumed to be unique. Indices that are not in the subset
+  are mapped to ``0`` and are no longer kept.
+  """
+  pos = jnp.full((size,), -1).at[subset_ixs].set(jnp.arange(len(subset_ixs)))
+  new_ixs = pos[ixs]
+  return jnp.maximum(new_ixs, 0), keep & (new_ixs >= 0)
+
+
+def _segment_logsumexp(
+    z: jnp.ndarray,
+    segment_ids: jnp.ndarray,
+    num_segments: int,
+    b: Optional[jnp.ndarray] = None,
+) -> Tuple[jnp.ndarray, jnp.ndarray]:
+  """Signed log-sum-exp of ``z``, weighted by ``b``, over segments."""
+  z_max = jax.ops.segment_max(z, segment_ids, num_segments)
+  z_max = jax.lax.stop_gradient(jnp.where(jnp.isfinite(z_max), z_max, 0.0))
+  exp_z = jnp.exp(z - z_max[segment_ids])
+  if b is not None:
+    exp_z = b * exp_z
+  s = jax.ops.segment_sum(exp_z, segment_ids, num_segments)
+  return jnp.log(jnp.abs(s)) + z_max, jnp.sign(s)
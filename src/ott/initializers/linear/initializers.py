@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import abc
-from typing import Any, Dict, Optional, Sequence, Tuple
+from typing import Any, Dict, NamedTuple, Optional, Sequence, Tuple
 
 import jax
 import jax.numpy as jnp
@@ -23,7 +23,7 @@ from ott.problems.linear import linear_problem
 
 __all__ = [
     "DefaultInitializer", "GaussianInitializer", "SortingInitializer",
-    "SubsampleInitializer"
+    "SubsampleInitializer", "PotentialCache", "WarmStartInitializer"
 ]
 
 
@@ -360,6 +360,261 @@ class SubsampleInitializer(DefaultInitializer):
     })
 
 
+class PotentialCache(NamedTuple):
+  """Cache of the last dual potentials of several linear problems.
+
+  The cache has a fixed number of slots, each holding the points and dual
+  potentials of the last solve of a problem identified by an integer key.
+  Since all shapes are static, the cache can be passed to and returned from
+  jitted functions, and is threaded explicitly between the solves, e.g.::
+
+    cache = PotentialCache.create(capacity=8, max_n=128, max_m=128, dim=2)
+    solver = sinkhorn.Sinkhorn(initializer=WarmStartInitializer())
+
+    @jax.jit
+    def step(cache, key, prob):
+      out = solver(prob, cache=cache, key=key)
+      return out, cache.update(key, prob, out.f, out.g)
+
+  When a new key is stored in a full cache, the least recently updated slot
+  is evicted.
+
+  Args:
+    keys: Key of each slot, array of shape ``[capacity,]``.
+    last_used: Step at which each slot was last updated, or ``-1`` if the
+      slot is empty, array of shape ``[capacity,]``.
+    step: Number of updates of the cache.
+    x: First point clouds, array of shape ``[capacity, max_n, dim]``.
+    f: First dual potentials, array of shape ``[capacity, max_n]``. Padded and
+      zero-weight entries are ``-inf``.
+    y: Second point clouds, array of shape ``[capacity, max_m, dim]``.
+    g: Second dual potentials, array of shape ``[capacity, max_m]``. Padded and
+      zero-weight entries are ``-inf``.
+  """
+  keys: jnp.ndarray
+  last_used: jnp.ndarray
+  step: jnp.ndarray
+  x: jnp.ndarray
+  f: jnp.ndarray
+  y: jnp.ndarray
+  g: jnp.ndarray
+
+  @classmethod
+  def create(
+      cls,
+      capacity: int,
+      max_n: int,
+      max_m: int,
+      dim: int,
+      dtype: jnp.dtype = jnp.float32,
+  ) -> "PotentialCache":
+    """Create an empty cache.
+
+    Args:
+      capacity: Number of slots.
+      max_n: Maximum number of points in the first point clouds.
+      max_m: Maximum number of points in the second point clouds.
+      dim: Dimension of the points.
+      dtype: Data type of the points and potentials.
+
+    Returns:
+      The empty cache.
+    """
+    assert capacity > 0, f"`capacity={capacity}` must be positive."
+    return cls(
+        keys=jnp.zeros(capacity, dtype=int),
+        last_used=jnp.full(capacity, -1, dtype=int),
+        step=jnp.zeros((), dtype=int),
+        x=jnp.zeros((capacity, max_n, dim), dtype=dtype),
+        f=jnp.full((capacity, max_n), -jnp.inf, dtype=dtype),
+        y=jnp.zeros((capacity, max_m, dim), dtype=dtype),
+        g=jnp.full((capacity, max_m), -jnp.inf, dtype=dtype),
+    )
+
+  def lookup(self, key: jnp.ndarray) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    """Find the slot of a key.
+
+    Args:
+      key: Integer key.
+
+    Returns:
+      Whether the key is in the cache and the index of its slot, which is only
+      meaningful if the key is in the cache.
+    """
+    match = (self.keys == key) & (self.last_used >= 0)
+    return jnp.any(match), jnp.argmax(match)
+
+  def update(
+      self,
+      key: jnp.ndarray,
+      ot_prob: linear_problem.LinearProblem,
+      f: jnp.ndarray,
+      g: jnp.ndarray,
+  ) -> "PotentialCache":
+    """Store the dual potentials of a problem.
+
+    Args:
+      key: Integer key of the problem.
+      ot_prob: Linear problem whose geometry is a
+        :class:`~ott.geometry.pointcloud.PointCloud`.
+      f: First dual potential, array of shape ``[n,]``.
+      g: Second dual potential, array of shape ``[m,]``.
+
+    Returns:
+      The updated cache. If the key is new, it replaces an empty slot or,
+      if there is none, the least recently updated one.
+    """
+    geom = ot_prob.geom
+    assert isinstance(geom, pointcloud.PointCloud), \
+        f"Expected a point cloud, found `{type(geom)}`."
+    found, idx = self.lookup(key)
+    slot = jnp.where(found, idx, jnp.argmin(self.last_used))
+    step = self.step + 1
+
+    x, f = _pad(geom.x, f, ot_prob.a, self.x.shape[1])
+    y, g = _pad(geom.y, g, ot_prob.b, self.y.shape[1])
+    return self._replace(
+        keys=self.keys.at[slot].set(key),
+        last_used=self.last_used.at[slot].set(step),
+        step=step,
+        x=self.x.at[slot].set(x.astype(self.x.dtype)),
+        f=self.f.at[slot].set(f.astype(self.f.dtype)),
+        y=self.y.at[slot].set(y.astype(self.y.dtype)),
+        g=self.g.at[slot].set(g.astype(self.g.dtype)),
+    )
+
+
+@jax.tree_util.register_pytree_node_class
+class WarmStartInitializer(SinkhornInitializer):
+  r"""Warm-start initializer from a :class:`PotentialCache`.
+
+  The cache and the key of the problem are passed when calling the solver, e.g.
+  ``solver(ot_prob, cache=cache, key=key)``. If the key is in the cache, the
+  stored potentials are transferred to the points of the new problem, which
+  may differ in number and position, using the :term:`c-transform`:
+
+  .. math::
+
+    f_i = \varepsilon \log a_i - \varepsilon \log \sum_j
+    \exp\left(\frac{g^{\text{old}}_j - c(x_i, y^{\text{old}}_j)}
+    {\varepsilon}\right),
+
+  and similarly for :math:`g`. Otherwise, the ``fallback`` initializer is used.
+  Only :class:`~ott.geometry.pointcloud.PointCloud` geometries are supported.
+
+  Args:
+    fallback: Initializer used when the key is not in the cache or when no
+      cache is passed. If :obj:`None`, use :class:`DefaultInitializer`.
+  """
+
+  def __init__(self, fallback: Optional[SinkhornInitializer] = None):
+    super().__init__()
+    self.fallback = DefaultInitializer() if fallback is None else fallback
+
+  def init_fu(  # noqa: D102
+      self,
+      ot_prob: linear_problem.LinearProblem,
+      lse_mode: bool,
+      rng: Optional[jax.Array] = None,
+  ) -> jnp.ndarray:
+    return self.fallback.init_fu(ot_prob, lse_mode=lse_mode, rng=rng)
+
+  def init_gv(  # noqa: D102
+      self,
+      ot_prob: linear_problem.LinearProblem,
+      lse_mode: bool,
+      rng: Optional[jax.Array] = None,
+  ) -> jnp.ndarray:
+    return self.fallback.init_gv(ot_prob, lse_mode=lse_mode, rng=rng)
+
+  def __call__(
+      self,
+      ot_prob: linear_problem.LinearProblem,
+      lse_mode: bool,
+      rng: Optional[jax.Array] = None,
+      cache: Optional[PotentialCache] = None,
+      key: Optional[jnp.ndarray] = None,
+  ) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    """Initialize Sinkhorn potentials/scalings f_u and g_v.
+
+    Args:
+      ot_prob: Linear OT problem.
+      lse_mode: Return potentials if ``True``, scalings if ``False``.
+      rng: Random number generator for the ``fallback`` initializer.
+      cache: Cache of potentials. If :obj:`None`, use the ``fallback``.
+      key: Integer key of the problem in the ``cache``.
+
+    Returns:
+      The initial potentials/scalings.
+    """
+
+    def warm_start(_: Optional[jax.Array]) -> Tuple[jnp.ndarray, jnp.ndarray]:
+      fu, gv = _transfer(ot_prob, cache, idx)
+      if not lse_mode:
+        fu = ot_prob.geom.scaling_from_potential(fu)
+        gv = ot_prob.geom.scaling_from_potential(gv)
+      mask_value = -jnp.inf if lse_mode else 0.0
+      fu = jnp.where(ot_prob.a > 0.0, fu, mask_value)
+      gv = jnp.where(ot_prob.b > 0.0, gv, mask_value)
+      return fu.astype(ot_prob.a.dtype), gv.astype(ot_prob.b.dtype)
+
+    def cold_start(rng: Optional[jax.Array]) -> Tuple[jnp.ndarray, jnp.ndarray]:
+      return self.fallback(ot_prob, lse_mode=lse_mode, rng=rng)
+
+    if cache is None:
+      return cold_start(rng)
+    assert key is not None, "Please specify the `key` of the problem."
+    assert isinstance(ot_prob.geom, pointcloud.PointCloud), \
+        f"Expected a point cloud, found `{type(ot_prob.geom)}`."
+
+    found, idx = cache.lookup(key)
+    rng = utils.default_prng_key(rng)
+    return jax.lax.cond(found, warm_start, cold_start, rng)
+
+  def tree_flatten(self) -> Tuple[Sequence[Any], Dict[str, Any]]:  # noqa: D102
+    return [], {"fallback": self.fallback}
+
+
+def _pad(x: jnp.ndarray, f: jnp.ndarray, weights: jnp.ndarray,
+         size: int) -> Tuple[jnp.ndarray, jnp.ndarray]:
+  """Pad points with zeros and a potential with ``-inf`` to ``size``."""
+  n = x.shape[0]
+  assert n <= size, f"Number of points `{n}` exceeds the cache size `{size}`."
+  f = jnp.where(weights > 0.0, f, -jnp.inf)
+  x = jnp.pad(x, ((0, size - n), (0, 0)))
+  f = jnp.pad(f, (0, size - n), constant_values=-jnp.inf)
+  return x, f
+
+
+def _transfer(
+    ot_prob: linear_problem.LinearProblem,
+    cache: PotentialCache,
+    idx: jnp.ndarray,
+) -> Tuple[jnp.ndarray, jnp.ndarray]:
+  """Transfer the potentials of a cache slot to the points of a problem."""
+  geom = ot_prob.geom
+  n, m = geom.shape
+  kwargs = {
+      "cost_fn": geom.cost_fn,
+      "batch_size": geom.batch_size,
+      "epsilon": geom.epsilon,
+      # keep the scaling of the cost of the new problem
+      "scale_cost": 1.0 / geom.inv_scale_cost,
+  }
+  x_old, f_old = cache.x[idx], cache.f[idx].astype(geom.dtype)
+  y_old, g_old = cache.y[idx], cache.g[idx].astype(geom.dtype)
+
+  geom_f = pointcloud.PointCloud(geom.x, y_old.astype(geom.y.dtype), **kwargs)
+  f = geom_f.update_potential(
+      jnp.zeros(n, dtype=geom.dtype), g_old, jnp.log(ot_prob.a), axis=1
+  )
+  geom_g = pointcloud.PointCloud(x_old.astype(geom.x.dtype), geom.y, **kwargs)
+  g = geom_g.update_potential(
+      f_old, jnp.zeros(m, dtype=geom.dtype), jnp.log(ot_prob.b), axis=0
+  )
+  return f, g
+
+
 def _vectorized_update(
     f: jnp.ndarray, modified_cost: jnp.ndarray
 ) -> jnp.ndarray:
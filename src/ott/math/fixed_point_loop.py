@@ -35,6 +35,8 @@ def fixpoint_iter(
   the ``compute_error`` flag to ``True``, indicating that additional
   computational effort can be spent on recalculating the latest error
   (``errors`` are stored as the first element of the state tuple).
+  If ``inner_iterations = 1``, the flag is the Python boolean :obj:`True`,
+  which ``body_fn`` can use to avoid tracing a conditional.
 
   upon termination of these ``inner_iterations``, the loop is continued if
   iteration is smaller than ``min_iterations``, stopped if equal/larger than
@@ -77,9 +79,12 @@ def fixpoint_iter(
       iteration += 1
       return (iteration, state), None
 
-    iteration_state, _ = jax.lax.scan(
-        one_iteration, iteration_state, compute_error_flags
-    )
+    if inner_iterations == 1:
+      iteration_state, _ = one_iteration(iteration_state, True)
+    else:
+      iteration_state, _ = jax.lax.scan(
+          one_iteration, iteration_state, compute_error_flags
+      )
     return (iteration_state, None) if force_scan else iteration_state
 
   if force_scan:
@@ -148,9 +153,12 @@ def fixpoint_iter_fwd(
       iteration += 1
       return (iteration, state), None
 
-    iteration_state, _ = jax.lax.scan(
-        one_iteration, (iteration, state), compute_error_flags
-    )
+    if inner_iterations == 1:
+      iteration_state, _ = one_iteration((iteration, state), True)
+    else:
+      iteration_state, _ = jax.lax.scan(
+          one_iteration, (iteration, state), compute_error_flags
+      )
     iteration, state = iteration_state
     out = (iteration, states, state)
     return (out, None) if force_scan else out
@@ -187,16 +195,16 @@ def fixpoint_iter_bwd(
     return iteration >= 0
 
   def unrolled_body_fn_no_errors(iteration, constants, state):
-    compute_error_flags = jnp.zeros((inner_iterations,), dtype=bool)
 
-    def one_iteration(iteration_state, compute_error):
+    def one_iteration(iteration_state, _):
       iteration, state = iteration_state
-      state = body_fn(iteration, constants, state, compute_error)
+      # static flag, so that no error computation is traced and linearized
+      state = body_fn(iteration, constants, state, False)
       iteration += 1
       return (iteration, state), None
 
     iteration_state, _ = jax.lax.scan(
-        one_iteration, (iteration, state), compute_error_flags
+        one_iteration, (iteration, state), None, length=inner_iterations
     )
     _, state = iteration_state
     return state
@@ -0,0 +1,80 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import queue
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+__all__ = ["Prefetcher"]
+
+T = TypeVar("T")
+
+
+class Prefetcher(Generic[T]):
+  """Iterator producing its items ahead of time in a background thread.
+
+  The items are produced in order by a single thread, which blocks once
+  ``size`` items are waiting to be consumed. Since JAX dispatches its
+  computations asynchronously, an item whose arrays are computed by a jitted
+  function is enqueued as soon as the computation is dispatched, so that the
+  device computes the next items while the current one is being consumed.
+  Exceptions raised when producing an item, including :class:`StopIteration`,
+  are raised by :meth:`__next__` once the previous items are consumed.
+
+  Args:
+    produce: Function returning the next item.
+    size: Maximum number of items waiting to be consumed.
+  """
+
+  def __init__(self, produce: Callable[[], T], size: int):
+    assert size > 0, f"`size={size}` must be positive."
+    self._produce = produce
+    self._queue = queue.Queue(maxsize=size)
+    self._error: Optional[Exception] = None
+    self._stop = threading.Event()
+    self._thread = threading.Thread(target=self._run, daemon=True)
+    self._thread.start()
+
+  def __iter__(self) -> "Prefetcher[T]":
+    return self
+
+  def __next__(self) -> T:
+    if self._error is not None:
+      raise self._error
+    item, error = self._queue.get()
+    if error is not None:
+      self._error = error
+      raise error
+    return item
+
+  def close(self) -> None:
+    """Stop the background thread, discarding the items not consumed."""
+    self._stop.set()
+    self._thread.join()
+
+  def _run(self) -> None:
+    while not self._stop.is_set():
+      try:
+        item = (self._produce(), None)
+      # `produce` is arbitrary, its exception is re-raised by `__next__`
+      except Exception as e:  # noqa: BLE001
+        item = (None, e)
+      # wake up regularly to check whether the prefetcher was closed
+      while not self._stop.is_set():
+        try:
+          self._queue.put(item, timeout=0.1)
+        except queue.Full:
+          continue
+        break
+      if item[1] is not None:
+        return
@@ -13,16 +13,22 @@
 # limitations under the License.
 import dataclasses
 import functools
-from typing import Any, Iterable, Iterator, Literal, Optional, Tuple
+from typing import Any, Iterable, Iterator, List, Literal, Optional, Tuple
 
 import jax
+import jax.numpy as jnp
 import jax.random as jr
 
 from ott.geometry import costs, pointcloud
-from ott.solvers import linear
+from ott.neural.data import _prefetch
+from ott.problems.linear import linear_problem
+from ott.solvers.linear import sinkhorn
 
 __all__ = ["LinearOTDataloader"]
 
+# points and potentials of the previous batch
+_Potentials = Tuple[jax.Array, jax.Array, jax.Array, jax.Array]
+
 
 @dataclasses.dataclass(frozen=False, repr=False)
 class LinearOTDataloader:
@@ -46,7 +52,25 @@ class LinearOTDataloader:
       :class:`~ott.solvers.linear.sinkhorn.Sinkhorn`.
     max_iterations: Maximum number of Sinkhorn iterations.
     replace: Whether to sample with replacement.
+    batch_size: Number of points processed at once when computing the cost
+      and sampling the coupling, see
+      :class:`~ott.geometry.pointcloud.PointCloud`. If :obj:`None`, the
+      coupling is computed at once, which requires memory quadratic in the
+      size of the batches.
     shardings: Input and output shardings for the source and target arrays.
+    prefetch_size: Number of batches aligned ahead of time in a background
+      thread, so that the alignment overlaps with the consumption of the
+      current batch. If ``0``, align each batch when requested.
+    warm_start: Whether to initialize the potentials of each batch, except
+      the first one, with the :term:`c-transform` of the potentials of the
+      previous batch onto the new points. Since successive batches are drawn
+      from the same distributions, this typically reduces the number of
+      Sinkhorn iterations, unless the optimal potentials are close to constant,
+      e.g., when the source and target distributions coincide.
+
+  The number of Sinkhorn iterations used to align each batch is appended,
+  as a device array, to the ``n_iters`` list, which is reset by
+  :func:`iter`.
   """
   rng: jax.Array
   dataset: Iterable[Tuple[jax.Array, jax.Array]]
@@ -56,26 +80,40 @@ class LinearOTDataloader:
   threshold: float = 1e-3
   max_iterations: int = 2000
   replace: bool = True
+  batch_size: Optional[int] = None
   shardings: Optional[jax.sharding.Sharding] = None
+  prefetch_size: int = 0
+  warm_start: bool = False
 
   def __post_init__(self) -> None:
     self._align_fn = jax.jit(
         functools.partial(
             _align,
+            batch_size=self.batch_size,
             threshold=self.threshold,
-            max_iterations=self.max_iterations
+            max_iterations=self.max_iterations,
         ),
         static_argnames=["cost_fn", "epsilon", "relative_epsilon", "replace"],
-        in_shardings=(None, self.shardings, self.shardings),
-        out_shardings=(self.shardings, self.shardings),
+        in_shardings=(None, self.shardings, self.shardings, None),
+        out_shardings=(self.shardings, self.shardings, None, None),
     )
     self._data_it: Optional[Iterator[Tuple[jax.Array, jax.Array]]] = None
     self._rng_it: Optional[jax.Array] = None
+    self._prev: Optional[_Potentials] = None
+    self.n_iters: List[jax.Array] = []
+    self._prefetcher: Optional[_prefetch.Prefetcher] = None
 
   def __iter__(self) -> "LinearOTDataloader":
     """Return self."""
+    self.close()
     self._data_it = iter(self.dataset)
     self._rng_it = self.rng
+    self._prev = None
+    self.n_iters = []
+    if self.prefetch_size > 0:
+      self._prefetcher = _prefetch.Prefetcher(
+          self._next_batch, self.prefetch_size
+      )
     return self
 
   def __next__(self) -> Tuple[jax.Array, jax.Array]:
@@ -86,42 +124,92 @@ class LinearOTDataloader:
     """
     assert self._data_it is not None, "Please call `iter()` first."
     assert self._rng_it is not None, "Please call `iter()` first."
+    if self._prefetcher is not None:
+      return next(self._prefetcher)
+    return self._next_batch()
+
+  def close(self) -> None:
+    """Stop prefetching the batches, if :attr:`prefetch_size` is positive."""
+    if self._prefetcher is not None:
+      self._prefetcher.close()
+      self._prefetcher = None
+
+  def _next_batch(self) -> Tuple[jax.Array, jax.Array]:
     self._rng_it, rng_sample = jr.split(self._rng_it, 2)
     x, y = next(self._data_it)
-    return self._align_fn(
+    if self.shardings is not None:
+      x, y = jax.device_put((x, y), self.shardings)
+    x, y, n_iters, prev = self._align_fn(
         rng_sample,
         x,
         y,
+        self._prev,
         self.cost_fn,
         self.epsilon,
         self.relative_epsilon,
         self.replace,
     )
+    if self.warm_start:
+      self._prev = prev
+    self.n_iters.append(n_iters)
+    return x, y
 
 
 def _align(
     rng: jax.Array,
     x: jax.Array,
     y: jax.Array,
+    prev: Optional[_Potentials],
     cost_fn: costs.CostFn,
     epsilon: Optional[float],
     relative_epsilon: Optional[Literal["mean", "std"]],
     replace: bool,
+    batch_size: Optional[int],
     **kwargs: Any,
-) -> Tuple[jax.Array, jax.Array]:
+) -> Tuple[jax.Array, jax.Array, jax.Array, _Potentials]:
   geom = pointcloud.PointCloud(
       x,
       y,
       cost_fn=cost_fn,
       epsilon=epsilon,
       relative_epsilon=relative_epsilon,
+      batch_size=batch_size,
   )
-  out = linear.solve(geom, **kwargs)
+  init = None if prev is None else _c_transform(geom, *prev)
+  prob = linear_problem.LinearProblem(geom)
+  out = sinkhorn.Sinkhorn(**kwargs)(prob, init=init)
+
+  # sample from the coupling `batch_size` rows at a time, without
+  # materializing it, using the Gumbel-max trick
+  n, _ = geom.shape
+  row_ixs, col_ixs = out.sample(rng, n, batch_size=batch_size, replace=replace)
+  return x[row_ixs], y[col_ixs], out.n_iters, (x, y, out.f, out.g)
 
-  n, m = geom.shape
-  probs = out.matrix.ravel()
-  probs = probs / probs.sum()
 
-  ixs = jr.choice(rng, n * m, shape=(n,), p=probs, replace=replace)
-  row_ixs, col_ixs = ixs // m, ixs % m
-  return x[row_ixs], y[col_ixs]
+def _c_transform(
+    geom: pointcloud.PointCloud,
+    x_prev: jax.Array,
+    y_prev: jax.Array,
+    f_prev: jax.Array,
+    g_prev: jax.Array,
+) -> Tuple[jax.Array, jax.Array]:
+  """Initial potentials of ``geom`` given the potentials of the last batch.
+
+  The potential of each new point is one Sinkhorn update against the
+  potential of the other measure of the previous batch.
+  """
+  n, m = geom.shape
+  kwargs = {
+      "cost_fn": geom.cost_fn,
+      "epsilon": geom.epsilon,
+      "batch_size": geom.batch_size,
+  }
+  geom_x = pointcloud.PointCloud(geom.x, y_prev, **kwargs)
+  geom_y = pointcloud.PointCloud(x_prev, geom.y, **kwargs)
+  f = geom_x.update_potential(
+      jnp.zeros(n, dtype=f_prev.dtype), g_prev, -jnp.log(n), axis=1
+  )
+  g = geom_y.update_potential(
+      f_prev, jnp.zeros(m, dtype=g_prev.dtype), -jnp.log(m), axis=0
+  )
+  return f, g
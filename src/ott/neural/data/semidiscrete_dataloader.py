@@ -18,6 +18,7 @@ import jax
 import jax.numpy as jnp
 import jax.random as jr
 
+from ott.neural.data import _prefetch
 from ott.solvers.linear import semidiscrete
 
 __all__ = ["SemidiscreteDataloader"]
@@ -53,6 +54,9 @@ class SemidiscreteDataloader:
     return_indices: Whether to return, in addition to paired source and target
       data points, the indices corresponding to the selected target data points.
     out_shardings: Output shardings for the aligned batch.
+    prefetch_size: Number of batches sampled ahead of time in a background
+      thread, so that the sampling overlaps with the consumption of the
+      current batch. If ``0``, sample each batch when requested.
   """  # noqa: E501
   rng: jax.Array
   sd_out: semidiscrete.SemidiscreteOutput
@@ -62,6 +66,7 @@ class SemidiscreteDataloader:
   subset_size: Optional[int] = None
   return_indices: bool = False
   out_shardings: Optional[jax.sharding.Sharding] = None
+  prefetch_size: int = 0
 
   def __post_init__(self) -> None:
     _, m = self.sd_out.geom.shape
@@ -76,6 +81,7 @@ class SemidiscreteDataloader:
         f"Subset size must be in (0, {m}), got {self.subset_size}."
 
     self._rng_it: Optional[jax.Array] = None
+    self._prefetcher: Optional[_prefetch.Prefetcher] = None
     self._sample_fn = jax.jit(
         _sample,
         out_shardings=self.out_shardings,
@@ -90,7 +96,12 @@ class SemidiscreteDataloader:
 
   def __iter__(self) -> "SemidiscreteDataloader":
     """Return self."""
+    self.close()
     self._rng_it = self.rng
+    if self.prefetch_size > 0:
+      self._prefetcher = _prefetch.Prefetcher(
+          self._next_batch, self.prefetch_size
+      )
     return self
 
   def __next__(
@@ -104,6 +115,20 @@ class SemidiscreteDataloader:
       optionally the sampled target indices of shape ``[batch,]``.
     """
     assert self._rng_it is not None, "Please call `iter()` first."
+    if self._prefetcher is not None:
+      return next(self._prefetcher)
+    return self._next_batch()
+
+  def close(self) -> None:
+    """Stop prefetching the batches, if :attr:`prefetch_size` is positive."""
+    if self._prefetcher is not None:
+      self._prefetcher.close()
+      self._prefetcher = None
+
+  def _next_batch(
+      self
+  ) -> Union[Tuple[jax.Array, jax.Array], Tuple[jax.Array, jax.Array,
+                                                jax.Array]]:
     self._rng_it, rng_sample = jr.split(self._rng_it, 2)
     return self._sample_fn(
         rng_sample,
@@ -16,7 +16,7 @@ from typing import Any, Callable, Dict, Literal, Optional, Sequence, Tuple
 import jax
 import jax.numpy as jnp
 
-from ott.geometry import geometry, pointcloud
+from ott.geometry import geometry, neighbors, pointcloud
 from ott.math import utils as math_utils
 
 __all__ = ["LinearProblem"]
@@ -110,19 +110,26 @@ class LinearProblem:
 
   def potential_fn_from_dual_vec(
       self,
-      fg: jax.Array,
+      fg: Optional[jax.Array],
       *,
       epsilon: Optional[float] = None,
       axis: Literal[0, 1],
+      index: Optional[neighbors.BruteForceIndex] = None,
   ) -> Callable[[jax.Array], jax.Array]:
     r"""Get potential function from a dual vector using the :term:`c-transform`.
 
     Args:
       fg: Potential vector :math:`\mathbb{f}` if ``axis = 0``
         else :math:`\mathbb{g}` of shape ``[n,]`` or ``[m,]``, respectively.
-      epsilon: Epsilon regularization. If :obj:`None`, use in the :attr:`geom`.
+        Must be :obj:`None` if ``index`` is passed.
+      epsilon: Epsilon regularization. If :obj:`None`, use in the :attr:`geom`,
+        or ``0`` if ``index`` is passed.
       axis: If ``axis = 0``, return the :math:`g`-potential function, otherwise
         return the :math:`f`-potential function.
+      index: Nearest-neighbor index of the points the potential is defined
+        on, built with the potential, see :mod:`ott.geometry.neighbors`. If
+        passed, the hard :term:`c-transform` is computed using the index, and
+        ``epsilon`` must be ``0``.
 
     Returns:
       The dual potential function.
@@ -132,27 +139,31 @@ class LinearProblem:
       x, y = jnp.atleast_2d(x), self.geom.y
       geom = pointcloud.PointCloud(x, y, cost_fn=self.geom.cost_fn)
       prob = LinearProblem(geom, b=self.b)
-      f, _ = prob._c_transform(fg, epsilon=epsilon, axis=axis)
+      f, _ = prob._c_transform(fg, epsilon=epsilon, axis=axis, index=index)
       return f.squeeze(0)
 
     def g_potential(y: jax.Array) -> jax.Array:
       x, y = self.geom.x, jnp.atleast_2d(y)
       geom = pointcloud.PointCloud(x, y, cost_fn=self.geom.cost_fn)
       prob = LinearProblem(geom, a=self.a)
-      g, _ = prob._c_transform(fg, epsilon=epsilon, axis=axis)
+      g, _ = prob._c_transform(fg, epsilon=epsilon, axis=axis, index=index)
       return g.squeeze(0)
 
     assert axis in (0, 1), axis
-    epsilon = self.geom.epsilon if epsilon is None else epsilon
+    if index is not None:
+      _check_index_args(fg, epsilon)
+    if epsilon is None:
+      epsilon = 0.0 if index is not None else self.geom.epsilon
     return g_potential if axis == 0 else f_potential
 
   def _c_transform(
       self,
-      fg: jax.Array,
+      fg: Optional[jax.Array],
       *,
       epsilon: Optional[float] = None,
       axis: Literal[0, 1],
-  ) -> Tuple[jax.Array, jax.Array]:
+      index: Optional[neighbors.BruteForceIndex] = None,
+  ) -> Tuple[jax.Array, Optional[jax.Array]]:
 
     def _soft_c_transform(fg: jax.Array) -> Tuple[jax.Array, jax.Array]:
       cost = self.geom.cost_matrix
@@ -166,8 +177,13 @@ class LinearProblem:
       return -jnp.max(z, initial=-jnp.inf, where=pos_weights, axis=axis), z
 
     assert axis in (0, 1), axis
-    fg = jnp.expand_dims(fg, 1 - axis)
+    if index is not None:
+      _check_index_args(fg, epsilon)
+      # the c-transform does not need the cost matrix
+      f, _ = index.c_transform(self.geom.x if axis == 1 else self.geom.y)
+      return f, None
     epsilon = self.geom.epsilon if epsilon is None else epsilon
+    fg = jnp.expand_dims(fg, 1 - axis)
     return jax.lax.cond(epsilon > 0.0, _soft_c_transform, _hard_c_transform, fg)
 
   def get_transport_functions(
@@ -203,3 +219,21 @@ class LinearProblem:
       cls, aux_data: Dict[str, Any], children: Sequence[Any]
   ) -> "LinearProblem":
     return cls(*children, **aux_data)
+
+
+def _check_index_args(
+    fg: Optional[jax.Array], epsilon: Optional[float]
+) -> None:
+  """Check the arguments of a :term:`c-transform` computed with an index."""
+  if fg is not None:
+    raise ValueError(
+        "The index holds the potential, `fg` must be `None` when an index is "
+        "passed."
+    )
+  # a traced `epsilon` cannot be compared to `0`
+  if not (
+      epsilon is None or (isinstance(epsilon, (int, float)) and epsilon == 0.0)
+  ):
+    raise ValueError(
+        f"The index only computes the hard c-transform, got `{epsilon=}`."
+    )
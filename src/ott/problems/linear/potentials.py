@@ -12,14 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import dataclasses
+import functools
 from typing import Any, Callable, Dict, Optional, Tuple
 
 import jax
 import jax.numpy as jnp
+import jax.scipy as jsp
 import jax.tree_util as jtu
 import numpy as np
 
-from ott.geometry import costs
+from ott import utils
+from ott.geometry import costs, neighbors
 
 try:
   import matplotlib as mpl
@@ -27,7 +30,7 @@ try:
 except ImportError:
   mpl = plt = None
 
-__all__ = ["DualPotentials"]
+__all__ = ["DualPotentials", "EntropicPotentials"]
 
 PotentialFn = Callable[[jax.Array], jax.Array]
 
@@ -268,3 +271,290 @@ class DualPotentials:
       fig.tight_layout()
     ax.set_title(r"$f$" if forward else r"$g$")
     return fig, ax
+
+
+@jtu.register_pytree_node_class
+class EntropicPotentials:
+  r"""Entropic dual potential functions, evaluated from precomputed tables.
+
+  The potentials are the entropic :term:`c-transform` of the dual vectors
+  :math:`\mathbf{g}` and :math:`\mathbf{f}`,
+
+  .. math::
+
+    f(x) = -\varepsilon \log \sum_j \exp\left(w^y_j
+    - \frac{c(x, y_j)}{\varepsilon}\right), \quad
+    g(y) = -\varepsilon \log \sum_i \exp\left(w^x_i
+    - \frac{c(x_i, y)}{\varepsilon}\right),
+
+  where the log-weights :math:`w^y_j = \log b_j + \mathbf{g}_j / \varepsilon`
+  and :math:`w^x_i = \log a_i + \mathbf{f}_i / \varepsilon` are computed
+  once, see :meth:`from_potentials`, along with the norms of the points for
+  the :class:`~ott.geometry.costs.SqEuclidean` cost, so that the cost against
+  all points is a single matrix product. Unlike
+  :class:`DualPotentials` built from a
+  :meth:`~ott.problems.linear.linear_problem.LinearProblem.potential_fn_from_dual_vec`,
+  no geometry or problem is instantiated per query, and the queries are
+  evaluated ``batch_size`` at a time.
+
+  With ``top_k``, only the ``top_k`` points with the smallest reduced cost
+  :math:`c(x, y_j) - \varepsilon w^y_j` enter the log-sum-exp of a query.
+  If an ``index`` is passed, see :meth:`with_index`, these candidates are
+  retrieved by a nearest-neighbor search, instead of computing the reduced
+  cost against all points. The fraction of the mass left out by the
+  truncation is bounded by :meth:`error_bound`.
+
+  Args:
+    x: Support of the first measure, array of shape ``[n, d]``.
+    y: Support of the second measure, array of shape ``[m, d]``.
+    log_weights_x: Log-weights :math:`w^x` of shape ``[n,]``.
+    log_weights_y: Log-weights :math:`w^y` of shape ``[m,]``.
+    epsilon: Entropic regularization.
+    cost_fn: Cost function. If :obj:`None`, use
+      :class:`~ott.geometry.costs.SqEuclidean`.
+    batch_size: Number of queries evaluated at once. If :obj:`None`, evaluate
+      all queries at once.
+    top_k: If not :obj:`None`, only sum the ``top_k`` largest terms of each
+      log-sum-exp, which truncates the entropic map to the ``top_k`` points
+      with the largest weights.
+    norms_x: Norms of ``x``, only used with the
+      :class:`~ott.geometry.costs.SqEuclidean` cost. If :obj:`None`, compute
+      them.
+    norms_y: Norms of ``y``, only used with the
+      :class:`~ott.geometry.costs.SqEuclidean` cost. If :obj:`None`, compute
+      them.
+    index: Nearest-neighbor index of ``y`` with the potential
+      :math:`\varepsilon w^y`, used to retrieve the ``top_k`` candidates of
+      the potential :math:`f` and of the forward map.
+  """  # noqa: E501
+
+  def __init__(
+      self,
+      x: jnp.ndarray,
+      y: jnp.ndarray,
+      log_weights_x: jnp.ndarray,
+      log_weights_y: jnp.ndarray,
+      epsilon: float,
+      cost_fn: Optional[costs.CostFn] = None,
+      batch_size: Optional[int] = None,
+      top_k: Optional[int] = None,
+      norms_x: Optional[jnp.ndarray] = None,
+      norms_y: Optional[jnp.ndarray] = None,
+      index: Optional[neighbors.BruteForceIndex] = None,
+  ):
+    assert index is None or top_k is not None, \
+        "Retrieving candidates with an index requires `top_k`."
+    self.x = x
+    self.y = y
+    self.log_weights_x = log_weights_x
+    self.log_weights_y = log_weights_y
+    self.epsilon = epsilon
+    self.cost_fn = costs.SqEuclidean() if cost_fn is None else cost_fn
+    self.batch_size = batch_size
+    self.top_k = top_k
+    if self._is_sqeucl:
+      norms_x = self.cost_fn.norm(x) if norms_x is None else norms_x
+      norms_y = self.cost_fn.norm(y) if norms_y is None else norms_y
+    self.norms_x = norms_x
+    self.norms_y = norms_y
+    self.index = index
+
+  @classmethod
+  def from_potentials(
+      cls,
+      x: jnp.ndarray,
+      y: jnp.ndarray,
+      f: jnp.ndarray,
+      g: jnp.ndarray,
+      epsilon: float,
+      a: Optional[jnp.ndarray] = None,
+      b: Optional[jnp.ndarray] = None,
+      **kwargs: Any,
+  ) -> "EntropicPotentials":
+    """Precompute the tables of the potentials.
+
+    Args:
+      x: Support of the first measure, array of shape ``[n, d]``.
+      y: Support of the second measure, array of shape ``[m, d]``.
+      f: First dual vector of shape ``[n,]``.
+      g: Second dual vector of shape ``[m,]``.
+      epsilon: Entropic regularization.
+      a: Weights of the first measure in the :term:`c-transform` of ``f``.
+        If :obj:`None`, use unit weights.
+      b: Weights of the second measure in the :term:`c-transform` of ``g``.
+        If :obj:`None`, use unit weights.
+      kwargs: Keyword arguments for :class:`EntropicPotentials`.
+
+    Returns:
+      The potentials.
+    """
+    log_weights_x = f / epsilon
+    if a is not None:
+      log_weights_x = log_weights_x + jnp.log(a)
+    log_weights_y = g / epsilon
+    if b is not None:
+      log_weights_y = log_weights_y + jnp.log(b)
+    return cls(x, y, log_weights_x, log_weights_y, epsilon, **kwargs)
+
+  def __call__(self, vec: jnp.ndarray, forward: bool = True) -> jnp.ndarray:
+    """Evaluate the potential :math:`f`, or :math:`g`, on a batch of points.
+
+    Args:
+      vec: Points of shape ``[n, d]``.
+      forward: Whether to evaluate :math:`f` or :math:`g`.
+
+    Returns:
+      The potential of shape ``[n,]``.
+    """
+    fn = functools.partial(self._potential, forward=forward)
+    return self._map(fn, jnp.atleast_2d(vec))
+
+  def transport(self, vec: jnp.ndarray, forward: bool = True) -> jnp.ndarray:
+    """Transport points using the entropic map.
+
+    See :meth:`DualPotentials.transport` for more information.
+
+    Args:
+      vec: Points to transport, array of shape ``[n, d]``.
+      forward: Whether to transport the points from source to the target
+        distribution or vice-versa.
+
+    Returns:
+      The transported points.
+    """
+
+    def transport(vec: jnp.ndarray) -> jnp.ndarray:
+      grad = jax.grad(self._potential)(vec, forward=forward)
+      return self.cost_fn.twist_operator(vec, grad, not forward)
+
+    return self._map(transport, jnp.atleast_2d(vec))
+
+  def with_index(
+      self, approximate: bool = False, **kwargs: Any
+  ) -> "EntropicPotentials":
+    """Retrieve the ``top_k`` candidates of each query with an index.
+
+    Only the :class:`~ott.geometry.costs.SqEuclidean` and
+    :class:`~ott.geometry.costs.NegDotProduct` costs are supported.
+
+    Args:
+      approximate: Whether to build an approximate
+        :class:`~ott.geometry.neighbors.IVFIndex`, trading accuracy for
+        latency through its ``num_probes``, or an exact
+        :class:`~ott.geometry.neighbors.BruteForceIndex`.
+      kwargs: Keyword arguments for the index.
+
+    Returns:
+      The potentials using the index.
+    """
+    is_finite = jnp.isfinite(self.log_weights_y)
+    g = jnp.where(is_finite, self.epsilon * self.log_weights_y, 0.0)
+    args = (self.y, g, is_finite.astype(g.dtype), self.cost_fn)
+    if approximate:
+      index = neighbors.IVFIndex.build(*args, **kwargs)
+    else:
+      index = neighbors.BruteForceIndex(*args, **kwargs)
+    children, aux_data = self.tree_flatten()
+    return type(self).tree_unflatten(aux_data, children[:-1] + [index])
+
+  def error_bound(self, vec: jnp.ndarray, forward: bool = True) -> jnp.ndarray:
+    r"""Upper-bound the fraction of the mass left out by ``top_k``.
+
+    Each of the terms left out of the log-sum-exp is at most the smallest
+    term kept, which bounds their total mass by :math:`\delta`. The
+    potential is then overestimated by at most
+    :math:`-\varepsilon \log(1 - \delta)` and, for the
+    :class:`~ott.geometry.costs.SqEuclidean` cost, the transported point
+    differs by at most :math:`\delta` times the diameter of the support.
+    When the candidates are retrieved by an approximate index, the bound only
+    holds if the candidates are the true ``top_k`` ones.
+
+    Args:
+      vec: Points of shape ``[n, d]``.
+      forward: Whether to bound the error of :math:`f` or of :math:`g`.
+
+    Returns:
+      The bound :math:`\delta` of shape ``[n,]``, ``0`` without ``top_k``.
+    """
+
+    def bound(vec: jnp.ndarray) -> jnp.ndarray:
+      logits = self._logits(vec, forward=forward)
+      num_left = num_points - logits.shape[0]
+      ratio = num_left * jnp.exp(
+          jnp.min(logits) - jsp.special.logsumexp(logits)
+      )
+      return ratio / (1.0 + ratio)
+
+    num_points = (self.y if forward else self.x).shape[0]
+    return self._map(bound, jnp.atleast_2d(vec))
+
+  def to_dual_potentials(self) -> DualPotentials:
+    """Convert to dual potential functions evaluated on single points."""
+    return DualPotentials(
+        f=functools.partial(self._potential, forward=True),
+        g=functools.partial(self._potential, forward=False),
+        cost_fn=self.cost_fn,
+    )
+
+  def _potential(self, vec: jnp.ndarray, forward: bool) -> jnp.ndarray:
+    logits = self._logits(vec, forward=forward)
+    return -self.epsilon * jsp.special.logsumexp(logits)
+
+  def _logits(self, vec: jnp.ndarray, forward: bool) -> jnp.ndarray:
+    if forward:
+      points, log_weights, norms = self.y, self.log_weights_y, self.norms_y
+    else:
+      points, log_weights, norms = self.x, self.log_weights_x, self.norms_x
+
+    if forward and self.index is not None:
+      ixs = self.index(vec[None], k=self.top_k)[0]
+      # approximate indices pad the missing candidates with `m`
+      log_weights = log_weights.at[ixs].get(mode="fill", fill_value=-jnp.inf)
+      points = points[ixs]
+      norms = None if norms is None else norms[ixs]
+
+    if self._is_sqeucl:
+      cost = self.cost_fn.norm(vec) + norms - 2.0 * jnp.dot(points, vec)
+    elif forward:
+      cost = jax.vmap(self.cost_fn, in_axes=[None, 0])(vec, points)
+    else:
+      cost = jax.vmap(self.cost_fn, in_axes=[0, None])(points, vec)
+
+    logits = log_weights - cost / self.epsilon
+    if self.top_k is not None and logits.shape[0] > self.top_k:
+      logits, _ = jax.lax.top_k(logits, self.top_k)
+    return logits
+
+  def _map(
+      self, fn: Callable[[jnp.ndarray], jnp.ndarray], vec: jnp.ndarray
+  ) -> jnp.ndarray:
+    if self.batch_size is None or self.batch_size >= vec.shape[0]:
+      return jax.vmap(fn)(vec)
+    return utils.batched_vmap(fn, batch_size=self.batch_size)(vec)
+
+  @property
+  def _is_sqeucl(self) -> bool:
+    return isinstance(self.cost_fn, costs.SqEuclidean)
+
+  def tree_flatten(self):  # noqa: D102
+    return [
+        self.x,
+        self.y,
+        self.log_weights_x,
+        self.log_weights_y,
+        self.epsilon,
+        self.cost_fn,
+        self.norms_x,
+        self.norms_y,
+        self.index,
+    ], {
+        "batch_size": self.batch_size,
+        "top_k": self.top_k,
+    }
+
+  @classmethod
+  def tree_unflatten(cls, aux_data, children):  # noqa: D102
+    *children, norms_x, norms_y, index = children
+    return cls(
+        *children, norms_x=norms_x, norms_y=norms_y, index=index, **aux_data
+    )
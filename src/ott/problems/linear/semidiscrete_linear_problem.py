@@ -17,7 +17,7 @@ import jax
 import jax.numpy as jnp
 import jax.tree_util as jtu
 
-from ott.geometry import semidiscrete_pointcloud
+from ott.geometry import neighbors, semidiscrete_pointcloud
 from ott.problems.linear import linear_problem
 
 __all__ = ["SemidiscreteLinearProblem"]
@@ -73,15 +73,21 @@ class SemidiscreteLinearProblem:
 
   def potential_fn_from_dual_vec(
       self,
-      g: jax.Array,
+      g: Optional[jax.Array],
       *,
-      epsilon: Optional[float] = None
+      epsilon: Optional[float] = None,
+      index: Optional[neighbors.BruteForceIndex] = None,
   ) -> Callable[[jax.Array], jax.Array]:
     r"""Get potential function from a dual vector using the :term:`c-transform`.
 
     Args:
-      g: Potential vector :math:`\mathbb{g}` of shape ``[m,]``.
-      epsilon: Epsilon regularization. If :obj:`None`, use in the :attr:`geom`.
+      g: Potential vector :math:`\mathbb{g}` of shape ``[m,]``. Must be
+        :obj:`None` if ``index`` is passed.
+      epsilon: Epsilon regularization. If :obj:`None`, use in the :attr:`geom`,
+        or ``0`` if ``index`` is passed.
+      index: Nearest-neighbor index of the points of the second measure, built
+        with their potential. If passed, the hard :term:`c-transform`
+        is computed using the index, and ``epsilon`` must be ``0``.
 
     Returns:
       The dual potential function :math:`f`.
@@ -89,7 +95,9 @@ class SemidiscreteLinearProblem:
     # `potential_fn_from_dual_vec` accesses only necessary properties of the
     # problem/geometry, so we can pass the semidiscrete point cloud
     prob = linear_problem.LinearProblem(self.geom, b=self.b)
-    return prob.potential_fn_from_dual_vec(g, epsilon=epsilon, axis=1)
+    return prob.potential_fn_from_dual_vec(
+        g, epsilon=epsilon, axis=1, index=index
+    )
 
   @property
   def b(self) -> jnp.ndarray:
@@ -19,10 +19,23 @@ from . import (
     lr_utils,
     semidiscrete,
     sinkhorn,
+    sinkhorn_batch,
+    sinkhorn_greedy,
     sinkhorn_lr,
+    sinkhorn_multiscale,
+    sinkhorn_screened,
+    sinkhorn_truncated,
     univariate,
 )
-from ._solve import solve, solve_semidiscrete, solve_univariate
+from ._solve import (
+    bucketed_solve,
+    solve,
+    solve_batch,
+    solve_screened,
+    solve_semidiscrete,
+    solve_truncated,
+    solve_univariate,
+)
 
 __all__ = [
     "acceleration",
@@ -32,9 +45,18 @@ __all__ = [
     "lr_utils",
     "semidiscrete",
     "sinkhorn",
+    "sinkhorn_batch",
+    "sinkhorn_greedy",
     "sinkhorn_lr",
+    "sinkhorn_multiscale",
+    "sinkhorn_screened",
+    "sinkhorn_truncated",
     "univariate",
     "solve",
+    "solve_batch",
+    "solve_truncated",
+    "solve_screened",
+    "bucketed_solve",
     "solve_univariate",
     "solve_semidiscrete",
 ]
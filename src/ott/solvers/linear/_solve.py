@@ -11,19 +11,38 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Any, Optional, Union
+from typing import Any, Callable, Dict, Optional, Sequence, Union
 
 import jax
 import jax.numpy as jnp
 
 from ott import utils
-from ott.geometry import geometry, pointcloud
+from ott.geometry import costs, epsilon_scheduler, geometry, pointcloud, segment
 from ott.geometry import semidiscrete_pointcloud as sdpc
 from ott.problems.linear import linear_problem
 from ott.problems.linear import semidiscrete_linear_problem as sdlp
-from ott.solvers.linear import semidiscrete, sinkhorn, sinkhorn_lr, univariate
+from ott.solvers.linear import (
+    semidiscrete,
+    sinkhorn,
+    sinkhorn_batch,
+    sinkhorn_lr,
+    sinkhorn_multiscale,
+    sinkhorn_screened,
+    sinkhorn_truncated,
+    univariate,
+)
 
-__all__ = ["solve", "solve_univariate", "solve_semidiscrete"]
+__all__ = [
+    "solve",
+    "solve_batch",
+    "solve_truncated",
+    "solve_screened",
+    "bucketed_solve",
+    "solve_univariate",
+    "solve_semidiscrete",
+]
+
+Output = Union[sinkhorn.SinkhornOutput, sinkhorn_lr.LRSinkhornOutput]
 
 
 def solve(
@@ -33,6 +52,7 @@ def solve(
     tau_a: float = 1.0,
     tau_b: float = 1.0,
     rank: int = -1,
+    num_clusters: Optional[Sequence[int]] = None,
     **kwargs: Any
 ) -> Union[sinkhorn.SinkhornOutput, sinkhorn_lr.LRSinkhornOutput]:
   """Solve linear regularized OT problem using Sinkhorn iterations.
@@ -48,10 +68,14 @@ def solve(
     rank:
       Rank constraint on the coupling to minimize the linear OT problem
       :cite:`scetbon:21`. If :math:`-1`, no rank constraint is used.
+    num_clusters: Number of clusters of each coarse level, from coarsest to
+      finest, used by the multiscale solver. If :obj:`None`, the problem is
+      solved at a single scale. Only used when ``rank = -1``.
     kwargs: Keyword arguments for
-      :class:`~ott.solvers.linear.sinkhorn.Sinkhorn` or
+      :class:`~ott.solvers.linear.sinkhorn.Sinkhorn`,
+      :class:`~ott.solvers.linear.sinkhorn_multiscale.MultiscaleSinkhorn` or
       :class:`~ott.solvers.linear.sinkhorn_lr.LRSinkhorn`,
-      depending on the ``rank``.
+      depending on the ``rank`` and ``num_clusters``.
 
   Returns:
     The Sinkhorn output.
@@ -59,11 +83,249 @@ def solve(
   prob = linear_problem.LinearProblem(geom, a=a, b=b, tau_a=tau_a, tau_b=tau_b)
   if rank > 0:
     solver = sinkhorn_lr.LRSinkhorn(rank=rank, **kwargs)
+  elif num_clusters is not None:
+    solver = sinkhorn_multiscale.MultiscaleSinkhorn(
+        num_clusters=num_clusters, **kwargs
+    )
   else:
     solver = sinkhorn.Sinkhorn(**kwargs)
   return solver(prob)
 
 
+def solve_batch(
+    geom: geometry.Geometry,
+    a: Optional[jnp.ndarray] = None,
+    b: Optional[jnp.ndarray] = None,
+    tau_a: float = 1.0,
+    tau_b: float = 1.0,
+    num_slots: Optional[int] = None,
+    **kwargs: Any
+) -> sinkhorn.SinkhornOutput:
+  """Solve a stack of linear regularized OT problems using Sinkhorn iterations.
+
+  Each problem is monitored separately and stops as soon as it has converged,
+  see :func:`~ott.solvers.linear.sinkhorn_batch.run_batch` for more
+  information.
+
+  Args:
+    geom: The ground geometries of the linear problems, stacked along the first
+      axis of their non-scalar leaves, e.g., a
+      :class:`~ott.geometry.pointcloud.PointCloud` with ``x`` of shape
+      ``[batch, n, d]`` and ``y`` of shape ``[batch, m, d]``.
+    a: The first marginals of shape ``[batch, n]``. If :obj:`None`, they will be
+      uniform.
+    b: The second marginals of shape ``[batch, m]``. If :obj:`None`, they will
+      be uniform.
+    tau_a: If :math:`< 1`, defines how much unbalanced the problems are
+      on the first marginal.
+    tau_b: If :math:`< 1`, defines how much unbalanced the problems are
+      on the second marginal.
+    num_slots: Number of problems solved concurrently. If :obj:`None`, use a
+      quarter of the batch size, rounded up.
+    kwargs: Keyword arguments for
+      :class:`~ott.solvers.linear.sinkhorn.Sinkhorn`.
+
+  Returns:
+    The Sinkhorn output, whose arrays are stacked along the first axis.
+  """
+  prob = linear_problem.LinearProblem(geom, a=a, b=b, tau_a=tau_a, tau_b=tau_b)
+  solver = sinkhorn.Sinkhorn(**kwargs)
+  return sinkhorn_batch.run_batch(prob, solver, num_slots=num_slots)
+
+
+def solve_truncated(
+    geom: geometry.Geometry,
+    a: Optional[jnp.ndarray] = None,
+    b: Optional[jnp.ndarray] = None,
+    tau_a: float = 1.0,
+    tau_b: float = 1.0,
+    num_rebuilds: int = 3,
+    threshold: float = 10.0,
+    max_per_line: int = 32,
+    **kwargs: Any
+) -> sinkhorn.SinkhornOutput:
+  """Solve linear regularized OT problem using a truncated kernel.
+
+  Only the pairs that carry non-negligible mass given the current potentials
+  are kept, see :func:`~ott.solvers.linear.sinkhorn_truncated.run_truncated`
+  for more information.
+
+  Args:
+    geom: The ground geometry of the linear problem.
+    a: The first marginal. If :obj:`None`, it will be uniform.
+    b: The second marginal. If :obj:`None`, it will be uniform.
+    tau_a: If :math:`< 1`, defines how much unbalanced the problem is
+      on the first marginal.
+    tau_b: If :math:`< 1`, defines how much unbalanced the problem is
+      on the second marginal.
+    num_rebuilds: Number of times the truncated kernel is rebuilt.
+    threshold: Truncation threshold, relative to epsilon.
+    max_per_line: Maximum number of pairs kept per row and per column.
+    kwargs: Keyword arguments for
+      :class:`~ott.solvers.linear.sinkhorn.Sinkhorn`.
+
+  Returns:
+    The Sinkhorn output on the last truncated geometry.
+  """
+  prob = linear_problem.LinearProblem(geom, a=a, b=b, tau_a=tau_a, tau_b=tau_b)
+  solver = sinkhorn.Sinkhorn(**kwargs)
+  return sinkhorn_truncated.run_truncated(
+      prob,
+      solver,
+      num_rebuilds=num_rebuilds,
+      threshold=threshold,
+      max_per_line=max_per_line,
+  )
+
+
+def solve_screened(
+    geom: geometry.Geometry,
+    a: Optional[jnp.ndarray] = None,
+    b: Optional[jnp.ndarray] = None,
+    tau_a: float = 1.0,
+    tau_b: float = 1.0,
+    *,
+    num_active_a: int,
+    num_active_b: int,
+    **kwargs: Any
+) -> sinkhorn.SinkhornOutput:
+  """Solve linear regularized OT problem restricted to its active points.
+
+  The points carrying a negligible mass are screened out before running the
+  Sinkhorn iterations, see
+  :func:`~ott.solvers.linear.sinkhorn_screened.screen` for more information.
+
+  Args:
+    geom: The ground geometry of the linear problem.
+    a: The first marginal. If :obj:`None`, it will be uniform.
+    b: The second marginal. If :obj:`None`, it will be uniform.
+    tau_a: If :math:`< 1`, defines how much unbalanced the problem is
+      on the first marginal.
+    tau_b: If :math:`< 1`, defines how much unbalanced the problem is
+      on the second marginal.
+    num_active_a: Number of active points of the first measure.
+    num_active_b: Number of active points of the second measure.
+    kwargs: Keyword arguments for
+      :class:`~ott.solvers.linear.sinkhorn.Sinkhorn`.
+
+  Returns:
+    The Sinkhorn output of the full problem.
+  """
+  prob = linear_problem.LinearProblem(geom, a=a, b=b, tau_a=tau_a, tau_b=tau_b)
+  solver = sinkhorn.Sinkhorn(**kwargs)
+  return sinkhorn_screened.run_screened(
+      prob, solver, num_active_a=num_active_a, num_active_b=num_active_b
+  )
+
+
+def bucketed_solve(
+    solve_fn: Optional[Callable[..., Output]] = None,
+    buckets: Sequence[int] = (256, 1024, 4096, 16384),
+    geom_kwargs: Optional[Dict[str, Any]] = None,
+    **kwargs: Any,
+) -> Callable[..., Output]:
+  """Pad the point clouds of a solve function to a fixed set of sizes.
+
+  The returned function pads both point clouds to the smallest bucket that
+  contains them, using points of zero weight given by
+  :meth:`~ott.geometry.costs.CostFn._padder`, see
+  :func:`~ott.geometry.segment.pad_point_cloud`, and solves the padded
+  problem with a jitted ``solve_fn``. Problems of different sizes falling in
+  the same buckets reuse the same compiled executable. The padding is then
+  stripped from the output, whose potentials or factors and coupling are the
+  ones of the problem without padding. The solver must support marginals
+  with zero weights, as :class:`~ott.solvers.linear.sinkhorn.Sinkhorn` does.
+
+  Example:
+    .. code-block:: python
+
+      solve = bucketed_solve(max_iterations=500)
+      for x, y in point_clouds:  # of varying sizes
+        out = solve(x, y, epsilon=1e-2)
+
+  Args:
+    solve_fn: Function with the signature ``solve_fn(geom, a, b, **kwargs)``
+      returning a :class:`~ott.solvers.linear.sinkhorn.SinkhornOutput` or a
+      :class:`~ott.solvers.linear.sinkhorn_lr.LRSinkhornOutput`. If
+      :obj:`None`, use :func:`solve`.
+    buckets: Increasing sizes to which the point clouds are padded. Sizes
+      larger than the last bucket are padded to a multiple of it.
+    geom_kwargs: Keyword arguments for
+      :class:`~ott.geometry.pointcloud.PointCloud`, such as ``batch_size``.
+      The ``scale_cost`` must not depend on the padding points, i.e., it
+      must be a number, ``'max_norm'`` or ``'max_bound'``.
+    kwargs: Keyword arguments for ``solve_fn``.
+
+  Returns:
+    A function with the signature
+    ``solve(x, y=None, a=None, b=None, cost_fn=None, epsilon=None)``. The
+    default or relative epsilon is computed on the point clouds without
+    padding, outside of the compiled function.
+  """
+  assert buckets, "Please specify at least one bucket."
+  assert buckets[0] > 0, f"Buckets `{buckets}` must be positive."
+  assert all(
+      b0 < b1 for b0, b1 in zip(buckets[:-1], buckets[1:])
+  ), f"Buckets `{buckets}` must be increasing."
+  if solve_fn is None:
+    solve_fn = solve
+  if geom_kwargs is None:
+    geom_kwargs = {}
+  scale_cost = geom_kwargs.get("scale_cost", 1.0)
+  assert scale_cost not in ("mean", "max_cost", "median"), \
+      f"Scaling `{scale_cost}` depends on the padding points."
+  # the epsilon passed to the padded geometry is already absolute
+  padded_geom_kwargs = {
+      k: v for k, v in geom_kwargs.items() if k != "relative_epsilon"
+  }
+
+  @jax.jit
+  def solve_padded(
+      x: jnp.ndarray, y: jnp.ndarray, a: jnp.ndarray, b: jnp.ndarray,
+      cost_fn: costs.CostFn, epsilon: epsilon_scheduler.Epsilon
+  ) -> Output:
+    geom = pointcloud.PointCloud(
+        x, y, cost_fn=cost_fn, epsilon=epsilon, **padded_geom_kwargs
+    )
+    return solve_fn(geom, a, b, **kwargs)
+
+  def bucketed(
+      x: jnp.ndarray,
+      y: Optional[jnp.ndarray] = None,
+      a: Optional[jnp.ndarray] = None,
+      b: Optional[jnp.ndarray] = None,
+      cost_fn: Optional[costs.CostFn] = None,
+      epsilon: Any = None,
+  ) -> Output:
+    y = x if y is None else y
+    cost_fn = costs.SqEuclidean() if cost_fn is None else cost_fn
+    (n, dim), m = x.shape, y.shape[0]
+    geom = pointcloud.PointCloud(
+        x, y, cost_fn=cost_fn, epsilon=epsilon, **geom_kwargs
+    )
+
+    padding_vector = cost_fn._padder(dim)
+    x, a = segment.pad_point_cloud(x, a, _bucket(n, buckets), padding_vector)
+    y, b = segment.pad_point_cloud(y, b, _bucket(m, buckets), padding_vector)
+    out = solve_padded(x, y, a, b, cost_fn, geom.epsilon_scheduler)
+
+    (_, a, b), aux_data = out.ot_prob.tree_flatten()
+    prob = type(out.ot_prob).tree_unflatten(aux_data, [geom, a[:n], b[:m]])
+    if isinstance(out, sinkhorn_lr.LRSinkhornOutput):
+      return out.set(q=out.q[:n], r=out.r[:m], ot_prob=prob)
+    return out.set(potentials=(out.f[:n], out.g[:m]), ot_prob=prob)
+
+  return bucketed
+
+
+def _bucket(size: int, buckets: Sequence[int]) -> int:
+  """Smallest bucket containing ``size``, or a multiple of the largest one."""
+  for bucket in buckets:
+    if size <= bucket:
+      return bucket
+  return -(-size // buckets[-1]) * buckets[-1]
+
+
 def solve_univariate(
     geom: pointcloud.PointCloud,
     a: Optional[jnp.ndarray] = None,
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import functools
-from typing import Any, NamedTuple, Optional, Tuple, Union
+from typing import Any, Dict, NamedTuple, Optional, Sequence, Tuple, Union
 
 import jax
 import jax.numpy as jnp
@@ -181,7 +181,25 @@ class FreeBarycenterOutput(NamedTuple):
 
 @jax.tree_util.register_pytree_node_class
 class FreeWassersteinBarycenter(was_solver.WassersteinSolver):
-  """Continuous Wasserstein barycenter solver :cite:`cuturi:14`."""
+  """Continuous Wasserstein barycenter solver :cite:`cuturi:14`.
+
+  Args:
+    args: Positional arguments for
+      :class:`~ott.solvers.was_solver.WassersteinSolver`.
+    telemetry: Channel receiving the cost and the convergence of the linear
+      solvers at every outer iteration. See :class:`~ott.utils.Telemetry`.
+    kwargs: Keyword arguments for
+      :class:`~ott.solvers.was_solver.WassersteinSolver`.
+  """
+
+  def __init__(
+      self,
+      *args: Any,
+      telemetry: Optional[utils.Telemetry] = None,
+      **kwargs: Any
+  ):
+    super().__init__(*args, **kwargs)
+    self.telemetry = telemetry
 
   def __call__(  # noqa: D102
       self,
@@ -298,9 +316,18 @@ class FreeWassersteinBarycenter(was_solver.WassersteinSolver):
     ) -> FreeBarycenterState:
       del compute_error  # Always assumed True
       bar_prob = constants
-      return state.update(
+      state = state.update(
           iteration, bar_prob, self.linear_solver, self.store_inner_errors
       )
+      if self.telemetry is not None:
+        self.telemetry.record(
+            type(self).__name__, iteration, {
+                "iteration": iteration,
+                "cost": state.costs[iteration],
+                "linear_converged": state.linear_convergence[iteration],
+            }
+        )
+      return state
 
     state = fixed_point_loop.fixpoint_iter(
         cond_fn=cond_fn,
@@ -313,3 +340,8 @@ class FreeWassersteinBarycenter(was_solver.WassersteinSolver):
     )
 
     return self.output_from_state(state, bar_prob)
+
+  def tree_flatten(self) -> Tuple[Sequence[Any], Dict[str, Any]]:  # noqa: D102
+    children, aux_data = super().tree_flatten()
+    aux_data["telemetry"] = self.telemetry
+    return children, aux_data
@@ -17,6 +17,7 @@ from typing import NamedTuple, Optional, Sequence
 import jax
 import jax.numpy as jnp
 
+from ott import utils
 from ott.geometry import geometry
 from ott.math import fixed_point_loop
 from ott.problems.linear import barycenter_problem
@@ -34,7 +35,7 @@ class SinkhornBarycenterOutput(NamedTuple):  # noqa: D101
 
 @jax.tree_util.register_pytree_node_class
 class FixedBarycenter:
-  """A Wasserstein barycenter solver for histograms on a common geometry.
+  r"""A Wasserstein barycenter solver for histograms on a common geometry.
 
   This solver uses a variant of the
   :class:`~ott.solvers.linear.sinkhorn.Sinkhorn` algorithm proposed in
@@ -56,6 +57,8 @@ class FixedBarycenter:
     lse_mode: sets computations in kernel (``False``) or log-sum-exp mode.
     debiased: uses debiasing correction to avoid blur due to entropic
       regularization.
+    telemetry: Channel receiving the error and :math:`\varepsilon` every time
+      the error is computed. See :class:`~ott.utils.Telemetry`.
   """
 
   def __init__(
@@ -66,7 +69,8 @@ class FixedBarycenter:
       min_iterations: int = 0,
       max_iterations: int = 2000,
       lse_mode: bool = True,
-      debiased: bool = False
+      debiased: bool = False,
+      telemetry: Optional[utils.Telemetry] = None,
   ):
     self.threshold = threshold
     self.norm_error = norm_error
@@ -75,6 +79,7 @@ class FixedBarycenter:
     self.max_iterations = max_iterations
     self.lse_mode = lse_mode
     self.debiased = debiased
+    self.telemetry = telemetry
 
   def __call__(
       self,
@@ -112,7 +117,7 @@ class FixedBarycenter:
     return _discrete_barycenter(
         geom, a, weights, dual_initialization, self.threshold, norm_error,
         self.inner_iterations, self.min_iterations, self.max_iterations,
-        self.lse_mode, self.debiased, num_a, num_b
+        self.lse_mode, self.debiased, num_a, num_b, self.telemetry
     )
 
   def tree_flatten(self):  # noqa: D102
@@ -127,12 +132,13 @@ class FixedBarycenter:
     return cls(**aux_data, threshold=children[0])
 
 
-@functools.partial(jax.jit, static_argnums=(5, 6, 7, 8, 9, 10, 11, 12))
+@functools.partial(jax.jit, static_argnums=(5, 6, 7, 8, 9, 10, 11, 12, 13))
 def _discrete_barycenter(
     geom: geometry.Geometry, a: jnp.ndarray, weights: jnp.ndarray,
     dual_initialization: jnp.ndarray, threshold: float,
     norm_error: Sequence[int], inner_iterations: int, min_iterations: int,
-    max_iterations: int, lse_mode: bool, debiased: bool, num_a: int, num_b: int
+    max_iterations: int, lse_mode: bool, debiased: bool, num_a: int, num_b: int,
+    telemetry: Optional[utils.Telemetry]
 ) -> SinkhornBarycenterOutput:
   """Jit'able function to compute discrete barycenters."""
   if lse_mode:
@@ -226,6 +232,16 @@ def _discrete_barycenter(
     )
 
     errors = errors.at[iteration // inner_iterations, :].set(err)
+    if telemetry is not None and compute_error is not False:
+      telemetry.record(
+          "FixedBarycenter",
+          iteration // inner_iterations, {
+              "iteration": iteration,
+              "error": err,
+              "epsilon": eps,
+          },
+          when=compute_error
+      )
     return errors, d, f_u, g_v
 
   state = (errors, d, f_u, g_v)
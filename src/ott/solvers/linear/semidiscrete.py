@@ -25,7 +25,7 @@ import jax.tree_util as jtu
 import optax
 
 from ott import utils
-from ott.geometry import geometry, pointcloud
+from ott.geometry import geometry, neighbors, pointcloud
 from ott.geometry import semidiscrete_pointcloud as sdpc
 from ott.math import fixed_point_loop
 from ott.problems.linear import linear_problem, potentials
@@ -149,6 +149,7 @@ class SemidiscreteOutput:
       num_samples: int,
       *,
       epsilon: Optional[float] = None,
+      index: Optional[neighbors.BruteForceIndex] = None,
   ) -> Union[sinkhorn.SinkhornOutput, HardAssignmentOutput]:
     """Sample a point cloud and compute the OT solution.
 
@@ -157,6 +158,10 @@ class SemidiscreteOutput:
       num_samples: Number of samples.
       epsilon: Epsilon regularization. If :obj:`None`, use the one stored
         in the :attr:`geometry <geom>`.
+      index: Nearest-neighbor index of the data points with the potential
+        :attr:`g`, see :meth:`to_index`, used to assign the samples if the
+        problem is not entropically regularized. If :obj:`None`, compare each
+        sample to all data points.
 
     Returns:
       The sampled output.
@@ -177,10 +182,13 @@ class SemidiscreteOutput:
           ot_prob=prob,
       )
 
-    f, _ = prob._c_transform(self.g, axis=1)
-    z = self.g[None, :] - prob.geom.cost_matrix
     row_ixs = jnp.arange(num_samples)
-    col_ixs = jnp.argmax(jnp.where(prob.b[None, :], z, -jnp.inf), axis=-1)
+    if index is not None:
+      f, col_ixs = index.c_transform(prob.geom.x)
+    else:
+      f, _ = prob._c_transform(self.g, axis=1)
+      z = self.g[None, :] - prob.geom.cost_matrix
+      col_ixs = jnp.argmax(jnp.where(prob.b[None, :], z, -jnp.inf), axis=-1)
 
     return HardAssignmentOutput(
         prob,
@@ -189,19 +197,50 @@ class SemidiscreteOutput:
         g=self.g,
     )
 
+  def to_index(
+      self,
+      approximate: bool = False,
+      batch_size: Optional[int] = None,
+      **kwargs: Any,
+  ) -> neighbors.BruteForceIndex:
+    """Build a nearest-neighbor index of the data points for hard assignments.
+
+    Args:
+      approximate: Whether to build an approximate
+        :class:`~ott.geometry.neighbors.IVFIndex` or an exact
+        :class:`~ott.geometry.neighbors.BruteForceIndex`.
+      batch_size: Batch size of the index.
+      kwargs: Keyword arguments for
+        :meth:`~ott.geometry.neighbors.IVFIndex.build`.
+
+    Returns:
+      The index of the data points with the potential :attr:`g`.
+    """
+    geom = self.geom
+    args = (geom.y, self.g, self.prob.b, geom.cost_fn, batch_size)
+    if approximate:
+      return neighbors.IVFIndex.build(*args, **kwargs)
+    return neighbors.BruteForceIndex(*args, **kwargs)
+
   def to_dual_potentials(
-      self, epsilon: Optional[float] = None
+      self,
+      epsilon: Optional[float] = None,
+      index: Optional[neighbors.BruteForceIndex] = None,
   ) -> potentials.DualPotentials:
     """Compute the dual potential function :math:`f`.
 
     Args:
       epsilon: Epsilon regularization. If :obj:`None`, use the one stored
-        in the :attr:`geometry <geom>`.
+        in the :attr:`geometry <geom>`, or ``0`` if ``index`` is passed.
+      index: Nearest-neighbor index used to compute the hard
+        :term:`c-transform`, see :meth:`to_index`. If passed, ``epsilon``
+        must be ``0``.
 
     Returns:
       The dual potential :math:`f`.
     """
-    f_fn = self.prob.potential_fn_from_dual_vec(self.g, epsilon=epsilon)
+    g = self.g if index is None else None
+    f_fn = self.prob.potential_fn_from_dual_vec(g, epsilon=epsilon, index=index)
     cost_fn = self.geom.cost_fn
     return potentials.DualPotentials(f=f_fn, g=None, cost_fn=cost_fn)
 
@@ -279,7 +318,7 @@ def constant_epsilon_scheduler(
 @jtu.register_static
 @dataclasses.dataclass(frozen=True, kw_only=True)
 class SemidiscreteSolver:
-  """Semidiscrete optimal transport solver.
+  r"""Semidiscrete optimal transport solver.
 
   Args:
     num_iterations: Number of iterations.
@@ -298,6 +337,9 @@ class SemidiscreteSolver:
       By default, :func:`constant_epsilon_scheduler` is used.
     callback: Callback with a signature ``(state) -> None`` that is called
       at every iteration.
+    telemetry: Channel receiving the error, loss, gradient norm and
+      :math:`\varepsilon` every time the error is computed.
+      See :class:`~ott.utils.Telemetry`.
   """
   num_iterations: int
   batch_size: int
@@ -310,6 +352,7 @@ class SemidiscreteSolver:
   epsilon_scheduler: Callable[[jax.Array, jax.Array],
                               jax.Array] = constant_epsilon_scheduler
   callback: Optional[Callable[[SemidiscreteState], None]] = None
+  telemetry: Optional[utils.Telemetry] = None
 
   def __call__(
       self,
@@ -466,6 +509,18 @@ class SemidiscreteSolver:
     )
     if self.callback is not None:
       jax.debug.callback(self.callback, state)
+    if self.telemetry is not None and compute_error is not False:
+      self.telemetry.record(
+          type(self).__name__,
+          it // self.error_eval_every, {
+              "iteration": it,
+              "error": error,
+              "loss": loss,
+              "grad_norm": grad_norm,
+              "epsilon": epsilon,
+          },
+          when=compute_error
+      )
     return state
 
   def _to_output(
@@ -11,14 +11,25 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Any, Callable, NamedTuple, Optional, Sequence, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import jax
 import jax.numpy as jnp
 import jax.scipy as jsp
 import numpy as np
 
-from ott.geometry import geometry
+from ott import utils
+from ott.geometry import epsilon_scheduler as eps_scheduler
+from ott.geometry import geometry, pointcloud
 from ott.initializers.linear import initializers as init_lib
 from ott.math import fixed_point_loop
 from ott.math import unbalanced_functions as uf
@@ -40,6 +51,10 @@ class SinkhornState(NamedTuple):
   errors: Optional[jnp.ndarray] = None
   old_fus: Optional[jnp.ndarray] = None
   old_mapped_fus: Optional[jnp.ndarray] = None
+  epsilon_multiple: Optional[jnp.ndarray] = None
+  full_precision: Optional[jnp.ndarray] = None
+  marginals: Optional[Tuple[jnp.ndarray, jnp.ndarray]] = None
+  stats: Optional[geometry.KernelStats] = None
 
   def set(self, **kwargs: Any) -> "SinkhornState":
     """Return a copy of self, with potential overwrites."""
@@ -215,6 +230,12 @@ def marginal_error(
     marginal = geom.marginal_from_potentials(f_u, g_v, axis=axis)
   else:
     marginal = geom.marginal_from_scalings(f_u, g_v, axis=axis)
+  return _norm_error(marginal, target, norm_error)
+
+
+def _norm_error(
+    marginal: jnp.ndarray, target: jnp.ndarray, norm_error: Sequence[int]
+) -> jnp.ndarray:
   norm_error = jnp.asarray(norm_error)
   return jnp.sum(
       jnp.abs(marginal - target) ** norm_error[:, jnp.newaxis], axis=1
@@ -312,6 +333,8 @@ class SinkhornOutput(NamedTuple):
       below the convergence threshold.
     inner_iterations: number of iterations that were run between two
       computations of errors.
+    stats: number of evaluations of the kernel and of the cost, if tracked,
+      see :attr:`~ott.solvers.linear.sinkhorn.Sinkhorn.track_stats`.
   """
 
   potentials: Tuple[jnp.ndarray, ...]
@@ -321,6 +344,7 @@ class SinkhornOutput(NamedTuple):
   threshold: Optional[jnp.ndarray] = None
   converged: Optional[bool] = None
   inner_iterations: Optional[int] = None
+  stats: Optional[geometry.KernelStats] = None
 
   def set(self, **kwargs: Any) -> "SinkhornOutput":
     """Return a copy of self, with potential overwrites."""
@@ -431,7 +455,7 @@ class SinkhornOutput(NamedTuple):
   @property
   def n_iters(self) -> int:  # noqa: D102
     """Returns the total number of iterations that were needed to terminate."""
-    return jnp.sum(self.errors != -1) * self.inner_iterations
+    return jnp.sum(self.errors != -1, axis=-1) * self.inner_iterations
 
   @property
   def scalings(self) -> Tuple[jnp.ndarray, jnp.ndarray]:  # noqa: D102
@@ -499,6 +523,212 @@ class SinkhornOutput(NamedTuple):
     cost_fn = self.geom.cost_fn
     return potentials.DualPotentials(f_fn, g_fn, cost_fn=cost_fn)
 
+  def to_entropic_potentials(
+      self,
+      epsilon: Optional[float] = None,
+      batch_size: Optional[int] = None,
+      top_k: Optional[int] = None,
+  ) -> potentials.EntropicPotentials:
+    """Compute dual potential functions from precomputed tables.
+
+    The potentials are the same as the ones of :meth:`to_dual_potentials`,
+    but are evaluated on batches of points without instantiating a geometry
+    per point, which is better suited to evaluate a fitted map on many points.
+
+    Args:
+      epsilon: Epsilon regularization. If :obj:`None`, use the one stored
+        in the :attr:`geom`.
+      batch_size: Number of points evaluated at once. If :obj:`None`,
+        evaluate all points at once.
+      top_k: If not :obj:`None`, truncate the :term:`c-transform` to the
+        ``top_k`` largest terms.
+
+    Returns:
+      The dual potentials :math:`f` and :math:`g`.
+    """
+    geom = self.geom
+    assert isinstance(geom, pointcloud.PointCloud), \
+        f"Geometry `{type(geom).__name__}` is not a point cloud."
+    return potentials.EntropicPotentials.from_potentials(
+        geom.x,
+        geom.y,
+        self.f,
+        self.g,
+        geom.epsilon if epsilon is None else epsilon,
+        # same weights as the c-transforms of `to_dual_potentials`
+        b=self.ot_prob.b,
+        cost_fn=geom.cost_fn,
+        batch_size=batch_size,
+        top_k=top_k,
+    )
+
+  def sample(
+      self,
+      rng: jax.Array,
+      num_samples: int,
+      batch_size: Optional[int] = None,
+      replace: bool = True,
+  ) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    r"""Sample pairs of indices from the coupling, without materializing it.
+
+    With replacement, the rows are sampled from the first marginal of the
+    coupling. Given a row :math:`i`, its column is then sampled using the
+    Gumbel-max trick on the log-coupling
+    :math:`(f_i + g_j - C_{ij}) / \varepsilon`, which is computed from the
+    potentials for ``batch_size`` samples at a time.
+
+    Without replacement, Gumbel noise is added to the log-coupling, computed
+    for ``batch_size`` rows at a time, and the pairs with the
+    ``num_samples`` largest perturbed values are kept, which is equivalent to
+    sampling the pairs one after another, without replacement.
+
+    Args:
+      rng: Random key used for seeding.
+      num_samples: Number of pairs sampled.
+      batch_size: Number of rows of the coupling computed at once. If
+        :obj:`None`, use the ``batch_size`` of the
+        :class:`~ott.geometry.pointcloud.PointCloud`, if any, or else all
+        rows at once.
+      replace: Whether to sample with replacement.
+
+    Returns:
+      The row and column indices, each of shape ``[num_samples,]``.
+    """
+    if not replace:
+      return self._sample_without_replacement(rng, num_samples, batch_size)
+
+    rng_rows, rng_cols = jax.random.split(rng, 2)
+    row_ixs = jax.random.categorical(
+        rng_rows, jnp.log(self.marginal(1)), shape=(num_samples,)
+    )
+    rngs = jax.random.split(rng_cols, num_samples)
+
+    def sample_col(row_ix: jnp.ndarray, rng: jax.Array) -> jnp.ndarray:
+      return jax.random.categorical(rng, self._log_coupling_row(row_ix))
+
+    col_ixs = self._map_rows(sample_col, num_samples, batch_size)(row_ixs, rngs)
+    return row_ixs, col_ixs
+
+  def top_k(
+      self,
+      k: int,
+      batch_size: Optional[int] = None,
+  ) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    """Largest entries of each row of the coupling, without materializing it.
+
+    Args:
+      k: Number of entries per row.
+      batch_size: Number of rows of the coupling computed at once, see
+        :meth:`sample`.
+
+    Returns:
+      The values and column indices of the largest entries of each row, of
+      shape ``[n, k]``, in decreasing order.
+    """
+    n, _ = self.geom.shape
+
+    def top_k_row(row_ix: jnp.ndarray) -> Tuple[jnp.ndarray, jnp.ndarray]:
+      log_values, col_ixs = jax.lax.top_k(self._log_coupling_row(row_ix), k)
+      return jnp.exp(log_values), col_ixs
+
+    return self._map_rows(top_k_row, n, batch_size)(jnp.arange(n))
+
+  def argmax(self, batch_size: Optional[int] = None) -> jnp.ndarray:
+    """Column of the largest entry of each row of the coupling.
+
+    Args:
+      batch_size: Number of rows of the coupling computed at once, see
+        :meth:`sample`.
+
+    Returns:
+      The column indices, of shape ``[n,]``.
+    """
+    n, _ = self.geom.shape
+
+    def argmax_row(row_ix: jnp.ndarray) -> jnp.ndarray:
+      return jnp.argmax(self._log_coupling_row(row_ix))
+
+    return self._map_rows(argmax_row, n, batch_size)(jnp.arange(n))
+
+  def barycentric_projection(
+      self, y: Optional[jnp.ndarray] = None
+  ) -> jnp.ndarray:
+    r"""Barycentric projection of the rows of the coupling.
+
+    The projection of the :math:`i`-th point is
+    :math:`\sum_j P_{ij} y_j / \sum_j P_{ij}`. It is computed by applying
+    the coupling, which, for a :class:`~ott.geometry.pointcloud.PointCloud`,
+    is done online.
+
+    Args:
+      y: Array of shape ``[m, d]`` to project. If :obj:`None`, use the target
+        points of the :class:`~ott.geometry.pointcloud.PointCloud`.
+
+    Returns:
+      The projections, of shape ``[n, d]``.
+    """
+    if y is None:
+      assert isinstance(self.geom, pointcloud.PointCloud), \
+          "Please specify `y` for geometries which are not point clouds."
+      y = self.geom.y
+    projection = self.apply(y.T, axis=1).T
+    return projection / self.marginal(1)[:, None]
+
+  def _sample_without_replacement(
+      self, rng: jax.Array, num_samples: int, batch_size: Optional[int]
+  ) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    """Gumbel-top-k sampling, merging the candidates of each block of rows."""
+    n, m = self.geom.shape
+    assert num_samples <= n * m, \
+        f"Cannot sample `{num_samples}` pairs out of `{n * m}`."
+    if batch_size is None and isinstance(self.geom, pointcloud.PointCloud):
+      batch_size = self.geom.batch_size
+    batch_size = n if batch_size is None else min(batch_size, n)
+    num_blocks = -(-n // batch_size)
+    k = min(num_samples, batch_size * m)
+
+    def merge(
+        carry: Tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray], block: jnp.ndarray
+    ) -> Tuple[Tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray], None]:
+      keys, row_ixs, col_ixs = carry
+      block_rows = block * batch_size + jnp.arange(batch_size)
+      logits = jax.vmap(self._log_coupling_row)(jnp.minimum(block_rows, n - 1))
+      logits = logits + jax.random.gumbel(
+          jax.random.fold_in(rng, block), logits.shape, dtype=logits.dtype
+      )
+      # the last block is padded with the last row, which is masked
+      logits = jnp.where(block_rows[:, None] < n, logits, -jnp.inf)
+      block_keys, ixs = jax.lax.top_k(logits.ravel(), k)
+
+      keys = jnp.concatenate([keys, block_keys])
+      row_ixs = jnp.concatenate([row_ixs, block_rows[ixs // m]])
+      col_ixs = jnp.concatenate([col_ixs, ixs % m])
+      keys, ixs = jax.lax.top_k(keys, num_samples)
+      return (keys, row_ixs[ixs], col_ixs[ixs]), None
+
+    init = (
+        jnp.full((num_samples,), -jnp.inf, dtype=self.f.dtype),
+        jnp.zeros((num_samples,), dtype=int),
+        jnp.zeros((num_samples,), dtype=int),
+    )
+    (_, row_ixs, col_ixs), _ = jax.lax.scan(merge, init, jnp.arange(num_blocks))
+    return row_ixs, col_ixs
+
+  def _log_coupling_row(self, row_ix: jnp.ndarray) -> jnp.ndarray:
+    """Row of the log-coupling, computed from the potentials."""
+    cost = _cost_lines(self.geom, row_ix[None], axis=1)[0]
+    return (self.f[row_ix] + self.g - cost) / self.geom.epsilon
+
+  def _map_rows(
+      self, fn: Callable[..., Any], num: int, batch_size: Optional[int]
+  ) -> Callable[..., Any]:
+    """Vectorize ``fn`` over rows, ``batch_size`` rows at a time."""
+    if batch_size is None and isinstance(self.geom, pointcloud.PointCloud):
+      batch_size = self.geom.batch_size
+    if batch_size is None or batch_size >= num:
+      return jax.vmap(fn)
+    return utils.batched_vmap(fn, batch_size=batch_size)
+
   @property
   def f(self) -> jnp.ndarray:
     """The first dual potential."""
@@ -713,6 +943,28 @@ class Sinkhorn:
       iterations, so the user can display the error at each iteration,
       e.g., using a progress bar. See :func:`~ott.utils.default_progress_fn`
       for a basic implementation.
+    fused_error: Whether to recover the marginal error from the log-sum-exp
+      computed when updating ``g``, rather than from a separate application of
+      the kernel. The recorded error is then the one of the potentials obtained
+      at the previous iteration, i.e., one iteration behind. Only used when
+      ``lse_mode = True``, ``parallel_dual_updates = False`` and the problem is
+      balanced.
+    full_precision_threshold: Error below which the iterations are carried out
+      in full precision, when the geometry evaluates its cost and kernel in a
+      reduced :attr:`~ott.geometry.geometry.Geometry.compute_dtype`. Once
+      switched, the iterations stay in full precision, and convergence can
+      only be reported in full precision.
+    telemetry: Channel receiving the error, :math:`\varepsilon` and number of
+      kernel evaluations every few error evaluations, without blocking the
+      iterations. See :class:`~ott.utils.Telemetry`.
+    track_stats: Whether to count the evaluations of the kernel and of the
+      cost, including those of the initializer, and estimate their floating
+      point operations and bytes. They are returned in
+      :attr:`~ott.solvers.linear.sinkhorn.SinkhornOutput.stats`, see
+      :func:`~ott.geometry.geometry.track_stats`. The evaluations traced in
+      the body of the loop are added to the loop state at every iteration, so
+      that the statistics count the executed evaluations, also under
+      :func:`~jax.jit`.
   """
 
   def __init__(
@@ -732,6 +984,10 @@ class Sinkhorn:
                              ] = implicit_lib.ImplicitDiff(),  # noqa: B008
       initializer: Optional[init_lib.SinkhornInitializer] = None,
       progress_fn: Optional[ProgressFunction] = None,
+      fused_error: bool = False,
+      full_precision_threshold: float = 1e-2,
+      telemetry: Optional[utils.Telemetry] = None,
+      track_stats: bool = False,
   ):
     self.lse_mode = lse_mode
     self.threshold = threshold
@@ -762,6 +1018,10 @@ class Sinkhorn:
     self.initializer = init_lib.DefaultInitializer(
     ) if initializer is None else initializer
     self.progress_fn = progress_fn
+    self.fused_error = fused_error
+    self.full_precision_threshold = full_precision_threshold
+    self.telemetry = telemetry
+    self.track_stats = track_stats
 
     # Force implicit_differentiation to True when using Anderson acceleration,
     # Reset all momentum parameters to default (i.e. no momentum)
@@ -796,15 +1056,26 @@ class Sinkhorn:
     Returns:
       The Sinkhorn output.
     """
-    if init is None:
-      init = self.initializer(ot_prob, lse_mode=self.lse_mode, **kwargs)
-    return run(ot_prob, self, init)
+    with geometry.track_stats() as tracker:
+      if init is None:
+        init = self.initializer(ot_prob, lse_mode=self.lse_mode, **kwargs)
+    out = run(ot_prob, self, init)
+    if out.stats is not None:
+      out = out.set(stats=out.stats.add(tracker.stats))
+    return out
 
   def lse_step(
       self, ot_prob: linear_problem.LinearProblem, state: SinkhornState,
       iteration: int
   ) -> SinkhornState:
     """Sinkhorn LSE update."""
+    return self._lse_step(ot_prob, state, iteration)[0]
+
+  def _lse_step(
+      self, ot_prob: linear_problem.LinearProblem, state: SinkhornState,
+      iteration: int
+  ) -> Tuple[SinkhornState, jnp.ndarray]:
+    """Sinkhorn LSE update, also returning the marginal of the input state."""
 
     def k(tau_i: float, tau_j: float) -> float:
       num = -tau_j * (tau_a - 1) * (tau_b - 1) * (tau_i - 1)
@@ -833,10 +1104,16 @@ class Sinkhorn:
       k11, k22 = k(tau_a, tau_a), k(tau_b, tau_b)
       xi12, xi21 = xi(tau_a, tau_b), xi(tau_b, tau_a)
 
-    # update g potential
-    new_gv = tau_b * ot_prob.geom.update_potential(
-        old_fu, old_gv, jnp.log(ot_prob.b), iteration, axis=0
+    # update g potential, the marginal of the input state comes for free
+    new_gv, marginal_b = ot_prob.geom.update_potential(
+        old_fu,
+        old_gv,
+        jnp.log(ot_prob.b),
+        iteration,
+        axis=0,
+        return_marginal=True
     )
+    new_gv = tau_b * new_gv
     if recenter:
       new_gv -= k22 * smin(old_fu, ot_prob.a, tau_a)
       new_gv += xi21 * smin(new_gv, ot_prob.b, tau_b)
@@ -854,7 +1131,7 @@ class Sinkhorn:
       new_fu += xi12 * smin(new_fu, ot_prob.a, tau_a)
     fu = self.momentum(w, old_fu, new_fu, self.lse_mode)
 
-    return state.set(potentials=(fu, gv))
+    return state.set(potentials=(fu, gv)), marginal_b
 
   def kernel_step(
       self, ot_prob: linear_problem.LinearProblem, state: SinkhornState,
@@ -896,50 +1173,199 @@ class Sinkhorn:
     Returns:
       The updated state.
     """
+    if state.epsilon_multiple is not None:
+      state = self._update_epsilon(ot_prob, state, iteration)
+      epsilon = ot_prob.geom.epsilon_scheduler.at(state.epsilon_multiple)
+      ot_prob = _with_geom(ot_prob, ot_prob.geom.set_epsilon(epsilon))
+
+    if state.full_precision is None:
+      return self._one_iteration(ot_prob, state, iteration, compute_error)
+
+    # fall back to full precision near convergence
+    state = self._update_precision(state, iteration)
+    full_prob = _with_geom(ot_prob, ot_prob.geom.set_compute_dtype(None))
+    return jax.lax.cond(
+        state.full_precision,
+        lambda s: self._one_iteration(full_prob, s, iteration, compute_error),
+        lambda s: self._one_iteration(ot_prob, s, iteration, compute_error),
+        state,
+    )
+
+  def _one_iteration(
+      self, ot_prob: linear_problem.LinearProblem, state: SinkhornState,
+      iteration: int, compute_error: bool
+  ) -> SinkhornState:
     # When running updates in parallel (Gauss-Seidel mode), old_g_v will be
     # used to update f_u, rather than the latest g_v computed in this loop.
     # Unused otherwise.
-    if self.anderson:
-      state = self.anderson.update(state, iteration, ot_prob, self.lse_mode)
+    with geometry.track_stats() as step_tracker:
+      if self.anderson:
+        state = self.anderson.update(state, iteration, ot_prob, self.lse_mode)
 
-    if self.lse_mode:  # In lse_mode, run additive updates.
-      state = self.lse_step(ot_prob, state, iteration)
-    else:
-      state = self.kernel_step(ot_prob, state, iteration)
-
-    if self.anderson:
-      state = self.anderson.update_history(state, ot_prob, self.lse_mode)
-
-    # re-computes error if compute_error is True, else set it to inf.
-    err = jax.lax.cond(
-        jnp.logical_or(
-            iteration == self.max_iterations - 1,
-            jnp.logical_and(compute_error, iteration >= self.min_iterations)
-        ),
-        lambda state, prob: state.solution_error(
-            prob,
-            self.norm_error,
-            lse_mode=self.lse_mode,
-            parallel_dual_updates=self.parallel_dual_updates,
-            recenter=self.recenter_potentials
-        )[0],
-        lambda *_: jnp.array(jnp.inf, dtype=ot_prob.dtype),
-        state,
-        ot_prob,
+      if self.lse_mode:  # In lse_mode, run additive updates.
+        state, marginal_b = self._lse_step(ot_prob, state, iteration)
+      else:
+        state = self.kernel_step(ot_prob, state, iteration)
+
+      if self.anderson:
+        state = self.anderson.update_history(state, ot_prob, self.lse_mode)
+
+    should_compute_error = self._should_compute_error(iteration, compute_error)
+    with geometry.track_stats() as error_tracker:
+      if should_compute_error is False:
+        # this error is overwritten by the one of the last iteration of the
+        # block, it is not even traced
+        err = None
+      elif self._use_fused_error(ot_prob):
+        # error of the previous iterate, computed during the `g` update
+        err = jnp.where(
+            should_compute_error,
+            _norm_error(marginal_b, ot_prob.b, self.norm_error)[0],
+            jnp.array(jnp.inf, dtype=ot_prob.dtype),
+        )
+      else:
+        # re-computes error if compute_error is True, else set it to inf.
+        err = _cond(
+            should_compute_error,
+            lambda state, prob: state.solution_error(
+                prob,
+                self.norm_error,
+                lse_mode=self.lse_mode,
+                parallel_dual_updates=self.parallel_dual_updates,
+                recenter=self.recenter_potentials
+            )[0],
+            lambda *_: jnp.array(jnp.inf, dtype=ot_prob.dtype),
+            state,
+            ot_prob,
+        )
+    if err is not None:
+      errors = state.errors.at[iteration // self.inner_iterations, :].set(err)
+      state = state.set(errors=errors)
+    state = _add_stats(
+        state, step_tracker, error_tracker, where=should_compute_error
+    )
+
+    self._report(ot_prob, state, iteration, compute_error)
+    return state
+
+  def _should_compute_error(self, iteration: int,
+                            compute_error: bool) -> Union[bool, jnp.ndarray]:
+    """Whether an iteration computes the error.
+
+    A Python boolean is returned when this is known while tracing, so that
+    no conditional is traced, e.g., when differentiating through the unrolled
+    iterations, whose error is never computed.
+    """
+    # the last iteration is also the last one of a block
+    aligned = self.max_iterations % self.inner_iterations == 0
+    if compute_error is False and aligned:
+      return False
+    if compute_error is True and self.min_iterations == 0:
+      return True
+    return jnp.logical_or(
+        iteration == self.max_iterations - 1,
+        jnp.logical_and(compute_error, iteration >= self.min_iterations)
     )
-    errors = state.errors.at[iteration // self.inner_iterations, :].set(err)
-    state = state.set(errors=errors)
 
+  def _report(
+      self, ot_prob: linear_problem.LinearProblem, state: SinkhornState,
+      iteration: int, compute_error: bool
+  ) -> None:
+    """Send the progress to the ``progress_fn`` and the ``telemetry``."""
     if self.progress_fn is not None:
       jax.debug.callback(
           self.progress_fn,
           (iteration, self.inner_iterations, self.max_iterations, state)
       )
-    return state
+    if self.telemetry is not None and compute_error is not False:
+      self.telemetry.record(
+          type(self).__name__,
+          iteration // self.inner_iterations,
+          self._telemetry_values(ot_prob, state, iteration),
+          when=compute_error,
+      )
+
+  def _telemetry_values(
+      self, ot_prob: linear_problem.LinearProblem, state: SinkhornState,
+      iteration: int
+  ) -> Dict[str, jnp.ndarray]:
+    """Scalars recorded by the ``telemetry`` when the error is computed."""
+    num_evaluations = iteration // self.inner_iterations + 1
+    # one kernel application per potential, and one per error evaluation
+    num_kernel_evals = 2 * (iteration + 1)
+    if not self._use_fused_error(ot_prob):
+      num_kernel_evals += num_evaluations
+    values = {
+        "iteration": iteration,
+        "error": state.errors[iteration // self.inner_iterations, 0],
+        "epsilon": ot_prob.geom.epsilon_scheduler(iteration),
+        "num_kernel_evals": num_kernel_evals,
+    }
+    if state.stats is not None:
+      values["num_kernel_evals"] = (
+          state.stats.num_lse_kernel + state.stats.num_kernel
+      )
+      values["flops"] = state.stats.flops
+    return values
+
+  def _use_fused_error(self, ot_prob: linear_problem.LinearProblem) -> bool:
+    return (
+        self.fused_error and self.lse_mode and ot_prob.is_balanced and
+        not self.parallel_dual_updates
+    )
+
+  def _update_epsilon(
+      self, ot_prob: linear_problem.LinearProblem, state: SinkhornState,
+      iteration: int
+  ) -> SinkhornState:
+    """Decay epsilon at the start of a block if the previous one converged."""
+    scheduler = ot_prob.geom.epsilon_scheduler
+    err, new_block = self._previous_error(state, iteration)
+    old_multiple = state.epsilon_multiple
+    multiple = jnp.where(
+        new_block, scheduler.update_multiple(old_multiple, err), old_multiple
+    )
+    if self.lse_mode:
+      return state.set(epsilon_multiple=multiple)
+    # scalings depend on epsilon, keep the potentials unchanged
+    ratio = old_multiple / multiple
+    potentials = tuple(p ** ratio for p in state.potentials)
+    return state.set(potentials=potentials, epsilon_multiple=multiple)
+
+  def _update_precision(
+      self, state: SinkhornState, iteration: int
+  ) -> SinkhornState:
+    """Switch to full precision once the error is small enough."""
+    err, new_block = self._previous_error(state, iteration)
+    switch = jnp.logical_and(new_block, err < self.full_precision_threshold)
+    return state.set(
+        full_precision=jnp.logical_or(state.full_precision, switch)
+    )
+
+  def _previous_error(self, state: SinkhornState,
+                      iteration: int) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    """Error of the previous block and whether a new block starts."""
+    err = state.errors[iteration // self.inner_iterations - 1, 0]
+    new_block = jnp.logical_and(
+        iteration > 0, iteration % self.inner_iterations == 0
+    )
+    return err, new_block
+
+  def _reached_target(self, state: SinkhornState) -> bool:
+    """Whether the adaptive epsilon and precision, if any, are final."""
+    reached = True
+    if state.epsilon_multiple is not None:
+      reached = jnp.logical_and(reached, state.epsilon_multiple <= 1.0)
+    if state.full_precision is not None:
+      reached = jnp.logical_and(reached, state.full_precision)
+    return reached
 
   def _converged(self, state: SinkhornState, iteration: int) -> bool:
     err = state.errors[iteration // self.inner_iterations - 1, 0]
-    return jnp.logical_and(iteration > 0, err < self.threshold)
+    return jnp.logical_and(
+        jnp.logical_and(iteration > 0, err < self.threshold),
+        self._reached_target(state)
+    )
 
   def _diverged(self, state: SinkhornState, iteration: int) -> bool:
     err = state.errors[iteration // self.inner_iterations - 1, 0]
@@ -969,6 +1395,13 @@ class Sinkhorn:
     errors = -jnp.ones((self.outer_iterations, len(self.norm_error)),
                        dtype=ot_prob.dtype)
     state = SinkhornState(init, errors=errors)
+    scheduler = ot_prob.geom.epsilon_scheduler
+    if isinstance(scheduler, eps_scheduler.AdaptiveEpsilon):
+      state = state.set(epsilon_multiple=scheduler.init_multiple())
+    if ot_prob.geom.compute_dtype is not None:
+      state = state.set(full_precision=jnp.array(False))
+    if self.track_stats:
+      state = state.set(stats=geometry.KernelStats.zeros())
     return self.anderson.init_maps(ot_prob, state) if self.anderson else state
 
   def output_from_state(
@@ -1021,12 +1454,14 @@ class Sinkhorn:
         jnp.logical_not(jnp.any(jnp.isnan(state.errors))), state.errors[-1]
         < self.threshold
     )[0]
+    converged = jnp.logical_and(converged, self._reached_target(state))
 
     return SinkhornOutput((f, g),
                           errors=state.errors[:, 0],
                           threshold=jnp.array(self.threshold),
                           converged=converged,
-                          inner_iterations=self.inner_iterations)
+                          inner_iterations=self.inner_iterations,
+                          stats=state.stats)
 
   @property
   def norm_error(self) -> Tuple[int, ...]:
@@ -1049,6 +1484,64 @@ class Sinkhorn:
     return cls(**aux_data, threshold=children[0])
 
 
+def _add_stats(
+    state: SinkhornState,
+    step_tracker: geometry.StatsTracker,
+    error_tracker: geometry.StatsTracker,
+    where: jnp.ndarray,
+) -> SinkhornState:
+  """Accumulate the evaluations of an iteration, if tracked.
+
+  The evaluations traced when computing the error are only added if ``where``.
+  """
+  if state.stats is None:
+    return state
+  stats = state.stats.add(step_tracker.stats)
+  stats = stats.add(error_tracker.stats, where=where)
+  return state.set(stats=stats)
+
+
+def _cond(
+    pred: Union[bool, jnp.ndarray], true_fn: Callable[..., Any],
+    false_fn: Callable[..., Any], *operands: Any
+) -> Any:
+  """Like :func:`jax.lax.cond`, but trace one branch if ``pred`` is static."""
+  if isinstance(pred, bool):
+    return true_fn(*operands) if pred else false_fn(*operands)
+  return jax.lax.cond(pred, true_fn, false_fn, *operands)
+
+
+def _cost_lines(
+    geom: geometry.Geometry, ids: jnp.ndarray, axis: int
+) -> jnp.ndarray:
+  """Rows (``axis = 1``) or transposed columns (``axis = 0``) of the cost."""
+  if isinstance(geom, pointcloud.PointCloud):
+    if axis == 1:
+      cost = geom._pairwise_cost(geom.x[ids], geom.y)
+    else:
+      cost = geom._pairwise_cost(geom.x, geom.y[ids]).T
+    return cost * geom.inv_scale_cost
+  if geom._cost_matrix is not None:
+    # index the stored cost, in `O(k m)` for `k` rows
+    cost = geom._cost_matrix
+    cost = cost[ids] if axis == 1 else cost[:, ids].T
+    return cost * geom.inv_scale_cost
+  if geom._kernel_matrix is not None:
+    cost = geom.cost_matrix
+    return cost[ids] if axis == 1 else cost[:, ids].T
+  # select the lines with one-hot vectors, without materializing the cost
+  n, m = geom.shape
+  one_hot = jax.nn.one_hot(ids, n if axis == 1 else m, dtype=geom.dtype)
+  return geom.apply_cost(one_hot.T, axis=1 - axis).T
+
+
+def _with_geom(
+    ot_prob: linear_problem.LinearProblem, geom: geometry.Geometry
+) -> linear_problem.LinearProblem:
+  (_, a, b), aux_data = ot_prob.tree_flatten()
+  return type(ot_prob).tree_unflatten(aux_data, [geom, a, b])
+
+
 def run(
     ot_prob: linear_problem.LinearProblem, solver: Sinkhorn,
     init: Tuple[jnp.ndarray, ...]
@@ -1056,9 +1549,16 @@ def run(
   """Run loop of the solver, outputting a state upgraded to an output."""
   iter_fun = _iterations_implicit if solver.implicit_diff else iterations
   out = iter_fun(ot_prob, solver, init)
+  cost_prob = ot_prob
+  if ot_prob.geom.compute_dtype is not None:
+    # the potentials have converged in full precision
+    cost_prob = _with_geom(ot_prob, ot_prob.geom.set_compute_dtype(None))
   # Be careful here, the geom and the cost are injected at the end, where it
   # does not interfere with the implicit differentiation.
-  out = out.set_cost(ot_prob, solver.lse_mode, solver.use_danskin)
+  with geometry.track_stats() as tracker:
+    out = out.set_cost(cost_prob, solver.lse_mode, solver.use_danskin)
+  if out.stats is not None:
+    out = out.set(stats=out.stats.add(tracker.stats))
   return out.set(ot_prob=ot_prob)
 
 
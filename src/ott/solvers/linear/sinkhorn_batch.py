@@ -0,0 +1,230 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import functools
+from typing import Any, Callable, Optional, Tuple
+
+import jax
+import jax.numpy as jnp
+
+from ott.problems.linear import linear_problem
+from ott.solvers.linear import sinkhorn
+
+__all__ = ["run_batch"]
+
+
+def _batch_axes(tree: Any) -> Tuple[Any, int]:
+  """Get the ``in_axes`` of a stacked pytree and its batch size.
+
+  Leaves with at least one dimension are assumed to be stacked along their
+  first axis, scalar leaves (e.g., ``epsilon``) are shared by all problems.
+  """
+  leaves, treedef = jax.tree.flatten(tree)
+  axes = [0 if jnp.ndim(leaf) > 0 else None for leaf in leaves]
+  sizes = {leaf.shape[0] for leaf, ax in zip(leaves, axes) if ax is not None}
+  assert len(sizes) == 1, f"Expected a single batch size, found {sizes}."
+  return treedef.unflatten(axes), sizes.pop()
+
+
+def _take(tree: Any, ixs: jnp.ndarray, axes: Optional[Any] = None) -> Any:
+  leaves, treedef = jax.tree.flatten(tree)
+  axes = [0] * len(leaves) if axes is None else treedef.flatten_up_to(axes)
+  return treedef.unflatten([
+      leaf if ax is None else leaf[ixs] for leaf, ax in zip(leaves, axes)
+  ])
+
+
+def _select(mask: jnp.ndarray, x: Any, y: Any) -> Any:
+
+  def select(x: jnp.ndarray, y: jnp.ndarray) -> jnp.ndarray:
+    m = mask.reshape(mask.shape + (1,) * (x.ndim - 1))
+    return jnp.where(m, x, y)
+
+  return jax.tree.map(select, x, y)
+
+
+def run_batch(
+    ot_prob: linear_problem.LinearProblem,
+    solver: sinkhorn.Sinkhorn,
+    init: Optional[Tuple[jnp.ndarray, jnp.ndarray]] = None,
+    num_slots: Optional[int] = None,
+) -> sinkhorn.SinkhornOutput:
+  """Run Sinkhorn on a stack of linear problems with per-problem early exit.
+
+  Unlike :func:`jax.vmap` applied to
+  :class:`~ott.solvers.linear.sinkhorn.Sinkhorn`, whose
+  :func:`~jax.lax.while_loop` runs until the slowest problem has converged,
+  the problems are scheduled on ``num_slots`` slots. Every ``inner_iterations``,
+  the problems in a slot that have converged (or diverged, or reached
+  ``max_iterations``) are frozen, written to the output and their slot is
+  refilled with the next pending problem. The active set is thus compacted, and
+  computations are only spent on problems that have not yet converged. When
+  no problems are pending anymore, the empty slots are skipped by running the
+  remaining ones on successively halved widths.
+
+  Args:
+    ot_prob: Linear problem whose geometry and marginals are stacked along
+      their first axis, i.e., every non-scalar leaf has shape ``[batch, ...]``.
+      Ragged problems should be padded using zero weights, e.g., using
+      :func:`~ott.geometry.segment.segment_point_cloud`.
+    solver: Sinkhorn solver.
+    init: Initial potentials/scalings of shape ``[batch, n]`` and
+      ``[batch, m]``. If :obj:`None`, use the solver's initializer.
+    num_slots: Number of problems solved concurrently. If :obj:`None`, use a
+      quarter of the batch size, rounded up.
+
+  Returns:
+    The Sinkhorn output, whose arrays are stacked along the first axis.
+    Its ``errors`` have shape ``[batch, outer_iterations]``, and the
+    :attr:`~ott.solvers.linear.sinkhorn.SinkhornOutput.n_iters` and
+    :attr:`~ott.solvers.linear.sinkhorn.SinkhornOutput.converged` are reported
+    per problem. The output is not differentiable, use :func:`jax.vmap`
+    instead when gradients are needed.
+  """
+
+  def block(
+      prob: linear_problem.LinearProblem, state: sinkhorn.SinkhornState,
+      iteration: jnp.ndarray
+  ) -> sinkhorn.SinkhornState:
+
+    def body_fn(
+        carry: Tuple[jnp.ndarray, sinkhorn.SinkhornState], compute_error: bool
+    ) -> Tuple[Tuple[jnp.ndarray, sinkhorn.SinkhornState], None]:
+      iteration, state = carry
+      state = solver.one_iteration(prob, state, iteration, compute_error)
+      return (iteration + 1, state), None
+
+    (_, state), _ = jax.lax.scan(body_fn, (iteration, state), flags)
+    return state
+
+  def run_active(
+      width: int, slot_ixs: jnp.ndarray, slot_iters: jnp.ndarray,
+      slot_states: sinkhorn.SinkhornState, order: jnp.ndarray
+  ) -> sinkhorn.SinkhornState:
+    # only the first `width` slots in `order` (the active ones first) are run
+    ixs = order[:width]
+    probs = _take(
+        ot_prob, jnp.minimum(slot_ixs[ixs], batch_size - 1), prob_axes
+    )
+    states = v_block(probs, _take(slot_states, ixs), slot_iters[ixs])
+    return jax.tree.map(
+        lambda old, new: old.at[ixs].set(new), slot_states, states
+    )
+
+  def cond_fn(carry: Tuple[Any, ...]) -> bool:
+    slot_ixs, *_ = carry
+    return jnp.any(slot_ixs < batch_size)
+
+  def body_fn(carry: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    slot_ixs, slot_iters, slot_states, next_ix, out_states = carry
+    active = slot_ixs < batch_size
+
+    # once the pending problems are exhausted, the slots drain: the active
+    # slots are moved to the front and the narrowest width fitting them is run
+    order = jnp.argsort(jnp.logical_not(active), stable=True)
+    branch_ix = jnp.sum(widths >= jnp.sum(active)) - 1
+    new_states = jax.lax.switch(
+        branch_ix, branches, slot_ixs, slot_iters, slot_states, order
+    )
+    slot_states = _select(active, new_states, slot_states)
+    slot_iters = jnp.where(
+        active, slot_iters + solver.inner_iterations, slot_iters
+    )
+
+    should_continue = jnp.logical_and(
+        slot_iters < solver.max_iterations,
+        jnp.logical_or(
+            slot_iters < solver.min_iterations,
+            v_continue(slot_states, slot_iters)
+        )
+    )
+    done = jnp.logical_and(active, jnp.logical_not(should_continue))
+
+    # freeze the finished problems
+    write_ixs = jnp.where(done, slot_ixs, batch_size)
+    out_states = jax.tree.map(
+        lambda out, st: out.at[write_ixs].set(st, mode="drop"), out_states,
+        slot_states
+    )
+
+    # refill the freed slots with the pending problems
+    new_ixs = next_ix + jnp.cumsum(done) - 1
+    new_ixs = jnp.where(new_ixs < batch_size, new_ixs, batch_size)
+    slot_ixs = jnp.where(done, new_ixs, slot_ixs)
+    next_ix = next_ix + jnp.sum(done)
+    fresh_states = _take(init_states, jnp.minimum(slot_ixs, batch_size - 1))
+    slot_states = _select(done, fresh_states, slot_states)
+    slot_iters = jnp.where(done, 0, slot_iters)
+
+    return slot_ixs, slot_iters, slot_states, next_ix, out_states
+
+  def finalize(
+      prob: linear_problem.LinearProblem, state: sinkhorn.SinkhornState
+  ) -> Tuple[Tuple[jnp.ndarray, jnp.ndarray], jnp.ndarray, jnp.ndarray,
+             jnp.ndarray]:
+    out = solver.output_from_state(prob, state)
+    cost = sinkhorn.compute_kl_reg_cost(out.f, out.g, prob, solver.lse_mode)
+    return out.potentials, out.errors, out.converged, cost
+
+  prob_axes, batch_size = _batch_axes(ot_prob)
+  if num_slots is None:
+    num_slots = max(1, -(-batch_size // 4))
+  num_slots = min(num_slots, batch_size)
+  assert num_slots > 0, f"Number of slots must be positive, got {num_slots}."
+
+  # slot widths, halved until a single slot is left
+  widths = [num_slots]
+  while widths[-1] > 1:
+    widths.append(-(-widths[-1] // 2))
+  branches = [functools.partial(run_active, w) for w in widths]
+  widths = jnp.asarray(widths)
+
+  v_block = jax.vmap(block, in_axes=(prob_axes, 0, 0))
+  v_continue: Callable[[sinkhorn.SinkhornState, jnp.ndarray],
+                       jnp.ndarray] = jax.vmap(solver._continue)
+  flags = jnp.arange(solver.inner_iterations) == solver.inner_iterations - 1
+
+  if init is None:
+    init = jax.vmap(
+        lambda prob: solver.initializer(prob, lse_mode=solver.lse_mode),
+        in_axes=(prob_axes,)
+    )(
+        ot_prob
+    )
+  init_states = jax.vmap(
+      solver.init_state, in_axes=(prob_axes, 0)
+  )(ot_prob, tuple(init))
+
+  slot_ixs = jnp.arange(num_slots)
+  carry = (
+      slot_ixs,
+      jnp.zeros((num_slots,), dtype=int),
+      _take(init_states, slot_ixs),
+      jnp.array(num_slots),
+      init_states,
+  )
+  *_, out_states = jax.lax.while_loop(cond_fn, body_fn, carry)
+
+  potentials, errors, converged, reg_ot_cost = jax.vmap(
+      finalize, in_axes=(prob_axes, 0)
+  )(ot_prob, out_states)
+
+  return sinkhorn.SinkhornOutput(
+      potentials,
+      errors=errors,
+      reg_ot_cost=reg_ot_cost,
+      ot_prob=ot_prob,
+      threshold=jnp.array(solver.threshold),
+      converged=converged,
+      inner_iterations=solver.inner_iterations,
+  )
@@ -0,0 +1,217 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Any, Dict, Tuple
+
+import jax
+import jax.numpy as jnp
+
+from ott.geometry import geometry
+from ott.math import utils as mu
+from ott.problems.linear import linear_problem
+from ott.solvers.linear import sinkhorn
+
+__all__ = ["GreedySinkhorn"]
+
+
+@jax.tree_util.register_pytree_node_class
+class GreedySinkhorn(sinkhorn.Sinkhorn):
+  r"""Greedy block-coordinate Sinkhorn solver :cite:`altschuler:17`.
+
+  Rather than updating all entries of the dual potentials, each iteration
+  only updates the ``block_size`` columns, and then the ``block_size`` rows,
+  whose marginals violate their target the most, as measured by
+
+  .. math::
+
+    \rho(a, r) = r - a + a \log\frac{a}{r}.
+
+  The marginals of the coupling are tracked in the state and updated along
+  with the potentials, so that an iteration costs :math:`O(k (n + m))`, where
+  :math:`k` is the ``block_size``, instead of :math:`O(nm)`. This holds for
+  point clouds and for geometries storing their cost or kernel matrix, whose
+  rows and columns are indexed directly. Other geometries, e.g., low-rank
+  ones, apply their cost to one-hot vectors to get these lines.
+  ``block_size = 1`` recovers the Greenkhorn algorithm. To avoid drifting,
+  the marginals are recomputed exactly whenever the error is computed, i.e.,
+  every ``inner_iterations``, which should be set accordingly. Since neither
+  marginal is exactly matched after an iteration, the error compared to the
+  ``threshold`` is the sum of the deviations of both marginals to their targets,
+  rather than the deviation of the second marginal only.
+
+  Only balanced problems in ``lse_mode`` are supported, without momentum,
+  Anderson acceleration or an adaptive :math:`\varepsilon`.
+
+  Args:
+    block_size: Number of rows and of columns updated at each iteration.
+    kwargs: Keyword arguments for
+      :class:`~ott.solvers.linear.sinkhorn.Sinkhorn`.
+  """
+
+  def __init__(self, block_size: int = 1, **kwargs: Any):
+    super().__init__(**kwargs)
+    assert block_size > 0, f"`block_size={block_size}` must be positive."
+    assert self.lse_mode, "Greedy updates require `lse_mode=True`."
+    assert self.anderson is None, "Anderson acceleration is not supported."
+    assert self.momentum.start == 0, "Momentum is not supported."
+    assert self.momentum.value == 1.0, "Momentum is not supported."
+    self.block_size = block_size
+
+  def lse_step(
+      self, ot_prob: linear_problem.LinearProblem,
+      state: sinkhorn.SinkhornState, iteration: int
+  ) -> sinkhorn.SinkhornState:
+    """Update the most violated columns, then the most violated rows."""
+    geom = ot_prob.geom
+    eps = geom.epsilon_scheduler(iteration)
+    f, g = state.potentials
+    marginal_a, marginal_b = state.marginals
+
+    g, f, marginal_b, marginal_a = _update_lines(
+        geom,
+        g,
+        f,
+        marginal_b,
+        marginal_a,
+        ot_prob.b,
+        eps,
+        self.block_size,
+        axis=0,
+    )
+    f, g, marginal_a, marginal_b = _update_lines(
+        geom,
+        f,
+        g,
+        marginal_a,
+        marginal_b,
+        ot_prob.a,
+        eps,
+        self.block_size,
+        axis=1,
+    )
+    return state.set(potentials=(f, g), marginals=(marginal_a, marginal_b))
+
+  def _one_iteration(
+      self, ot_prob: linear_problem.LinearProblem,
+      state: sinkhorn.SinkhornState, iteration: int, compute_error: bool
+  ) -> sinkhorn.SinkhornState:
+    with geometry.track_stats() as step_tracker:
+      state = self.lse_step(ot_prob, state, iteration)
+
+    should_compute_error = self._should_compute_error(iteration, compute_error)
+    # the tracked marginals accumulate round-off errors, refresh them
+    with geometry.track_stats() as error_tracker:
+      state = sinkhorn._cond(
+          should_compute_error,
+          lambda s: s.set(marginals=_marginals(ot_prob.geom, *s.potentials)),
+          lambda s: s,
+          state,
+      )
+    if should_compute_error is not False:
+      marginal_a, marginal_b = state.marginals
+      err = jnp.where(
+          should_compute_error,
+          sinkhorn._norm_error(marginal_a, ot_prob.a, self.norm_error)[0] +
+          sinkhorn._norm_error(marginal_b, ot_prob.b, self.norm_error)[0],
+          jnp.array(jnp.inf, dtype=ot_prob.dtype),
+      )
+      errors = state.errors.at[iteration // self.inner_iterations, :].set(err)
+      state = state.set(errors=errors)
+    state = sinkhorn._add_stats(
+        state, step_tracker, error_tracker, where=should_compute_error
+    )
+
+    self._report(ot_prob, state, iteration, compute_error)
+    return state
+
+  def _telemetry_values(
+      self, ot_prob: linear_problem.LinearProblem,
+      state: sinkhorn.SinkhornState, iteration: int
+  ) -> Dict[str, jnp.ndarray]:
+    values = super()._telemetry_values(ot_prob, state, iteration)
+    # both marginals are computed initially and at every error evaluation,
+    # the greedy updates only evaluate `block_size` rows and columns
+    if state.stats is None:
+      num_evaluations = iteration // self.inner_iterations + 1
+      values["num_kernel_evals"] = 2 * (num_evaluations + 1)
+    values["num_lines"] = 2 * self.block_size * (iteration + 1)
+    return values
+
+  def init_state(
+      self,
+      ot_prob: linear_problem.LinearProblem,
+      init: Tuple[jnp.ndarray, jnp.ndarray],
+  ) -> sinkhorn.SinkhornState:
+    """Return the initial state of the loop, with the initial marginals."""
+    assert ot_prob.is_balanced, "Greedy updates require a balanced problem."
+    state = super().init_state(ot_prob, init)
+    assert state.epsilon_multiple is None, \
+        "Adaptive epsilon is not supported."
+    with geometry.track_stats() as tracker:
+      state = state.set(marginals=_marginals(ot_prob.geom, *state.potentials))
+    if state.stats is not None:
+      state = state.set(stats=state.stats.add(tracker.stats))
+    return state
+
+
+def _marginals(geom: geometry.Geometry, f: jnp.ndarray,
+               g: jnp.ndarray) -> Tuple[jnp.ndarray, jnp.ndarray]:
+  """Both marginals of the coupling defined by the potentials."""
+  return (
+      geom.marginal_from_potentials(f, g, axis=1),
+      geom.marginal_from_potentials(f, g, axis=0),
+  )
+
+
+def _violation(marginal: jnp.ndarray, target: jnp.ndarray) -> jnp.ndarray:
+  r"""Greenkhorn violation of each entry of a marginal.
+
+  It is computed as :math:`d - a \log(1 + d / a)`, where :math:`d = r - a`,
+  which avoids the cancellation of :math:`r - a + a \log(a / r)` near
+  convergence.
+  """
+  diff = marginal - target
+  safe_target = jnp.where(target > 0.0, target, 1.0)
+  kl = jnp.where(target > 0.0, target * jnp.log1p(diff / safe_target), 0.0)
+  return diff - kl
+
+
+def _update_lines(
+    geom: geometry.Geometry,
+    h: jnp.ndarray,
+    h_other: jnp.ndarray,
+    marginal: jnp.ndarray,
+    marginal_other: jnp.ndarray,
+    target: jnp.ndarray,
+    eps: float,
+    block_size: int,
+    axis: int,
+) -> Tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray, jnp.ndarray]:
+  """Update the entries of ``h`` whose marginals are the most violated.
+
+  ``h`` is the ``f`` potential if ``axis = 1``, else the ``g`` potential.
+  """
+  block_size = min(block_size, marginal.shape[0])
+  _, ids = jax.lax.top_k(_violation(marginal, target), block_size)
+  z = (h_other[None, :] - sinkhorn._cost_lines(geom, ids, axis)) / eps
+
+  lse = mu.logsumexp(z, axis=1)
+  lse = jnp.where(jnp.isfinite(lse), lse, 0.0)
+  new_h = eps * (jnp.log(target[ids]) - lse)
+  old_coupling = jnp.exp(h[ids, None] / eps + z)
+  new_coupling = jnp.exp(new_h[:, None] / eps + z)
+
+  h = h.at[ids].set(new_h)
+  marginal = marginal.at[ids].set(jnp.sum(new_coupling, axis=1))
+  marginal_other = marginal_other + jnp.sum(new_coupling - old_coupling, axis=0)
+  return h, h_other, marginal, marginal_other
@@ -11,7 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Any, Callable, Mapping, NamedTuple, Optional, Tuple
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional, Tuple
 
 import jax
 import jax.numpy as jnp
@@ -685,14 +685,22 @@ class LRSinkhorn(sinkhorn.Sinkhorn):
         crossed_threshold=crossed_threshold,
     )
 
-    if self.progress_fn is not None:
-      jax.debug.callback(
-          self.progress_fn,
-          (iteration, self.inner_iterations, self.max_iterations, state)
-      )
-
+    self._report(ot_prob, state, iteration, compute_error)
     return state
 
+  def _telemetry_values(
+      self, ot_prob: linear_problem.LinearProblem, state: LRSinkhornState,
+      iteration: int
+  ) -> Dict[str, jnp.ndarray]:
+    it = iteration // self.inner_iterations
+    return {
+        "iteration": iteration,
+        "error": state.errors[it],
+        "cost": state.costs[it],
+        "gamma": state.gamma,
+        "epsilon": self.epsilon,
+    }
+
   @property
   def norm_error(self) -> Tuple[int]:  # noqa: D102
     return self._norm_error,
@@ -0,0 +1,226 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import jax
+import jax.numpy as jnp
+
+from ott import utils
+from ott.geometry import pointcloud, truncated
+from ott.problems.linear import linear_problem
+from ott.solvers.linear import sinkhorn
+
+__all__ = ["MultiscaleSinkhorn"]
+
+Level = Tuple[jnp.ndarray, jnp.ndarray]
+
+
+@jax.tree_util.register_pytree_node_class
+class MultiscaleSinkhorn(sinkhorn.Sinkhorn):
+  r"""Multiscale (coarse-to-fine) Sinkhorn solver :cite:`schmitzer:19`.
+
+  Both point clouds of a :class:`~ott.geometry.pointcloud.PointCloud` are
+  coarsened recursively with :func:`~ott.tools.k_means.k_means`, into
+  ``num_clusters`` weighted centroids per level. The problem between the
+  centroids of the coarsest level is solved first, with a larger
+  :math:`\varepsilon`. The dual potentials are then prolongated to the points
+  of the next finer level, where :math:`\varepsilon` is decreased, and are used
+  as a warm start. The prolongated potential at a point :math:`x_i` is the soft
+  :math:`c`-transform of the coarse potential :math:`g_J` at the centroids
+  :math:`y_J`, i.e., :math:`f_i = \varepsilon \log a_i - \varepsilon \log
+  \sum_J \exp((g_J - c(x_i, y_J)) / \varepsilon)`, and conversely for
+  :math:`g_j`. It costs :math:`O((n + m) k)`, where :math:`k` is the number of
+  clusters of the coarser level.
+
+  On all but the coarsest level, the Sinkhorn iterations are restricted to the
+  pairs of points that carry non-negligible mass given the prolongated
+  potentials, using :class:`~ott.geometry.truncated.TruncatedGeometry`.
+
+  Args:
+    num_clusters: Number of clusters of each coarse level, from coarsest to
+      finest.
+    epsilon_decay: Factor by which :math:`\varepsilon` is decreased between
+      two consecutive levels. The finest level uses the :math:`\varepsilon`
+      of the geometry.
+    truncation_threshold: Threshold used to truncate the kernel, see
+      :meth:`~ott.geometry.truncated.TruncatedGeometry.from_geometry`.
+      If :obj:`None`, do not truncate the kernel.
+    max_per_line: Maximum number of pairs kept per row and per column of the
+      truncated kernel.
+    kmeans_kwargs: Keyword arguments for :func:`~ott.tools.k_means.k_means`.
+    kwargs: Keyword arguments for
+      :class:`~ott.solvers.linear.sinkhorn.Sinkhorn`.
+  """
+
+  def __init__(
+      self,
+      num_clusters: Sequence[int],
+      epsilon_decay: float = 0.5,
+      truncation_threshold: Optional[float] = 10.0,
+      max_per_line: int = 32,
+      kmeans_kwargs: Optional[Dict[str, Any]] = None,
+      **kwargs: Any,
+  ):
+    super().__init__(**kwargs)
+    assert self.lse_mode, "Multiscale Sinkhorn requires `lse_mode=True`."
+    assert 0.0 < epsilon_decay <= 1.0, \
+        f"`epsilon_decay={epsilon_decay}` must be in `(0, 1]`."
+    self.num_clusters = tuple(num_clusters)
+    self.epsilon_decay = epsilon_decay
+    self.truncation_threshold = truncation_threshold
+    self.max_per_line = max_per_line
+    # stored as a sorted tuple, since it is part of the (hashable) aux data
+    self.kmeans_kwargs = tuple(sorted(dict(kmeans_kwargs or {}).items()))
+
+  def __call__(
+      self,
+      ot_prob: linear_problem.LinearProblem,
+      init: Optional[Tuple[jnp.ndarray, jnp.ndarray]] = None,
+      rng: Optional[jax.Array] = None,
+      **kwargs: Any,
+  ) -> sinkhorn.SinkhornOutput:
+    """Run the multiscale Sinkhorn algorithm.
+
+    Args:
+      ot_prob: Linear OT problem whose geometry is a
+        :class:`~ott.geometry.pointcloud.PointCloud`.
+      init: Initial dual potentials of the finest level. If passed, the coarse
+        levels are skipped and the finest level is warm-started from them.
+        If :obj:`None`, start from the coarsest level.
+      rng: Random key used for the clustering.
+      kwargs: Keyword arguments for the initializer of the coarsest level.
+
+    Returns:
+      The Sinkhorn output of the finest level. If the kernel is truncated,
+      its :attr:`~ott.solvers.linear.sinkhorn.SinkhornOutput.geom` is a
+      :class:`~ott.geometry.truncated.TruncatedGeometry`.
+    """
+    geom = ot_prob.geom
+    assert isinstance(geom, pointcloud.PointCloud), \
+        f"Expected a point cloud, found `{type(geom)}`."
+    if init is not None:
+      return self._run_level(ot_prob, *init)
+
+    rng_x, rng_y = jax.random.split(utils.default_prng_key(rng))
+    levels_x = self._coarsen(geom.x, ot_prob.a, rng_x)
+    levels_y = self._coarsen(geom.y, ot_prob.b, rng_y)
+    num_levels = len(self.num_clusters)
+    epsilon = geom.epsilon
+    # the scaling of the fine cost is shared by all levels
+    scale_cost = 1.0 / geom.inv_scale_cost
+
+    out, prev_x, prev_y = None, None, None
+    for level in range(num_levels + 1):
+      eps = epsilon / (self.epsilon_decay ** (num_levels - level))
+      if level < num_levels:
+        x, a = levels_x[level]
+        y, b = levels_y[level]
+        level_geom = pointcloud.PointCloud(
+            x, y, cost_fn=geom.cost_fn, epsilon=eps, scale_cost=scale_cost
+        )
+        prob = linear_problem.LinearProblem(
+            level_geom, a=a, b=b, tau_a=ot_prob.tau_a, tau_b=ot_prob.tau_b
+        )
+      else:
+        a, b, prob = ot_prob.a, ot_prob.b, ot_prob
+
+      if out is None:
+        init = self.initializer(prob, lse_mode=True, **kwargs)
+        out = sinkhorn.run(prob, self, init)
+      else:
+        # c-transforms of the coarse potentials at the points of this level
+        f = _prolongate(prob.geom, prev_y, out.g, a, axis=1)
+        g = _prolongate(prob.geom, prev_x, out.f, b, axis=0)
+        out = self._run_level(prob, f, g)
+      prev_x, prev_y = prob.geom.x, prob.geom.y
+
+    return out
+
+  def _run_level(
+      self,
+      prob: linear_problem.LinearProblem,
+      f: jnp.ndarray,
+      g: jnp.ndarray,
+  ) -> sinkhorn.SinkhornOutput:
+    """Run Sinkhorn from warm-start potentials, truncating the kernel."""
+    if self.truncation_threshold is not None:
+      geom_trunc = truncated.TruncatedGeometry.from_geometry(
+          prob.geom,
+          f,
+          g,
+          threshold=self.truncation_threshold,
+          max_per_line=self.max_per_line,
+      )
+      prob = linear_problem.LinearProblem(
+          geom_trunc, a=prob.a, b=prob.b, tau_a=prob.tau_a, tau_b=prob.tau_b
+      )
+    return sinkhorn.run(prob, self, (f, g))
+
+  def _coarsen(
+      self,
+      x: jnp.ndarray,
+      weights: jnp.ndarray,
+      rng: jax.Array,
+  ) -> List[Level]:
+    """Cluster ``x`` recursively, from the finest to the coarsest level.
+
+    Returns, for each level ordered from coarsest to finest, the centroids and
+    their weights.
+    """
+    from ott.tools import k_means
+
+    num_clusters = sorted(self.num_clusters, reverse=True)
+    assert len(set(num_clusters)) == len(num_clusters), \
+        f"Number of clusters `{self.num_clusters}` must be distinct."
+    rngs = jax.random.split(rng, len(num_clusters))
+
+    levels = []
+    for k, rng in zip(num_clusters, rngs):
+      res = k_means.k_means(
+          x, k=k, weights=weights, rng=rng, **dict(self.kmeans_kwargs)
+      )
+      weights = jax.ops.segment_sum(weights, res.assignment, num_segments=k)
+      x = res.centroids
+      levels.append((x, weights))
+    return levels[::-1]
+
+
+def _prolongate(
+    geom: pointcloud.PointCloud,
+    coarse_z: jnp.ndarray,
+    coarse_potential: jnp.ndarray,
+    weights: jnp.ndarray,
+    axis: int,
+) -> jnp.ndarray:
+  """Prolongate a coarse potential using a soft c-transform.
+
+  If ``axis=1``, ``coarse_potential`` is the potential of the coarse
+  second point cloud ``coarse_z``, and the potential of the points ``geom.x``
+  of the first point cloud, with weights ``weights``, is returned.
+  Otherwise, the roles of both point clouds are swapped.
+  """
+  x, y = (geom.x, coarse_z) if axis == 1 else (coarse_z, geom.y)
+  geom = pointcloud.PointCloud(
+      x,
+      y,
+      cost_fn=geom.cost_fn,
+      epsilon=geom.epsilon,
+      scale_cost=1.0 / geom.inv_scale_cost
+  )
+  n, m = geom.shape
+  if axis == 1:
+    f, g = jnp.zeros(n, dtype=geom.dtype), coarse_potential
+  else:
+    f, g = coarse_potential, jnp.zeros(m, dtype=geom.dtype)
+  return geom.update_potential(f, g, jnp.log(weights), axis=axis)
@@ -0,0 +1,208 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import NamedTuple, Optional, Tuple
+
+import jax.numpy as jnp
+
+from ott.geometry import geometry
+from ott.problems.linear import linear_problem
+from ott.solvers.linear import sinkhorn
+
+__all__ = ["Screening", "screen", "run_screened"]
+
+
+class Screening(NamedTuple):
+  """Screening of a linear problem into a reduced problem.
+
+  Args:
+    problem: The full linear problem.
+    reduced_problem: The problem restricted to the active points.
+    active_a: Indices of the active points of the first measure.
+    inactive_a: Indices of the inactive points of the first measure.
+    active_b: Indices of the active points of the second measure.
+    inactive_b: Indices of the inactive points of the second measure.
+  """
+  problem: linear_problem.LinearProblem
+  reduced_problem: linear_problem.LinearProblem
+  active_a: jnp.ndarray
+  inactive_a: jnp.ndarray
+  active_b: jnp.ndarray
+  inactive_b: jnp.ndarray
+
+  def reconstruct(
+      self,
+      out: sinkhorn.SinkhornOutput,
+      solver: sinkhorn.Sinkhorn,
+  ) -> sinkhorn.SinkhornOutput:
+    """Reconstruct the output of the full problem.
+
+    The potentials of the inactive points are the :term:`c-transform` of the
+    potentials of the active points of the other measure.
+
+    Args:
+      out: Output of the ``solver`` on the :attr:`reduced_problem`.
+      solver: Sinkhorn solver used to solve the :attr:`reduced_problem`.
+
+    Returns:
+      The Sinkhorn output of the full :attr:`problem`.
+    """
+    prob = self.problem
+    f_in = _c_transform(
+        prob, self.inactive_a, self.active_b, out.g, prob.a, prob.tau_a, axis=1
+    )
+    g_in = _c_transform(
+        prob, self.active_a, self.inactive_b, out.f, prob.b, prob.tau_b, axis=0
+    )
+
+    n, m = prob.geom.shape
+    f = jnp.zeros(n, dtype=out.f.dtype).at[self.active_a].set(out.f)
+    f = f.at[self.inactive_a].set(f_in)
+    g = jnp.zeros(m, dtype=out.g.dtype).at[self.active_b].set(out.g)
+    g = g.at[self.inactive_b].set(g_in)
+
+    out = out.set(potentials=(f, g))
+    out = out.set_cost(prob, solver.lse_mode, solver.use_danskin)
+    return out.set(ot_prob=prob)
+
+
+def screen(
+    ot_prob: linear_problem.LinearProblem,
+    num_active_a: int,
+    num_active_b: int,
+) -> Screening:
+  r"""Screen the points of a linear problem :cite:`alaya:19`.
+
+  Starting from zero potentials, one Sinkhorn update yields the potentials
+  :math:`f_i = \varepsilon \log a_i - \varepsilon \log r_i`, where
+  :math:`r_i = \sum_j \exp(-C_{ij} / \varepsilon)` is a row sum of the kernel.
+  As in :cite:`alaya:19`, the points with the largest :math:`a_i / r_i` are
+  kept active, and similarly for the second measure, while the others, which
+  carry a negligible mass, have their potentials fixed to the
+  :term:`c-transform` of the potentials of the active points, see
+  :meth:`Screening.reconstruct`. The cost of the screening is a single
+  application of the kernel along each axis.
+
+  For balanced problems, the weights of the active points are rescaled to the
+  total mass of their measure, so that the reduced problem stays balanced.
+  The marginals of the reconstructed coupling are then only approximately
+  satisfied, up to the mass of the inactive points.
+
+  Args:
+    ot_prob: Linear problem.
+    num_active_a: Number of active points of the first measure.
+    num_active_b: Number of active points of the second measure.
+
+  Returns:
+    The screening, containing the reduced problem.
+  """
+  geom = ot_prob.geom
+  n, m = geom.shape
+  assert 0 < num_active_a <= n, \
+      f"`num_active_a={num_active_a}` must be in `(0, {n}]`."
+  assert 0 < num_active_b <= m, \
+      f"`num_active_b={num_active_b}` must be in `(0, {m}]`."
+
+  eps = geom.epsilon
+  zeros_a = jnp.zeros(n, dtype=geom.dtype)
+  zeros_b = jnp.zeros(m, dtype=geom.dtype)
+  log_r = geom.apply_lse_kernel(zeros_a, zeros_b, eps, axis=1)[0] / eps
+  log_c = geom.apply_lse_kernel(zeros_a, zeros_b, eps, axis=0)[0] / eps
+  order_a = jnp.argsort(log_r - jnp.log(ot_prob.a))
+  order_b = jnp.argsort(log_c - jnp.log(ot_prob.b))
+  active_a, inactive_a = order_a[:num_active_a], order_a[num_active_a:]
+  active_b, inactive_b = order_b[:num_active_b], order_b[num_active_b:]
+
+  a, b = ot_prob.a[active_a], ot_prob.b[active_b]
+  if ot_prob.is_balanced:
+    a = a * (jnp.sum(ot_prob.a) / jnp.sum(a))
+    b = b * (jnp.sum(ot_prob.b) / jnp.sum(b))
+  reduced_problem = linear_problem.LinearProblem(
+      _subset(geom, active_a, active_b),
+      a=a,
+      b=b,
+      tau_a=ot_prob.tau_a,
+      tau_b=ot_prob.tau_b
+  )
+  return Screening(
+      problem=ot_prob,
+      reduced_problem=reduced_problem,
+      active_a=active_a,
+      inactive_a=inactive_a,
+      active_b=active_b,
+      inactive_b=inactive_b,
+  )
+
+
+def run_screened(
+    ot_prob: linear_problem.LinearProblem,
+    solver: sinkhorn.Sinkhorn,
+    num_active_a: int,
+    num_active_b: int,
+    init: Optional[Tuple[jnp.ndarray, jnp.ndarray]] = None,
+) -> sinkhorn.SinkhornOutput:
+  """Run Sinkhorn on a screened problem and reconstruct the full output.
+
+  Args:
+    ot_prob: Linear problem.
+    solver: Sinkhorn solver.
+    num_active_a: Number of active points of the first measure, see
+      :func:`screen`.
+    num_active_b: Number of active points of the second measure, see
+      :func:`screen`.
+    init: Initial potentials/scalings of shape ``[n,]`` and ``[m,]``. Only
+      their entries at the active points are used. If :obj:`None`, run the
+      initializer of the ``solver`` on the reduced problem.
+
+  Returns:
+    The Sinkhorn output of the full problem. Its errors and convergence are
+    the ones of the reduced problem.
+  """
+  screening = screen(ot_prob, num_active_a, num_active_b)
+  if init is not None:
+    init = init[0][screening.active_a], init[1][screening.active_b]
+  out = solver(screening.reduced_problem, init=init)
+  return screening.reconstruct(out, solver)
+
+
+def _subset(
+    geom: geometry.Geometry, row_ixs: jnp.ndarray, col_ixs: jnp.ndarray
+) -> geometry.Geometry:
+  """Subset a geometry, keeping the cost scaling and epsilon of the full one."""
+  children, aux_data = geom.subset(row_ixs, col_ixs).tree_flatten()
+  aux_data["scale_cost"] = 1.0 / geom.inv_scale_cost
+  return type(geom).tree_unflatten(aux_data, children).copy_epsilon(geom)
+
+
+def _c_transform(
+    ot_prob: linear_problem.LinearProblem,
+    row_ixs: jnp.ndarray,
+    col_ixs: jnp.ndarray,
+    potential: jnp.ndarray,
+    marginal: jnp.ndarray,
+    tau: float,
+    axis: int,
+) -> jnp.ndarray:
+  """Potentials of the inactive points given the ones of the active points.
+
+  If ``axis = 1``, ``row_ixs`` are the inactive points and ``potential`` is
+  defined on ``col_ixs``, and conversely if ``axis = 0``.
+  """
+  ixs = row_ixs if axis == 1 else col_ixs
+  if ixs.shape[0] == 0:
+    return jnp.zeros(0, dtype=potential.dtype)
+
+  geom = _subset(ot_prob.geom, row_ixs, col_ixs)
+  zeros = jnp.zeros(ixs.shape[0], dtype=potential.dtype)
+  f, g = (zeros, potential) if axis == 1 else (potential, zeros)
+  return tau * geom.update_potential(f, g, jnp.log(marginal[ixs]), axis=axis)
@@ -0,0 +1,98 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Optional, Tuple
+
+import jax
+import jax.numpy as jnp
+
+from ott.geometry import truncated
+from ott.problems.linear import linear_problem
+from ott.solvers.linear import sinkhorn
+
+__all__ = ["run_truncated"]
+
+
+def run_truncated(
+    ot_prob: linear_problem.LinearProblem,
+    solver: sinkhorn.Sinkhorn,
+    init: Optional[Tuple[jnp.ndarray, jnp.ndarray]] = None,
+    num_rebuilds: int = 3,
+    threshold: float = 10.0,
+    max_per_line: int = 32,
+    batch_size: Optional[int] = None,
+) -> sinkhorn.SinkhornOutput:
+  r"""Run Sinkhorn on a truncated kernel, rebuilt as the potentials change.
+
+  The kernel of the geometry is truncated around the current potentials using
+  :meth:`~ott.geometry.truncated.TruncatedGeometry.from_geometry`, and the
+  Sinkhorn iterations are run in :math:`O(\text{nse})` on the truncated
+  geometry. This is repeated ``num_rebuilds`` times, each time warm-starting
+  from the potentials of the previous solve, so that the support of the
+  truncated kernel follows the potentials.
+
+  Args:
+    ot_prob: Linear problem.
+    solver: Sinkhorn solver. Must be in ``lse_mode``.
+    init: Initial potentials of shape ``[n,]`` and ``[m,]``. If :obj:`None`,
+      use zeros.
+    num_rebuilds: Number of times the truncated kernel is rebuilt. Must be
+      positive.
+    threshold: Truncation threshold, relative to epsilon, see
+      :meth:`~ott.geometry.truncated.TruncatedGeometry.from_geometry`.
+    max_per_line: Maximum number of pairs kept per row and per column.
+    batch_size: Number of lines of the cost matrix computed at once when
+      rebuilding the truncated kernel.
+
+  Returns:
+    The Sinkhorn output of the last solve, whose
+    :attr:`~ott.solvers.linear.sinkhorn.SinkhornOutput.geom` is the last
+    truncated geometry.
+  """
+
+  def solve(
+      f: jnp.ndarray, g: jnp.ndarray
+  ) -> Tuple[linear_problem.LinearProblem, sinkhorn.SinkhornOutput]:
+    geom = truncated.TruncatedGeometry.from_geometry(
+        ot_prob.geom,
+        f,
+        g,
+        threshold=threshold,
+        max_per_line=max_per_line,
+        batch_size=batch_size,
+    )
+    prob = linear_problem.LinearProblem(
+        geom,
+        a=ot_prob.a,
+        b=ot_prob.b,
+        tau_a=ot_prob.tau_a,
+        tau_b=ot_prob.tau_b
+    )
+    return solver(prob, init=(f, g))
+
+  def body_fn(
+      _: int, potentials: Tuple[jnp.ndarray, jnp.ndarray]
+  ) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    out = solve(*potentials)
+    return out.f, out.g
+
+  assert solver.lse_mode, "Truncated kernels require `lse_mode=True`."
+  assert num_rebuilds > 0, f"`num_rebuilds={num_rebuilds}` must be positive."
+
+  n, m = ot_prob.geom.shape
+  if init is None:
+    dtype = ot_prob.geom.dtype
+    init = jnp.zeros(n, dtype=dtype), jnp.zeros(m, dtype=dtype)
+
+  f, g = jax.lax.fori_loop(0, num_rebuilds - 1, body_fn, tuple(init))
+  return solve(f, g)
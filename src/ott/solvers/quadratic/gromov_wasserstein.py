@@ -27,6 +27,7 @@ import jax
 import jax.numpy as jnp
 import numpy as np
 
+from ott import utils
 from ott.geometry import geometry
 from ott.initializers.quadratic import initializers as quad_initializers
 from ott.math import fixed_point_loop
@@ -155,7 +156,7 @@ class GWState(NamedTuple):
 
 @jax.tree_util.register_pytree_node_class
 class GromovWasserstein(was_solver.WassersteinSolver):
-  """Entropic Gromov-Wasserstein solver :cite:`peyre:16`.
+  r"""Entropic Gromov-Wasserstein solver :cite:`peyre:16`.
 
   .. seealso::
     Low-rank Gromov-Wasserstein :cite:`scetbon:23` is implemented in
@@ -174,6 +175,9 @@ class GromovWasserstein(was_solver.WassersteinSolver):
       Gromov-Wasserstein iterations, so the user can display the error at each
       iteration, e.g., using a progress bar.
       See :func:`~ott.utils.default_progress_fn` for a basic implementation.
+    telemetry: Channel receiving the cost, :math:`\varepsilon` and number of
+      Sinkhorn iterations of the outer iterations, without blocking them.
+      See :class:`~ott.utils.Telemetry`.
     kwargs: Keyword arguments for
       :class:`~ott.solvers.was_solver.WassersteinSolver`.
   """
@@ -186,6 +190,7 @@ class GromovWasserstein(was_solver.WassersteinSolver):
       initializer: Optional[quad_initializers.BaseQuadraticInitializer] = None,
       warm_start: bool = False,
       progress_fn: Optional[ProgressCallbackFn] = None,
+      telemetry: Optional[utils.Telemetry] = None,
       **kwargs: Any
   ):
     super().__init__(linear_solver, **kwargs)
@@ -195,6 +200,7 @@ class GromovWasserstein(was_solver.WassersteinSolver):
     ) if initializer is None else initializer
     self.warm_start = warm_start
     self.progress_fn = progress_fn
+    self.telemetry = telemetry
 
   def __call__(
       self,
@@ -302,6 +308,7 @@ class GromovWasserstein(was_solver.WassersteinSolver):
     aux_data["initializer"] = self.initializer
     aux_data["warm_start"] = self.warm_start
     aux_data["progress_fn"] = self.progress_fn
+    aux_data["telemetry"] = self.telemetry
     return children, aux_data
 
   @classmethod
@@ -354,6 +361,16 @@ def iterations(
           solver.progress_fn,
           (iteration, inner_iterations, solver.max_iterations, state)
       )
+    if solver.telemetry is not None:
+      solver.telemetry.record(
+          type(solver).__name__, iteration, {
+              "iteration": iteration,
+              "cost": out.reg_ot_cost,
+              "epsilon": linear_pb.geom.epsilon,
+              "linear_iterations": out.n_iters,
+              "linear_converged": out.converged,
+          }
+      )
 
     return new_state
 
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """A Jax implementation of the unbalanced low-rank GW algorithm."""
-from typing import Any, Callable, Mapping, NamedTuple, Optional, Tuple
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional, Tuple
 
 import jax
 import jax.numpy as jnp
@@ -722,14 +722,22 @@ class LRGromovWasserstein(sinkhorn.Sinkhorn):
         crossed_threshold=crossed_threshold,
     )
 
-    if self.progress_fn is not None:
-      jax.debug.callback(
-          self.progress_fn,
-          (iteration, self.inner_iterations, self.max_iterations, state)
-      )
-
+    self._report(ot_prob, state, iteration, compute_error)
     return state
 
+  def _telemetry_values(
+      self, ot_prob: quadratic_problem.QuadraticProblem, state: LRGWState,
+      iteration: int
+  ) -> Dict[str, jnp.ndarray]:
+    it = iteration // self.inner_iterations
+    return {
+        "iteration": iteration,
+        "error": state.errors[it],
+        "cost": state.costs[it],
+        "gamma": state.gamma,
+        "epsilon": self.epsilon,
+    }
+
   @property
   def norm_error(self) -> Tuple[int]:  # noqa: D102
     return self._norm_error,
@@ -75,6 +75,8 @@ class GromovWassersteinBarycenter(was_solver.WassersteinSolver):
     min_iterations: Minimum number of iterations.
     max_iterations: Maximum number of outermost iterations.
     store_inner_errors: Whether to store the errors of the quadratic OT solver.
+    telemetry: Channel receiving the cost and the convergence of the quadratic
+      solvers at every outer iteration. See :class:`~ott.utils.Telemetry`.
   """
 
   def __init__(
@@ -84,6 +86,7 @@ class GromovWassersteinBarycenter(was_solver.WassersteinSolver):
       min_iterations: int = 5,
       max_iterations: int = 50,
       store_inner_errors: bool = False,
+      telemetry: Optional[utils.Telemetry] = None,
   ):
     super().__init__(
         quadratic_solver.linear_solver,
@@ -93,6 +96,7 @@ class GromovWassersteinBarycenter(was_solver.WassersteinSolver):
         store_inner_errors=store_inner_errors,
     )
     self.quadratic_solver = quadratic_solver
+    self.telemetry = telemetry
 
   def __call__(
       self, problem: gw_barycenter.GWBarycenterProblem, bar_size: int,
@@ -252,6 +256,7 @@ class GromovWassersteinBarycenter(was_solver.WassersteinSolver):
         "min_iterations": self.min_iterations,
         "max_iterations": self.max_iterations,
         "store_inner_errors": self.store_inner_errors,
+        "telemetry": self.telemetry,
     })
 
 
@@ -299,7 +304,16 @@ def iterations(  # noqa: D103
   ) -> GWBarycenterState:
     del compute_error  # always assumed true
     solver, problem = constants
-    return solver.update_state(state, iteration, problem)
+    state = solver.update_state(state, iteration, problem)
+    if solver.telemetry is not None:
+      solver.telemetry.record(
+          type(solver).__name__, iteration, {
+              "iteration": iteration,
+              "cost": state.costs[iteration],
+              "gw_converged": state.gw_convergence[iteration],
+          }
+      )
+    return state
 
   return fixed_point_loop.fixpoint_iter(
       cond_fn=cond_fn,
@@ -11,15 +11,22 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import collections
 import dataclasses
 import functools
 import io
+import json
+import os
+import threading
+import time
 import warnings
 from collections.abc import Sequence
 from typing import (
     Any,
     Callable,
+    Dict,
     List,
+    Mapping,
     NamedTuple,
     Optional,
     Tuple,
@@ -48,12 +55,18 @@ __all__ = [
     "default_prng_key",
     "default_progress_fn",
     "tqdm_progress_fn",
+    "Telemetry",
+    "JSONLinesSink",
+    "enable_compilation_cache",
+    "precompile",
     "batched_vmap",
     "is_scalar",
 ]
 
 IOStatus = Tuple[np.ndarray, np.ndarray, np.ndarray, NamedTuple]
 IOCallback = Callable[[IOStatus], None]
+TelemetryRecord = Dict[str, Any]
+TelemetrySink = Callable[[List[TelemetryRecord]], None]
 P = ParamSpec("P")
 R = TypeVar("R")
 
@@ -102,6 +115,88 @@ def default_prng_key(rng: Optional[jax.Array] = None) -> jax.Array:
   return jax.random.key(0) if rng is None else rng
 
 
+def enable_compilation_cache(
+    cache_dir: Optional[str] = None,
+    min_compile_time_secs: float = 0.0,
+) -> str:
+  """Enable the persistent compilation cache of JAX.
+
+  The compiled functions are written to ``cache_dir`` and loaded from it,
+  instead of being recompiled, by the subsequent processes which compile them
+  for the same shapes, dtypes, static arguments and backend. This removes
+  most of the first-call latency of the solvers in short-lived jobs.
+
+  The cache is never enabled by importing :mod:`ott`. JAX sets up the cache on
+  the first compilation of a process, so this function should be called at
+  the start of the program, before any function is compiled.
+
+  Args:
+    cache_dir: Directory of the cache. If :obj:`None`, use
+      ``~/.cache/ott/jax``.
+    min_compile_time_secs: Only cache the functions whose compilation takes
+      at least this many seconds.
+
+  Returns:
+    The directory of the cache.
+  """
+  if cache_dir is None:
+    cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "ott", "jax")
+  os.makedirs(cache_dir, exist_ok=True)
+  jax.config.update("jax_enable_compilation_cache", True)
+  jax.config.update("jax_compilation_cache_dir", cache_dir)
+  jax.config.update(
+      "jax_persistent_cache_min_compile_time_secs", min_compile_time_secs
+  )
+  jax.config.update("jax_persistent_cache_min_entry_size_bytes", 0)
+  return cache_dir
+
+
+def precompile(
+    fn: Callable[..., Any],
+    *args: Any,
+    cache_dir: Optional[str] = None,
+    **kwargs: Any,
+) -> jax.stages.Compiled:
+  """Compile a function ahead of time for the shapes and dtypes of its inputs.
+
+  Example:
+    .. code-block:: python
+
+      import jax
+      import jax.numpy as jnp
+
+      from ott import utils
+      from ott.geometry import pointcloud
+      from ott.solvers import linear
+
+      x = jax.ShapeDtypeStruct((1024, 2), jnp.float32)
+      geom = pointcloud.PointCloud(x, x, epsilon=1e-2)
+      solve = utils.precompile(linear.solve, geom, max_iterations=100)
+
+      rng_x, rng_y = jax.random.split(jax.random.key(0))
+      x = jax.random.normal(rng_x, (1024, 2))
+      y = jax.random.normal(rng_y, (1024, 2))
+      out = solve(pointcloud.PointCloud(x, y, epsilon=1e-2))
+
+  Args:
+    fn: Function to compile.
+    args: Positional arguments of ``fn``, which are traced. Their array
+      leaves can be either arrays or :class:`~jax.ShapeDtypeStruct`.
+    cache_dir: Directory of the persistent compilation cache, see
+      :func:`enable_compilation_cache`. If :obj:`None`, the cache is not
+      enabled by this function.
+    kwargs: Keyword arguments of ``fn``, which are static.
+
+  Returns:
+    The compiled function. It must be called with positional arguments having
+    the same tree structure, shapes and dtypes as ``args``.
+  """
+  if cache_dir is not None:
+    enable_compilation_cache(cache_dir)
+  fn = functools.partial(fn, **kwargs)
+  return jax.jit(fn).lower(*args).compile()
+
+
 def default_progress_fn(
     fmt: str = "{iter} / {max_iter} -- {error}",
     stream: Optional[io.TextIOBase] = None,
@@ -221,6 +316,216 @@ def tqdm_progress_fn(
   return progress_callback
 
 
+class Telemetry:
+  r"""Asynchronous channel recording the progress of iterative solvers.
+
+  Unlike ``progress_fn``, which transfers the whole state to the host at every
+  iteration, the solvers only send a few scalars to the telemetry, and only
+  every ``every`` error evaluations, i.e., every ``every * inner_iterations``
+  iterations. On the host, the records are appended to a bounded ring buffer,
+  dropping the oldest ones when full, and are dispatched to the ``sinks`` by a
+  background thread, so that the solvers are not blocked by slow sinks.
+
+  Each record is a dictionary containing
+
+  - ``'solver'``, the name of the solver class,
+  - ``'evaluation'``, the index of the error evaluation,
+  - ``'time'``, the host time when the record was received,
+  - ``'block_time'``, the average wall time of the blocks of
+    ``inner_iterations`` since the previous record of the same solver, or
+    :obj:`None` for the first record of a run,
+
+  and the values reported by the solver, e.g., the error, :math:`\varepsilon`
+  and the number of kernel evaluations for
+  :class:`~ott.solvers.linear.sinkhorn.Sinkhorn`. The wall times are measured
+  on the host and are only approximate, since the callbacks are asynchronous.
+
+  Args:
+    every: Record every ``every`` error evaluations.
+    capacity: Maximum number of records held in the ring buffer.
+    sinks: Callables receiving lists of records, e.g., a
+      :class:`JSONLinesSink`. If empty, the records are held in the buffer
+      until :meth:`drain` is called.
+    flush_interval: Maximum time in seconds between two dispatches of the
+      buffered records to the ``sinks``.
+
+  Examples:
+    .. code-block:: python
+
+      import jax
+
+      from ott import utils
+      from ott.geometry import pointcloud
+      from ott.solvers import linear
+
+      x = jax.random.normal(jax.random.key(0), (100, 5))
+      geom = pointcloud.PointCloud(x)
+
+      with utils.Telemetry(sinks=[utils.JSONLinesSink("log.jsonl")]) as tel:
+        out = jax.jit(linear.solve, static_argnames=["telemetry"])(
+            geom, telemetry=tel
+        )
+  """
+
+  def __init__(
+      self,
+      every: int = 1,
+      capacity: int = 1024,
+      sinks: Sequence[TelemetrySink] = (),
+      flush_interval: float = 0.1,
+  ):
+    assert every > 0, f"`every={every}` must be positive."
+    assert capacity > 0, f"`capacity={capacity}` must be positive."
+    self.every = every
+    self.capacity = capacity
+    self.sinks = tuple(sinks)
+    self.flush_interval = flush_interval
+    self.num_dropped = 0
+
+    self._buffer = collections.deque(maxlen=capacity)
+    self._last: Dict[str, Tuple[int, float]] = {}
+    self._lock = threading.Lock()
+    self._dispatch_lock = threading.Lock()
+    self._wake = threading.Event()
+    self._stop = threading.Event()
+    self._thread: Optional[threading.Thread] = None
+
+  def record(
+      self,
+      name: str,
+      evaluation: jnp.ndarray,
+      values: Mapping[str, jnp.ndarray],
+      when: Union[bool, jnp.ndarray] = True,
+  ) -> None:
+    """Send values to the host, if sampled.
+
+    This function is meant to be called inside a solver's loop, and the values
+    are only transferred to the host when ``when`` holds and ``evaluation`` is
+    a multiple of :attr:`every`.
+
+    Args:
+      name: Name of the solver.
+      evaluation: Index of the error evaluation.
+      values: Scalars to record.
+      when: Whether the error was evaluated at this iteration.
+
+    Returns:
+      Nothing.
+    """
+
+    def emit(evaluation: jnp.ndarray, values: Dict[str, jnp.ndarray]) -> None:
+      callback = functools.partial(self._push, name)
+      jax.debug.callback(callback, evaluation, values, ordered=True)
+
+    values = {k: jnp.asarray(v) for k, v in values.items()}
+    evaluation = jnp.asarray(evaluation)
+    sampled = jnp.logical_and(when, evaluation % self.every == 0)
+    jax.lax.cond(sampled, emit, lambda *_: None, evaluation, values)
+
+  def drain(self) -> List[TelemetryRecord]:
+    """Remove and return the buffered records, from oldest to newest."""
+    with self._lock:
+      records = list(self._buffer)
+      self._buffer.clear()
+    return records
+
+  def flush(self) -> None:
+    """Wait for the pending callbacks and dispatch the records to the sinks."""
+    jax.effects_barrier()
+    self._dispatch()
+
+  def close(self) -> None:
+    """Flush the records and stop the background thread."""
+    self.flush()
+    if self._thread is not None:
+      self._stop.set()
+      self._wake.set()
+      self._thread.join()
+      self._thread = None
+      self._stop.clear()
+
+  def __enter__(self) -> "Telemetry":
+    return self
+
+  def __exit__(self, *args: Any) -> None:
+    self.close()
+
+  def _push(
+      self, name: str, evaluation: np.ndarray, values: Dict[str, np.ndarray]
+  ) -> None:
+    now = time.perf_counter()
+    evaluation = int(evaluation)
+    last_evaluation, last_time = self._last.get(name, (evaluation, now))
+    block_time = None
+    if evaluation > last_evaluation:
+      block_time = (now - last_time) / (evaluation - last_evaluation)
+    self._last[name] = (evaluation, now)
+
+    record = {
+        "solver": name,
+        "evaluation": evaluation,
+        "time": now,
+        "block_time": block_time,
+    }
+    record.update({k: np.asarray(v).tolist() for k, v in values.items()})
+    with self._lock:
+      if len(self._buffer) == self.capacity:
+        self.num_dropped += 1
+      self._buffer.append(record)
+
+    if self.sinks:
+      self._start()
+      self._wake.set()
+
+  def _start(self) -> None:
+    if self._thread is None:
+      self._thread = threading.Thread(target=self._consume, daemon=True)
+      self._thread.start()
+
+  def _consume(self) -> None:
+    while not self._stop.is_set():
+      self._wake.wait(self.flush_interval)
+      self._wake.clear()
+      self._dispatch()
+
+  def _dispatch(self) -> None:
+    if not self.sinks:
+      return
+    # keep the records ordered when flushing from another thread
+    with self._dispatch_lock:
+      records = self.drain()
+      if records:
+        for sink in self.sinks:
+          sink(records)
+
+
+class JSONLinesSink:
+  """Telemetry sink writing one JSON record per line.
+
+  Args:
+    file: Path of the file, opened in append mode, or a text stream.
+  """
+
+  def __init__(self, file: Union[str, os.PathLike, io.TextIOBase]):
+    if isinstance(file, (str, os.PathLike)):
+      self._stream = open(file, "a")  # noqa: SIM115
+      self._owned = True
+    else:
+      self._stream = file
+      self._owned = False
+
+  def __call__(self, records: List[TelemetryRecord]) -> None:
+    """Write the records and flush the stream."""
+    for record in records:
+      self._stream.write(json.dumps(record) + "\n")
+    self._stream.flush()
+
+  def close(self) -> None:
+    """Close the file, if opened by the sink."""
+    if self._owned:
+      self._stream.close()
+
+
 def _prepare_info(status: IOStatus) -> Tuple[int, int, int, np.ndarray]:
   iteration, inner_iterations, total_iter, state = status
   iteration = int(iteration) + 1
@@ -17,6 +17,7 @@ import jax
 import jax.numpy as jnp
 import numpy as np
 
+from ott import utils
 from ott.experimental import mmsinkhorn
 from ott.geometry import costs, pointcloud
 from ott.solvers import linear
@@ -101,6 +102,26 @@ class TestMMSinkhorn:
           out_ms.marginals[i], out_ms.a_s[i], rtol=1e-3, atol=1e-3
       )
 
+  def test_telemetry(self, rng: jax.Array):
+    n_s, d = [5, 6, 7], 2
+    rngs = jax.random.split(rng, len(n_s))
+    x_s = [jax.random.normal(rng, (n, d)) for rng, n in zip(rngs, n_s)]
+
+    with utils.Telemetry(every=2) as tel:
+      solver = mmsinkhorn.MMSinkhorn(
+          threshold=-1.0, inner_iterations=5, max_iterations=30, telemetry=tel
+      )
+      out = jax.jit(solver)(x_s, epsilon=1e-1)
+
+    records = tel.drain()
+    assert [r["evaluation"] for r in records] == [0, 2, 4]
+    assert [r["iteration"] for r in records] == [4, 14, 24]
+    assert all(r["solver"] == "MMSinkhorn" for r in records)
+    np.testing.assert_allclose([r["error"] for r in records],
+                               out.errors[::2, 0],
+                               rtol=1e-5)
+    np.testing.assert_allclose([r["epsilon"] for r in records], 1e-1)
+
   def test_mm_sinkhorn_diff(self, rng: jax.Array):
     """Test differentiability (Danskin) of MMSinkhorn's ent_reg_cost."""
     n_s, d = [13, 5, 7, 3], 2
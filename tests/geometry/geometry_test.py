@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from typing import Optional
 
 import pytest
 
@@ -46,3 +47,59 @@ class TestCostMeanStd:
 
     eps = pointcloud.PointCloud(x, y, relative_epsilon="std").epsilon
     np.testing.assert_allclose(default_scale * std, eps, rtol=1e-5, atol=1e-5)
+
+  @pytest.mark.parametrize("relative_epsilon", [None, "mean", "std"])
+  def test_set_epsilon(self, rng: jax.Array, relative_epsilon: Optional[str]):
+    rng1, rng2 = jax.random.split(rng)
+    x = jax.random.normal(rng1, (5, 3))
+    y = jax.random.normal(rng2, (7, 3)) + 1
+    geom = pointcloud.PointCloud(
+        x, y, epsilon=0.5, relative_epsilon=relative_epsilon
+    )
+
+    # the new epsilon is absolute, even if the geometry's is relative
+    new_geom = geom.set_epsilon(1e-2)
+
+    np.testing.assert_allclose(new_geom.epsilon, 1e-2, rtol=1e-6, atol=1e-6)
+    np.testing.assert_allclose(
+        new_geom.set_epsilon(new_geom.epsilon).epsilon, 1e-2, rtol=1e-6
+    )
+
+
+@pytest.mark.fast()
+class TestKernelStats:
+
+  @pytest.mark.parametrize("batch_size", [None, 8])
+  def test_track_stats(self, rng: jax.Array, batch_size: Optional[int]):
+    n, m, d = 13, 17, 3
+    rng1, rng2 = jax.random.split(rng)
+    x = jax.random.normal(rng1, (n, d))
+    y = jax.random.normal(rng2, (m, d))
+    geom = pointcloud.PointCloud(x, y, batch_size=batch_size)
+    f, g = jnp.zeros(n), jnp.zeros(m)
+
+    with geometry.track_stats() as outer:
+      with geometry.track_stats() as inner:
+        _ = geom.apply_lse_kernel(f, g, 1.0, axis=0)
+        _ = geom.apply_kernel(g, axis=1)
+      _ = geom.apply_cost(jnp.ones((n, 2)), axis=0)
+      # not counted, since the tracker is no longer active
+    _ = geom.apply_kernel(g, axis=1)
+
+    assert inner.stats[:3] == (1, 1, 0)
+    assert outer.stats[:3] == (1, 1, 1)
+    assert inner.stats.flops > 0.0
+    assert inner.stats.num_bytes > 0.0
+    if batch_size is None:
+      # the cost matrix is read once per evaluation
+      assert inner.stats.flops == 4 * n * m + 2 * n * m
+      assert inner.stats.num_bytes == 2 * 4 * (n * m + n + m)
+
+  def test_add(self):
+    stats = geometry.KernelStats.zeros()
+    other = geometry.KernelStats(1, 2, 3, 4.0, 5.0)
+
+    stats = stats.add(other).add(other, where=jnp.array(False))
+    stats = jax.jit(lambda s, w: s.add(other, where=w))(stats, True)
+
+    np.testing.assert_array_equal(stats, [2, 4, 6, 8.0, 10.0])
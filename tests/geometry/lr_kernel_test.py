@@ -6,7 +6,7 @@ import jax
 import jax.numpy as jnp
 import numpy as np
 
-from ott.geometry import costs, low_rank, pointcloud
+from ott.geometry import costs, geometry, low_rank, pointcloud
 from ott.solvers import linear
 
 
@@ -121,3 +121,138 @@ class TestLRCGeometry:
       np.testing.assert_array_equal(diff <= 0.0, True)
     except AssertionError:
       np.testing.assert_allclose(diff, 0.0, rtol=1e-2, atol=1e-2)
+
+
+class TestNystrom:
+
+  @pytest.mark.fast()
+  @pytest.mark.parametrize("landmarks", ["kmeans++", "leverage"])
+  def test_kernel_error(
+      self, rng: jax.Array, landmarks: Literal["kmeans++", "leverage"]
+  ):
+    rng1, rng2, rng_approx = jax.random.split(rng, 3)
+    x = jax.random.normal(rng1, (57, 3))
+    y = jax.random.normal(rng2, (64, 3)) + 0.5
+    cost_fn = costs.PNormP(1.5)
+
+    errors = []
+    for rank in [5, 20, 60]:
+      geom = low_rank.LRKGeometry.from_nystrom(
+          x,
+          y,
+          cost_fn=cost_fn,
+          epsilon=1.0,
+          rank=rank,
+          landmarks=landmarks,
+          nonnegative=False,
+          rng=rng_approx,
+      )
+      assert geom.rank == rank
+      errors.append(geom.kernel_error(x, y, cost_fn, rng=rng))
+
+    for err in errors:
+      # the residual of a positive definite kernel bounds the entries
+      assert err["max_abs_error"] <= err["max_diag_error"] + 1e-5
+    assert errors[-1]["rel_error"] < errors[0]["rel_error"]
+    assert errors[-1]["rel_error"] < 1e-1
+
+  @pytest.mark.parametrize(("epsilon", "rank", "rtol"), [(4.0, 40, 1e-2),
+                                                         (1.0, 80, 5e-2)])
+  def test_sinkhorn_approximation(
+      self, rng: jax.Array, epsilon: float, rank: int, rtol: float
+  ):
+    rng1, rng2 = jax.random.split(rng, 2)
+    x = jax.random.normal(rng1, (83, 2))
+    y = jax.random.normal(rng2, (96, 2)) + 1.0
+    solve_fn = jax.jit(lambda g: linear.solve(g, lse_mode=False))
+
+    geom = pointcloud.PointCloud(x, y, epsilon=epsilon)
+    gt_out = solve_fn(geom)
+    geom = low_rank.LRKGeometry.from_nystrom(
+        x, y, epsilon=epsilon, rank=rank, rng=rng
+    )
+    pred_out = solve_fn(geom)
+
+    assert geom.rank == rank + 1
+    # the approximation overestimates the kernel, up to round-off errors
+    assert jnp.min(geom.kernel_matrix) > -1e-5
+    assert pred_out.converged
+    np.testing.assert_allclose(
+        pred_out.reg_ot_cost, gt_out.reg_ot_cost, rtol=rtol, atol=1e-2
+    )
+
+
+class TestLogLRKGeometry:
+
+  @pytest.mark.fast()
+  def test_matches_positive_features(self, rng: jax.Array):
+    rng1, rng2, rng_approx = jax.random.split(rng, 3)
+    x = jax.random.normal(rng1, (21, 3))
+    y = jax.random.normal(rng2, (17, 3))
+
+    geom = low_rank.LRKGeometry.from_pointcloud(
+        x, y, kernel="gaussian", std=1.0, rank=16, rng=rng_approx
+    )
+    log_geom = low_rank.LogLRKGeometry.from_pointcloud(
+        x, y, epsilon=1.0, rank=16, rng=rng_approx
+    )
+
+    assert log_geom.rank == 16
+    np.testing.assert_allclose(
+        jnp.exp(log_geom.log_k1), geom.k1, rtol=1e-5, atol=1e-6
+    )
+    np.testing.assert_allclose(
+        log_geom.cost_matrix, geom.cost_matrix, rtol=1e-4, atol=1e-4
+    )
+
+  @pytest.mark.fast()
+  @pytest.mark.parametrize("axis", [0, 1])
+  @pytest.mark.parametrize("with_vec", [False, True])
+  def test_apply_lse_kernel(self, rng: jax.Array, axis: int, with_vec: bool):
+    rng1, rng2, rng_f, rng_g, rng_vec = jax.random.split(rng, 5)
+    x = jax.random.normal(rng1, (21, 3))
+    y = jax.random.normal(rng2, (17, 3))
+    f = jax.random.normal(rng_f, (21,))
+    g = jax.random.normal(rng_g, (17,))
+    vec = jax.random.normal(rng_vec, (21 if axis == 0 else 17,))
+    vec = vec if with_vec else None
+
+    log_geom = low_rank.LogLRKGeometry.from_pointcloud(
+        x, y, epsilon=1e-1, rank=8, rng=rng
+    )
+    cost = -1e-1 * jax.scipy.special.logsumexp(
+        log_geom.log_k1[:, None, :] + log_geom.log_k2[None, :, :], axis=-1
+    )
+    geom = geometry.Geometry(cost, epsilon=1e-1)
+
+    lse, sgn = log_geom.apply_lse_kernel(f, g, 1e-1, vec=vec, axis=axis)
+    expected_lse, expected_sgn = geom.apply_lse_kernel(
+        f, g, 1e-1, vec=vec, axis=axis
+    )
+
+    np.testing.assert_allclose(lse, expected_lse, rtol=1e-4, atol=1e-4)
+    np.testing.assert_array_equal(sgn, expected_sgn)
+
+  def test_small_epsilon(self, rng: jax.Array):
+    rng1, rng2 = jax.random.split(rng, 2)
+    x = jax.random.normal(rng1, (83, 3))
+    y = jax.random.normal(rng2, (96, 3)) + 1.0
+    epsilon = 1e-2
+    solve_fn = jax.jit(lambda g: linear.solve(g, lse_mode=True))
+
+    log_geom = low_rank.LogLRKGeometry.from_pointcloud(
+        x, y, epsilon=epsilon, rank=64, rng=rng
+    )
+    # the features underflow, making the kernel mode unusable
+    assert np.any(np.exp(log_geom.log_k1) == 0.0)
+
+    cost = -epsilon * jax.scipy.special.logsumexp(
+        log_geom.log_k1[:, None, :] + log_geom.log_k2[None, :, :], axis=-1
+    )
+    out = solve_fn(log_geom)
+    gt_out = solve_fn(geometry.Geometry(cost, epsilon=epsilon))
+
+    assert out.converged
+    np.testing.assert_allclose(
+        out.reg_ot_cost, gt_out.reg_ot_cost, rtol=1e-2, atol=1e-2
+    )
@@ -0,0 +1,131 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Optional, Tuple
+
+import pytest
+
+import jax
+import jax.numpy as jnp
+import jax.random as jr
+import numpy as np
+
+from ott.geometry import costs, neighbors, pointcloud
+from ott.problems.linear import linear_problem
+
+
+def _random_points(
+    rng: jax.Array, n: int, m: int, d: int
+) -> Tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray, jnp.ndarray]:
+  rng_x, rng_y, rng_g, rng_b = jr.split(rng, 4)
+  x = jr.normal(rng_x, (n, d))
+  y = jr.normal(rng_y, (m, d))
+  g = jr.normal(rng_g, (m,))
+  b = jr.uniform(rng_b, (m,)).at[np.array([0, 3])].set(0.0)
+  return x, y, g, b / b.sum()
+
+
+def _dense_argmin(
+    x: jnp.ndarray, y: jnp.ndarray, g: jnp.ndarray, b: jnp.ndarray,
+    cost_fn: costs.CostFn
+) -> jnp.ndarray:
+  cost = pointcloud.PointCloud(x, y, cost_fn=cost_fn).cost_matrix
+  return jnp.argmin(jnp.where(b[None, :] > 0.0, cost - g[None, :], jnp.inf), 1)
+
+
+class TestBruteForceIndex:
+
+  @pytest.mark.parametrize(
+      "cost_fn",
+      [costs.SqEuclidean(), costs.NegDotProduct()]
+  )
+  @pytest.mark.parametrize("batch_size", [None, 7])
+  def test_matches_dense(
+      self, rng: jax.Array, cost_fn: costs.CostFn, batch_size: Optional[int]
+  ):
+    x, y, g, b = _random_points(rng, n=23, m=41, d=3)
+    index = neighbors.BruteForceIndex(
+        y, g, b, cost_fn=cost_fn, batch_size=batch_size
+    )
+
+    f, ixs = jax.jit(lambda index, x: index.c_transform(x))(index, x)
+
+    np.testing.assert_array_equal(ixs, _dense_argmin(x, y, g, b, cost_fn))
+    assert np.all(b[ixs] > 0.0)
+    cost = pointcloud.PointCloud(x, y, cost_fn=cost_fn).cost_matrix
+    np.testing.assert_allclose(
+        f, cost[jnp.arange(23), ixs] - g[ixs], rtol=1e-5, atol=1e-5
+    )
+
+  @pytest.mark.parametrize("batch_size", [None, 8])
+  def test_top_k(self, rng: jax.Array, batch_size: Optional[int]):
+    x, y, g, _ = _random_points(rng, n=11, m=37, d=2)
+    index = neighbors.BruteForceIndex(y, g, batch_size=batch_size)
+
+    ixs = jax.jit(lambda index, x: index(x, k=5))(index, x)
+
+    cost = pointcloud.PointCloud(x, y).cost_matrix - g[None, :]
+    np.testing.assert_array_equal(ixs, jnp.argsort(cost, axis=1)[:, :5])
+
+  def test_hard_c_transform(self, rng: jax.Array):
+    x, y, g, b = _random_points(rng, n=13, m=29, d=2)
+    geom = pointcloud.PointCloud(x, y)
+    prob = linear_problem.LinearProblem(geom, b=b)
+    index = neighbors.BruteForceIndex(y, g, b, batch_size=8)
+
+    expected, _ = prob._c_transform(g, epsilon=0.0, axis=1)
+    actual, _ = prob._c_transform(None, epsilon=0.0, axis=1, index=index)
+
+    np.testing.assert_allclose(actual, expected, rtol=1e-5, atol=1e-5)
+    # the index only computes the hard c-transform
+    with pytest.raises(ValueError, match="hard c-transform"):
+      prob._c_transform(None, epsilon=1e-1, axis=1, index=index)
+    with pytest.raises(ValueError, match="hard c-transform"):
+      jax.jit(
+          lambda eps: prob._c_transform(None, epsilon=eps, axis=1, index=index)
+      )(0.0)
+    # the index holds the potential
+    with pytest.raises(ValueError, match="must be `None`"):
+      prob.potential_fn_from_dual_vec(g, axis=1, index=index)
+
+
+class TestIVFIndex:
+
+  @pytest.mark.parametrize(
+      "cost_fn",
+      [costs.SqEuclidean(), costs.NegDotProduct()]
+  )
+  def test_all_probes_is_exact(self, rng: jax.Array, cost_fn: costs.CostFn):
+    rng_points, rng_index = jr.split(rng, 2)
+    x, y, g, b = _random_points(rng_points, n=31, m=64, d=2)
+    index = neighbors.IVFIndex.build(
+        y, g, b, cost_fn=cost_fn, num_clusters=5, num_probes=5, rng=rng_index
+    )
+
+    ixs = jax.jit(lambda index, x: index(x))(index, x)
+
+    assert index.lists.shape[0] == index.num_probes
+    np.testing.assert_array_equal(ixs, _dense_argmin(x, y, g, b, cost_fn))
+
+  def test_recall(self, rng: jax.Array):
+    rng_points, rng_index = jr.split(rng, 2)
+    x, y, g, b = _random_points(rng_points, n=200, m=1024, d=2)
+    index = neighbors.IVFIndex.build(
+        y, g, b, num_clusters=32, num_probes=4, batch_size=64, rng=rng_index
+    )
+
+    ixs = index(x)
+
+    assert np.all(b[ixs] > 0.0)
+    recall = np.mean(ixs == _dense_argmin(x, y, g, b, costs.SqEuclidean()))
+    assert recall > 0.9
@@ -11,7 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Union
+from typing import Optional, Union
 
 import pytest
 
@@ -20,6 +20,7 @@ import jax.numpy as jnp
 import numpy as np
 
 from ott.geometry import costs, geometry, pointcloud
+from ott.solvers import linear
 
 
 class NonSymCost(costs.CostFn):
@@ -122,6 +123,93 @@ class TestPointCloudApply:
 
     np.testing.assert_allclose(actual, expected, rtol=1e-6, atol=1e-6)
 
+  @pytest.mark.parametrize("axis", [0, 1])
+  @pytest.mark.parametrize("cost_fn", [costs.SqEuclidean(), costs.Cosine()])
+  def test_tiled_online(self, rng: jax.Array, axis: int, cost_fn: costs.CostFn):
+    n, m, d, eps = 23, 17, 3, 1e-1
+    rngs = jax.random.split(rng, 4)
+    x = jax.random.normal(rngs[0], (n, d))
+    y = jax.random.normal(rngs[1], (m, d))
+    f = jax.random.normal(rngs[2], (n,))
+    g = jax.random.normal(rngs[3], (m,))
+    vec = f if axis == 0 else g
+
+    geom = pointcloud.PointCloud(x, y, cost_fn=cost_fn, batch_size=4)
+    # tile size does not divide `n` nor `m`
+    geom_tiled = pointcloud.PointCloud(
+        x, y, cost_fn=cost_fn, batch_size=4, tile_size=5
+    )
+
+    for v in [None, vec]:
+      res, sgn = geom.apply_lse_kernel(f, g, eps, vec=v, axis=axis)
+      res_tiled, sgn_tiled = geom_tiled.apply_lse_kernel(
+          f, g, eps, vec=v, axis=axis
+      )
+      np.testing.assert_allclose(res_tiled, res, rtol=1e-5, atol=1e-5)
+      np.testing.assert_array_equal(sgn_tiled, sgn)
+
+    np.testing.assert_allclose(
+        geom_tiled.apply_kernel(vec, axis=axis),
+        geom.apply_kernel(vec, axis=axis),
+        rtol=1e-5,
+        atol=1e-5
+    )
+    np.testing.assert_allclose(
+        geom_tiled.apply_cost(vec, axis=axis),
+        geom.apply_cost(vec, axis=axis),
+        rtol=1e-5,
+        atol=1e-5
+    )
+
+  def test_tiled_online_grad(self, rng: jax.Array):
+    rng1, rng2 = jax.random.split(rng, 2)
+    x = jax.random.normal(rng1, (13, 2))
+    y = jax.random.normal(rng2, (11, 2))
+    a = jnp.ones((13,)).at[-3:].set(0.0) / 10.0
+
+    def loss(x: jnp.ndarray, tile_size: Optional[int]) -> jnp.ndarray:
+      geom = pointcloud.PointCloud(
+          x, y, epsilon=1e-1, batch_size=4, tile_size=tile_size
+      )
+      return linear.solve(geom, a=a).reg_ot_cost
+
+    grad = jax.grad(loss)(x, None)
+    grad_tiled = jax.grad(loss)(x, 3)
+
+    assert np.all(np.isfinite(grad_tiled))
+    np.testing.assert_allclose(grad_tiled, grad, rtol=1e-4, atol=1e-4)
+
+  @pytest.mark.parametrize("tile_size", [None, 5])
+  def test_reduced_precision(self, rng: jax.Array, tile_size: Optional[int]):
+    n, m, d, eps = 23, 17, 3, 1e-1
+    rngs = jax.random.split(rng, 4)
+    x = jax.random.normal(rngs[0], (n, d))
+    y = jax.random.normal(rngs[1], (m, d))
+    f = jax.random.normal(rngs[2], (n,))
+    g = jax.random.normal(rngs[3], (m,))
+
+    geom = pointcloud.PointCloud(x, y, batch_size=4, tile_size=tile_size)
+    geom_bf16 = pointcloud.PointCloud(
+        x, y, batch_size=4, tile_size=tile_size, compute_dtype=jnp.bfloat16
+    )
+
+    assert geom.compute_dtype is None
+    assert geom_bf16.compute_dtype == jnp.bfloat16
+    assert geom_bf16.set_compute_dtype(None).compute_dtype is None
+    for axis in [0, 1]:
+      vec = f if axis == 0 else g
+      res, _ = geom.apply_lse_kernel(f, g, eps, axis=axis)
+      res_bf16, _ = geom_bf16.apply_lse_kernel(f, g, eps, axis=axis)
+      # accumulated in full precision
+      assert res_bf16.dtype == res.dtype
+      np.testing.assert_allclose(res_bf16, res, rtol=5e-2, atol=5e-2)
+      np.testing.assert_allclose(
+          geom_bf16.apply_kernel(vec, axis=axis),
+          geom.apply_kernel(vec, axis=axis),
+          rtol=5e-2,
+          atol=5e-2,
+      )
+
 
 class TestPointCloudCosineConversion:
 
@@ -0,0 +1,142 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import functools
+from typing import Optional, Tuple
+
+import pytest
+
+import jax
+import jax.numpy as jnp
+import jax.sharding as jsh
+import numpy as np
+
+from ott.geometry import pointcloud, sharded
+from ott.solvers import linear
+
+# to emulate several devices on CPU, run the tests with
+# `XLA_FLAGS=--xla_force_host_platform_device_count=8`
+
+
+def _mesh() -> Tuple[jsh.Mesh, Tuple[int, int]]:
+  num_devices = jax.device_count()
+  shape = (2, num_devices // 2) if num_devices % 2 == 0 else (num_devices, 1)
+  return jax.make_mesh(shape, ("x", "y")), shape
+
+
+class TestShardedPointCloud:
+
+  @pytest.fixture(autouse=True)
+  def initialize(self, rng: jax.Array):
+    mesh, (num_x, num_y) = _mesh()
+    rngs = jax.random.split(rng, 5)
+    self.mesh = mesh
+    self.n, self.m, self.dim = 8 * num_x, 6 * num_y, 3
+    self.x = jax.random.normal(rngs[0], (self.n, self.dim))
+    self.y = jax.random.normal(rngs[1], (self.m, self.dim)) + 0.5
+    self.f = jax.random.normal(rngs[2], (self.n,))
+    self.g = jax.random.normal(rngs[3], (self.m,))
+    self.vec = jax.random.normal(rngs[4], (self.n,))
+
+  @pytest.mark.fast.with_args(
+      axes=[("x", "y"), ("x", None), (None, "y")], only_fast=0
+  )
+  def test_apply(self, axes: Tuple[Optional[str], Optional[str]]):
+    x_axis, y_axis = axes
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=1e-1)
+    geom_sh = sharded.ShardedPointCloud(
+        self.x,
+        self.y,
+        mesh=self.mesh,
+        x_axis=x_axis,
+        y_axis=y_axis,
+        epsilon=1e-1,
+    )
+
+    for axis in [0, 1]:
+      vec = self.vec if axis == 0 else self.g
+      apply_lse_kernel = jax.jit(
+          functools.partial(geom_sh.apply_lse_kernel, eps=1e-1, axis=axis)
+      )
+      res, sgn = apply_lse_kernel(self.f, self.g, vec=vec)
+      expected, expected_sgn = geom.apply_lse_kernel(
+          self.f, self.g, 1e-1, vec=vec, axis=axis
+      )
+      np.testing.assert_allclose(res, expected, rtol=1e-4, atol=1e-4)
+      np.testing.assert_array_equal(sgn, expected_sgn)
+      np.testing.assert_allclose(
+          geom_sh.apply_lse_kernel(self.f, self.g, 1e-1, axis=axis)[0],
+          geom.apply_lse_kernel(self.f, self.g, 1e-1, axis=axis)[0],
+          rtol=1e-4,
+          atol=1e-4,
+      )
+      np.testing.assert_allclose(
+          geom_sh.apply_kernel(jnp.abs(vec), axis=axis),
+          geom.apply_kernel(jnp.abs(vec), axis=axis),
+          rtol=1e-4,
+          atol=1e-4,
+      )
+      np.testing.assert_allclose(
+          geom_sh.apply_cost(vec, axis=axis),
+          geom.apply_cost(vec, axis=axis),
+          rtol=1e-4,
+          atol=1e-4,
+      )
+
+    apply_lse_kernel = jax.jit(
+        functools.partial(geom_sh.apply_lse_kernel, eps=1e-1, axis=1)
+    )
+    res, _ = apply_lse_kernel(self.f, self.g)
+    assert res.sharding.is_equivalent_to(geom_sh.sharding(axis=1), res.ndim)
+
+  @pytest.mark.fast.with_args(lse_mode=[True, False], only_fast=0)
+  def test_sinkhorn(self, lse_mode: bool):
+    geom = pointcloud.PointCloud(
+        self.x, self.y, epsilon=1e-1, scale_cost="mean"
+    )
+    geom_sh = sharded.ShardedPointCloud(
+        self.x,
+        self.y,
+        mesh=self.mesh,
+        x_axis="x",
+        y_axis="y",
+        epsilon=1e-1,
+        scale_cost="mean",
+    )
+
+    out = jax.jit(
+        linear.solve, static_argnames="lse_mode"
+    )(geom_sh, lse_mode=lse_mode)
+    expected = linear.solve(geom, lse_mode=lse_mode)
+
+    assert out.converged
+    # the potentials stay partitioned like their points
+    assert out.f.sharding.is_equivalent_to(geom_sh.sharding(axis=1), 1)
+    assert out.g.sharding.is_equivalent_to(geom_sh.sharding(axis=0), 1)
+    np.testing.assert_allclose(out.f, expected.f, rtol=1e-4, atol=1e-4)
+    np.testing.assert_allclose(out.g, expected.g, rtol=1e-4, atol=1e-4)
+    np.testing.assert_allclose(
+        out.reg_ot_cost, expected.reg_ot_cost, rtol=1e-5, atol=1e-5
+    )
+
+  def test_pytree(self):
+    geom_sh = sharded.ShardedPointCloud(
+        self.x, self.y, mesh=self.mesh, x_axis="x", y_axis="y", epsilon=1e-1
+    )
+    leaves, treedef = jax.tree.flatten(geom_sh)
+    geom_sh2 = jax.tree.unflatten(treedef, leaves)
+
+    assert isinstance(geom_sh2, sharded.ShardedPointCloud)
+    assert geom_sh2.mesh == self.mesh
+    assert geom_sh2.x_axis == "x"
+    assert geom_sh2.y_axis == "y"
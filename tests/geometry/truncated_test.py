@@ -0,0 +1,161 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Optional
+
+import pytest
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from ott.geometry import geometry, pointcloud, truncated
+from ott.solvers import linear
+
+
+class TestTruncatedGeometry:
+
+  @pytest.fixture(autouse=True)
+  def initialize(self, rng: jax.Array):
+    rngs = jax.random.split(rng, 4)
+    self.n, self.m, self.dim = 17, 13, 2
+    self.x = jax.random.normal(rngs[0], (self.n, self.dim))
+    self.y = jax.random.normal(rngs[1], (self.m, self.dim)) + 0.5
+    self.f = jax.random.normal(rngs[2], (self.n,))
+    self.g = jax.random.normal(rngs[3], (self.m,))
+
+  @pytest.mark.fast.with_args(batch_size=[None, 4], only_fast=0)
+  def test_no_truncation(self, batch_size: Optional[int]):
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=1e-1)
+    geom_trunc = truncated.TruncatedGeometry.from_geometry(
+        geom,
+        threshold=jnp.inf,
+        max_per_line=max(self.n, self.m),
+        batch_size=batch_size,
+    )
+
+    assert geom_trunc.shape == geom.shape
+    assert geom_trunc.num_pairs == self.n * self.m
+    np.testing.assert_allclose(
+        geom_trunc.cost_matrix, geom.cost_matrix, rtol=1e-5, atol=1e-5
+    )
+    for axis in [0, 1]:
+      vec = self.g if axis == 1 else self.f
+      np.testing.assert_allclose(
+          geom_trunc.apply_lse_kernel(self.f, self.g, 1e-1, axis=axis)[0],
+          geom.apply_lse_kernel(self.f, self.g, 1e-1, axis=axis)[0],
+          rtol=1e-4,
+          atol=1e-4,
+      )
+      np.testing.assert_allclose(
+          geom_trunc.apply_lse_kernel(self.f, self.g, 1e-1, vec=vec,
+                                      axis=axis)[0],
+          geom.apply_lse_kernel(self.f, self.g, 1e-1, vec=vec, axis=axis)[0],
+          rtol=1e-4,
+          atol=1e-4,
+      )
+      np.testing.assert_allclose(
+          geom_trunc.apply_kernel(vec, axis=axis),
+          geom.apply_kernel(vec, axis=axis),
+          rtol=1e-4,
+          atol=1e-4,
+      )
+      np.testing.assert_allclose(
+          geom_trunc.apply_cost(vec, axis=axis),
+          geom.apply_cost(vec, axis=axis),
+          rtol=1e-4,
+          atol=1e-4,
+      )
+
+  @pytest.mark.fast()
+  def test_truncation(self):
+    epsilon, threshold = 1e-2, 5.0
+    geom = geometry.Geometry(
+        pointcloud.PointCloud(self.x, self.y).cost_matrix, epsilon=epsilon
+    )
+    geom_trunc = truncated.TruncatedGeometry.from_geometry(
+        geom, self.f, self.g, threshold=threshold, max_per_line=self.n
+    )
+
+    red = geom.cost_matrix - self.f[:, None] - self.g[None, :]
+    expected = jnp.logical_or(
+        red - jnp.min(red, axis=1, keepdims=True) <= threshold * epsilon,
+        red - jnp.min(red, axis=0, keepdims=True) <= threshold * epsilon,
+    )
+
+    assert geom_trunc.nse == 2 * self.n * self.m
+    assert geom_trunc.num_pairs == jnp.sum(expected)
+    np.testing.assert_array_equal(
+        jnp.isfinite(geom_trunc.cost_matrix), expected
+    )
+
+  @pytest.mark.fast()
+  def test_subset(self):
+    row_ixs, col_ixs = jnp.array([5, 0, 11, 3]), jnp.array([7, 2, 9])
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=1e-1)
+    geom_trunc = truncated.TruncatedGeometry.from_geometry(
+        geom, self.f, self.g, threshold=2.0, max_per_line=4
+    )
+
+    geom_sub = geom_trunc.subset(row_ixs, col_ixs)
+
+    assert isinstance(geom_sub, truncated.TruncatedGeometry)
+    assert geom_sub.shape == (len(row_ixs), len(col_ixs))
+    assert geom_sub.nse == geom_trunc.nse
+    np.testing.assert_array_equal(
+        geom_sub.cost_matrix,
+        geom_trunc.cost_matrix[row_ixs][:, col_ixs],
+    )
+    np.testing.assert_array_equal(
+        geom_trunc.subset(row_ixs=row_ixs).cost_matrix,
+        geom_trunc.cost_matrix[row_ixs],
+    )
+
+  def test_pytree(self):
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=1e-1)
+    geom_trunc = truncated.TruncatedGeometry.from_geometry(geom, max_per_line=4)
+
+    leaves, treedef = jax.tree.flatten(geom_trunc)
+    geom_trunc2 = jax.tree.unflatten(treedef, leaves)
+
+    assert isinstance(geom_trunc2, truncated.TruncatedGeometry)
+    np.testing.assert_array_equal(
+        geom_trunc2.cost_matrix, geom_trunc.cost_matrix
+    )
+    np.testing.assert_allclose(geom_trunc2.epsilon, geom.epsilon)
+
+
+class TestSolveTruncated:
+
+  @pytest.mark.fast.with_args(batch_size=[None, 5], only_fast=0)
+  def test_matches_dense(self, rng: jax.Array, batch_size: Optional[int]):
+    rng1, rng2 = jax.random.split(rng)
+    x = jax.random.normal(rng1, (32, 2))
+    y = jax.random.normal(rng2, (27, 2)) + 0.5
+    geom = pointcloud.PointCloud(x, y, epsilon=1e-2, batch_size=batch_size)
+
+    out = jax.jit(
+        linear.solve_truncated,
+        static_argnames=["num_rebuilds", "max_per_line"]
+    )(geom, num_rebuilds=3, threshold=50.0, max_per_line=16)
+    expected = linear.solve(geom, max_iterations=10_000)
+
+    assert isinstance(out.geom, truncated.TruncatedGeometry)
+    assert out.geom.num_pairs < geom.shape[0] * geom.shape[1]
+    assert out.converged
+    np.testing.assert_allclose(
+        out.reg_ot_cost, expected.reg_ot_cost, rtol=1e-3, atol=1e-3
+    )
+    np.testing.assert_allclose(
+        out.matrix, expected.matrix, rtol=1e-3, atol=1e-3
+    )
@@ -198,3 +198,81 @@ class TestSinkhornInitializers:
       assert default_out.n_iters > init_out.n_iters
     else:
       assert default_out.n_iters >= init_out.n_iters
+
+
+class TestWarmStartInitializer:
+
+  @pytest.mark.fast.with_args(lse_mode=[True, False], only_fast=0)
+  def test_warm_start(self, rng: jax.Array, lse_mode: bool):
+    rng1, rng2 = jax.random.split(rng)
+    n, m, d = 30, 25, 2
+    # the kernel underflows at small epsilon, given the scale of the costs
+    epsilon = 5e-2 if lse_mode else 2.0
+    prob = create_ot_problem(rng1, n, m, d, epsilon=epsilon)
+    # slightly perturbed problem, with fewer points
+    x = prob.geom.x[:-3] + 1e-2 * jax.random.normal(rng2, (n - 3, d))
+    geom = pointcloud.PointCloud(x, prob.geom.y, epsilon=epsilon)
+    new_prob = linear_problem.LinearProblem(geom)
+
+    cache = linear_init.PotentialCache.create(
+        capacity=2, max_n=n, max_m=m, dim=d
+    )
+    solver = sinkhorn.Sinkhorn(
+        lse_mode=lse_mode, initializer=linear_init.WarmStartInitializer()
+    )
+
+    @jax.jit
+    def step(
+        cache: linear_init.PotentialCache, key: int,
+        prob: linear_problem.LinearProblem
+    ):
+      out = solver(prob, cache=cache, key=key)
+      return out, cache.update(key, prob, out.f, out.g)
+
+    out, cache = step(cache, 3, prob)
+    cold, cache = step(cache, 7, new_prob)
+    warm, cache = step(cache, 3, new_prob)
+
+    assert out.converged
+    assert cold.converged
+    assert warm.converged
+    if lse_mode:
+      assert warm.n_iters < cold.n_iters
+    else:
+      assert warm.n_iters <= cold.n_iters
+    np.testing.assert_allclose(
+        warm.reg_ot_cost, cold.reg_ot_cost, rtol=1e-3, atol=1e-3
+    )
+
+  def test_lru_eviction(self, rng: jax.Array):
+    n, m, d = 10, 12, 2
+    prob = create_ot_problem(rng, n, m, d)
+    f, g = jnp.zeros(n), jnp.zeros(m)
+    cache = linear_init.PotentialCache.create(
+        capacity=2, max_n=n, max_m=m, dim=d
+    )
+
+    cache = cache.update(0, prob, f, g)
+    cache = cache.update(1, prob, f, g)
+    cache = cache.update(0, prob, f, g)
+    # key 1 is the least recently updated
+    cache = cache.update(2, prob, f, g)
+
+    assert cache.lookup(0)[0]
+    assert not cache.lookup(1)[0]
+    assert cache.lookup(2)[0]
+
+  def test_no_cache(self, rng: jax.Array):
+    prob = create_ot_problem(rng, 10, 12, 2)
+    init = linear_init.WarmStartInitializer()
+    cache = linear_init.PotentialCache.create(
+        capacity=1, max_n=10, max_m=12, dim=2
+    )
+
+    f, g = init(prob, lse_mode=True)
+    f_miss, g_miss = init(prob, lse_mode=True, cache=cache, key=0)
+
+    np.testing.assert_array_equal(f, 0.0)
+    np.testing.assert_array_equal(g, 0.0)
+    np.testing.assert_array_equal(f_miss, f)
+    np.testing.assert_array_equal(g_miss, g)
@@ -13,6 +13,8 @@
 # limitations under the License.
 from typing import Iterable, Tuple
 
+import pytest
+
 import jax
 import jax.random as jr
 import jax.sharding as jsh
@@ -66,3 +68,92 @@ class TestLinearOtDataloader:
 
     assert src.sharding == sharding
     assert tgt.sharding == sharding
+
+  def test_prefetch(self, rng: jax.Array):
+    rng_ds, rng_dl = jr.split(rng, 2)
+    shape = (16, 2)
+
+    ds = [next(_get_dataset(jr.fold_in(rng_ds, i), shape)) for i in range(5)]
+    dl = ot_dataloader.LinearOTDataloader(rng_dl, ds)
+    dl_prefetch = ot_dataloader.LinearOTDataloader(rng_dl, ds, prefetch_size=2)
+
+    batches = list(dl)
+    batches_prefetch = list(dl_prefetch)
+
+    assert len(batches_prefetch) == len(ds)
+    for (src, tgt), (src_p, tgt_p) in zip(batches, batches_prefetch):
+      np.testing.assert_array_equal(src, src_p)
+      np.testing.assert_array_equal(tgt, tgt_p)
+    # restarting the iteration stops the previous prefetching thread
+    src, tgt = next(iter(dl_prefetch))
+    np.testing.assert_array_equal(src, batches[0][0])
+    dl_prefetch.close()
+
+  def test_prefetch_error(self, rng: jax.Array):
+    rng_ds, rng_dl = jr.split(rng, 2)
+    shape = (16, 2)
+
+    def dataset() -> Iterable[Tuple[jax.Array, jax.Array]]:
+      yield next(_get_dataset(rng_ds, shape))
+      raise ValueError("Corrupted batch.")
+
+    dl = ot_dataloader.LinearOTDataloader(rng_dl, dataset(), prefetch_size=2)
+    it = iter(dl)
+
+    # the error is raised in the consumer, after the previous batches
+    src, _ = next(it)
+    assert src.shape == shape
+    with pytest.raises(ValueError, match="Corrupted batch."):
+      next(it)
+    dl.close()
+
+  def test_warm_start(self, rng: jax.Array):
+    rng_ds, rng_dl = jr.split(rng, 2)
+    shape = (64, 2)
+    num_batches = 5
+
+    # the potentials are non-trivial only if the distributions differ
+    ds = []
+    for i in range(num_batches):
+      x, y = next(_get_dataset(jr.fold_in(rng_ds, i), shape))
+      ds.append((x, 0.5 * y + 2.0))
+    kwargs = {"epsilon": 1e-1, "threshold": 1e-3, "max_iterations": 2000}
+    dl = ot_dataloader.LinearOTDataloader(rng_dl, ds, **kwargs)
+    dl_warm = ot_dataloader.LinearOTDataloader(
+        rng_dl, ds, warm_start=True, **kwargs
+    )
+
+    _ = list(dl)
+    _ = list(dl_warm)
+    n_iters = np.asarray(jax.device_get(dl.n_iters))
+    n_iters_warm = np.asarray(jax.device_get(dl_warm.n_iters))
+
+    assert n_iters.shape == (num_batches,)
+    assert n_iters_warm.shape == (num_batches,)
+    # the cold solves converge
+    assert np.all(n_iters < kwargs["max_iterations"])
+    # the first batch is solved from scratch
+    assert n_iters_warm[0] == n_iters[0]
+    assert n_iters_warm[1:].sum() < n_iters[1:].sum()
+
+  @pytest.mark.parametrize("replace", [False, True])
+  def test_batch_size(self, rng: jax.Array, replace: bool):
+    rng_ds, rng_dl = jr.split(rng, 2)
+    shape = (32, 2)
+
+    ds = _get_dataset(rng_ds, shape)
+    dl = ot_dataloader.LinearOTDataloader(
+        rng_dl, ds, replace=replace, batch_size=7
+    )
+
+    src, tgt = next(iter(dl))
+    x, y = next(_get_dataset(rng_ds, shape))
+
+    assert src.shape == shape
+    assert tgt.shape == shape
+    if not replace:
+      pairs = {(tuple(s), tuple(t)) for s, t in zip(src.tolist(), tgt.tolist())}
+      assert len(pairs) == shape[0]
+    # all samples are points of the batch
+    assert np.all(np.isin(np.asarray(src[:, 0]), np.asarray(x[:, 0])))
+    assert np.all(np.isin(np.asarray(tgt[:, 0]), np.asarray(y[:, 0])))
@@ -60,6 +60,22 @@ class TestSemidiscreteDataloader:
     np.testing.assert_array_equal(src1, src2)
     np.testing.assert_array_equal(tgt1, tgt2)
 
+  def test_prefetch(self, rng: jax.Array):
+    m, d = 19, 2
+    rng_solve, rng_dl = jr.split(rng, 2)
+    out = _solve_semidiscrete(rng_solve, shape=(m, d), epsilon=0.1)
+    dl = iter(sddl.SemidiscreteDataloader(rng_dl, out, batch_size=8))
+    dl_prefetch = iter(
+        sddl.SemidiscreteDataloader(rng_dl, out, batch_size=8, prefetch_size=3)
+    )
+
+    for _ in range(5):
+      src, tgt = next(dl)
+      src_p, tgt_p = next(dl_prefetch)
+      np.testing.assert_array_equal(src, src_p)
+      np.testing.assert_array_equal(tgt, tgt_p)
+    dl_prefetch.close()
+
   def test_invalid_values(self, rng: jax.Array):
     m, d = 15, 5
     rng_solve, rng_dl = jr.split(rng, 2)
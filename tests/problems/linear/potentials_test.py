@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from typing import Optional
+
 import lineax as lx
 
 import pytest
@@ -290,3 +292,94 @@ class TestDualPotentials:
     np.testing.assert_allclose(
         expected, jnp.vdot(delta, grad_matrix), rtol=1e-2, atol=1e-2
     )
+
+
+class TestEntropicPotentials:
+
+  @pytest.mark.parametrize(("cost_fn", "batch_size"),
+                           [(costs.SqEuclidean(), None),
+                            (costs.SqEuclidean(), 7), (costs.PNormP(1.5), 7)])
+  def test_matches_dual_potentials(
+      self, rng: jax.Array, cost_fn: costs.CostFn, batch_size: Optional[int]
+  ):
+    rng_x, rng_y, rng_z = jax.random.split(rng, 3)
+    x = jax.random.normal(rng_x, (31, 2))
+    y = jax.random.normal(rng_y, (23, 2)) + 1.0
+    z = jax.random.normal(rng_z, (17, 2))
+    geom = pointcloud.PointCloud(x, y, cost_fn=cost_fn, epsilon=1e-1)
+    out = sinkhorn.Sinkhorn()(linear_problem.LinearProblem(geom))
+
+    dual_pots = out.to_dual_potentials()
+    pots = out.to_entropic_potentials(batch_size=batch_size)
+
+    f, g = jax.jit(lambda pots, z: (pots(z), pots(z, forward=False)))(pots, z)
+    np.testing.assert_allclose(
+        f, jax.vmap(dual_pots.f)(z), rtol=1e-4, atol=1e-4
+    )
+    np.testing.assert_allclose(
+        g, jax.vmap(dual_pots.g)(z), rtol=1e-4, atol=1e-4
+    )
+    for forward in [True, False]:
+      np.testing.assert_allclose(
+          pots.transport(z, forward=forward),
+          dual_pots.transport(z, forward=forward),
+          rtol=1e-4,
+          atol=1e-4,
+      )
+
+  def test_top_k(self, rng: jax.Array):
+    rng_x, rng_y, rng_z = jax.random.split(rng, 3)
+    x = jax.random.normal(rng_x, (32, 2))
+    y = jax.random.normal(rng_y, (64, 2))
+    z = jax.random.normal(rng_z, (10, 2))
+    geom = pointcloud.PointCloud(x, y, epsilon=1e-2)
+    out = sinkhorn.Sinkhorn()(linear_problem.LinearProblem(geom))
+
+    pots = out.to_entropic_potentials()
+    pots_all = out.to_entropic_potentials(top_k=64)
+    pots_k = out.to_entropic_potentials(top_k=8)
+
+    np.testing.assert_allclose(pots_all(z), pots(z), rtol=1e-5, atol=1e-5)
+    # dropping terms of the log-sum-exp increases the potential
+    np.testing.assert_array_less(pots(z), pots_k(z) + 1e-5)
+    np.testing.assert_allclose(
+        pots_k.transport(z), pots.transport(z), rtol=1e-2, atol=1e-2
+    )
+
+  @pytest.mark.parametrize("approximate", [False, True])
+  def test_with_index(self, rng: jax.Array, approximate: bool):
+    rng_x, rng_y, rng_z = jax.random.split(rng, 3)
+    x = jax.random.normal(rng_x, (32, 2))
+    y = jax.random.normal(rng_y, (64, 2))
+    z = jax.random.normal(rng_z, (10, 2))
+    geom = pointcloud.PointCloud(x, y, epsilon=1e-2)
+    out = sinkhorn.Sinkhorn()(linear_problem.LinearProblem(geom))
+    pots = out.to_entropic_potentials(top_k=8)
+    kwargs = {"num_clusters": 4, "num_probes": 4} if approximate else {}
+
+    pots_index = pots.with_index(approximate=approximate, **kwargs)
+    f = jax.jit(lambda pots, z: pots(z))(pots_index, z)
+
+    np.testing.assert_allclose(f, pots(z), rtol=1e-5, atol=1e-5)
+    np.testing.assert_allclose(
+        pots_index.transport(z), pots.transport(z), rtol=1e-4, atol=1e-4
+    )
+
+  def test_error_bound(self, rng: jax.Array):
+    rng_x, rng_y, rng_z = jax.random.split(rng, 3)
+    x = jax.random.normal(rng_x, (32, 2))
+    y = jax.random.normal(rng_y, (64, 2))
+    z = jax.random.normal(rng_z, (10, 2))
+    geom = pointcloud.PointCloud(x, y, epsilon=1e-1)
+    out = sinkhorn.Sinkhorn()(linear_problem.LinearProblem(geom))
+    pots = out.to_entropic_potentials()
+
+    for top_k in [1, 8, 32]:
+      pots_k = out.to_entropic_potentials(top_k=top_k).with_index()
+      bound = pots_k.error_bound(z)
+      # fraction of the mass of the log-sum-exp left out by the truncation
+      left_out = -jnp.expm1((pots(z) - pots_k(z)) / pots.epsilon)
+
+      assert np.all(bound < 1.0)
+      np.testing.assert_array_less(left_out, bound + 1e-5)
+    np.testing.assert_array_equal(pots.error_bound(z), 0.0)
@@ -0,0 +1,100 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Any, Optional
+
+import pytest
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from ott.geometry import geometry, pointcloud
+from ott.solvers import linear
+from ott.solvers.linear import sinkhorn
+
+
+class TestBucketedSolve:
+
+  @pytest.fixture(autouse=True)
+  def initialize(self, rng: jax.Array):
+    rngs = jax.random.split(rng, 4)
+    self.n, self.m, self.dim = 23, 17, 3
+    self.x = jax.random.normal(rngs[0], (self.n, self.dim))
+    self.y = jax.random.normal(rngs[1], (self.m, self.dim)) + 0.5
+    self.a = jax.random.uniform(rngs[2], (self.n,)) + 0.1
+    self.b = jax.random.uniform(rngs[3], (self.m,)) + 0.1
+    self.a = self.a / self.a.sum()
+    self.b = self.b / self.b.sum()
+
+  @pytest.mark.fast.with_args(tau_a=[1.0, 0.9], epsilon=[None, 1e-1])
+  def test_matches_solve(self, tau_a: float, epsilon: Optional[float]):
+    solve = linear.bucketed_solve(buckets=(8, 32), tau_a=tau_a)
+    out = solve(self.x, self.y, self.a, self.b, epsilon=epsilon)
+
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=epsilon)
+    expected = linear.solve(geom, self.a, self.b, tau_a=tau_a)
+
+    assert out.converged
+    assert out.f.shape == (self.n,)
+    assert out.g.shape == (self.m,)
+    assert out.matrix.shape == (self.n, self.m)
+    np.testing.assert_allclose(
+        out.ot_prob.geom.epsilon, geom.epsilon, rtol=1e-6
+    )
+    np.testing.assert_allclose(out.f, expected.f, rtol=1e-4, atol=1e-4)
+    np.testing.assert_allclose(out.g, expected.g, rtol=1e-4, atol=1e-4)
+    np.testing.assert_allclose(
+        out.matrix, expected.matrix, rtol=1e-4, atol=1e-4
+    )
+    np.testing.assert_allclose(
+        out.reg_ot_cost, expected.reg_ot_cost, rtol=1e-4, atol=1e-4
+    )
+
+  @pytest.mark.parametrize("relative_epsilon", ["mean", "std"])
+  def test_relative_epsilon(self, relative_epsilon: str):
+    geom_kwargs = {"relative_epsilon": relative_epsilon}
+    solve = linear.bucketed_solve(buckets=(8, 32), geom_kwargs=geom_kwargs)
+    out = solve(self.x, self.y, self.a, self.b, epsilon=5e-2)
+
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=5e-2, **geom_kwargs)
+    expected = linear.solve(geom, self.a, self.b)
+
+    np.testing.assert_allclose(
+        out.ot_prob.geom.epsilon, geom.epsilon, rtol=1e-6
+    )
+    np.testing.assert_allclose(
+        out.reg_ot_cost, expected.reg_ot_cost, rtol=1e-4, atol=1e-4
+    )
+
+  def test_reuses_executable(self):
+    num_traces = 0
+
+    def solve_fn(
+        geom: geometry.Geometry, a: jnp.ndarray, b: jnp.ndarray, **kwargs: Any
+    ) -> sinkhorn.SinkhornOutput:
+      nonlocal num_traces
+      num_traces += 1
+      return linear.solve(geom, a, b, **kwargs)
+
+    solve = linear.bucketed_solve(solve_fn, buckets=(16, 32), threshold=1e-2)
+    for n, m in [(10, 12), (16, 3), (5, 16)]:
+      out = solve(self.x[:n], self.y[:m], epsilon=1e-1)
+      assert out.matrix.shape == (n, m)
+    assert num_traces == 1
+
+    # larger than the last bucket, padded to 64 points
+    x = jnp.tile(self.x, (2, 1))
+    out = solve(x, x, epsilon=1e-1)
+    assert out.matrix.shape == (2 * self.n, 2 * self.n)
+    assert num_traces == 2
@@ -20,6 +20,7 @@ import jax
 import jax.numpy as jnp
 import numpy as np
 
+from ott import utils
 from ott.geometry import costs, segment
 from ott.problems.linear import barycenter_problem
 from ott.solvers.linear import continuous_barycenter as cb
@@ -195,6 +196,33 @@ class TestBarycenter:
     # Check the costs vector is non-increasing
     assert jnp.all(jnp.diff(out.costs_along_iterations) <= 0.0)
 
+  def test_telemetry(self, rng: jax.Array):
+    rng1, rng2 = jax.random.split(rng, 2)
+    y = jnp.concatenate((
+        jax.random.uniform(rng1, (20, self.DIM)),
+        jax.random.uniform(rng2, (20, self.DIM)) + 2.0,
+    ))
+    b = jnp.ones(40) / 20.0
+    bar_prob = barycenter_problem.FreeBarycenterProblem(
+        y, b, epsilon=1e-1, num_per_segment=(20, 20)
+    )
+
+    with utils.Telemetry() as tel:
+      solver = cb.FreeWassersteinBarycenter(
+          sinkhorn.Sinkhorn(),
+          min_iterations=5,
+          max_iterations=5,
+          telemetry=tel
+      )
+      out = jax.jit(solver, static_argnums=1)(bar_prob, 10)
+
+    records = tel.drain()
+    assert [r["iteration"] for r in records] == list(range(5))
+    assert all(r["solver"] == "FreeWassersteinBarycenter" for r in records)
+    np.testing.assert_allclose([r["cost"] for r in records],
+                               out.costs,
+                               rtol=1e-5)
+
   @pytest.mark.fast()
   def test_bures_barycenter(
       self,
@@ -14,7 +14,9 @@
 import pytest
 
 import jax.numpy as jnp
+import numpy as np
 
+from ott import utils
 from ott.geometry import grid, pointcloud
 from ott.problems.linear import barycenter_problem as bp
 from ott.solvers.linear import discrete_barycenter as db
@@ -64,6 +66,32 @@ class TestDiscreteBarycenter:
     err = errors[jnp.isfinite(errors)][-1]
     assert threshold > err
 
+  def test_telemetry(self):
+    n = 30
+    x = jnp.linspace(0.0, 1.0, n)[:, None]
+    a = jnp.stack((
+        jnp.exp(-(x[:, 0] - 0.2) ** 2 / 0.01),
+        jnp.exp(-(x[:, 0] - 0.8) ** 2 / 0.01),
+    )) + 1e-10
+    a = a / jnp.sum(a, axis=1, keepdims=True)
+    geom = pointcloud.PointCloud(x, epsilon=1e-2)
+    fixed_bp = bp.FixedBarycenterProblem(geom, a=a)
+
+    with utils.Telemetry() as tel:
+      solver = db.FixedBarycenter(
+          threshold=-1.0, inner_iterations=5, max_iterations=20, telemetry=tel
+      )
+      out = solver(fixed_bp)
+
+    records = tel.drain()
+    assert [r["evaluation"] for r in records] == [0, 1, 2, 3]
+    assert [r["iteration"] for r in records] == [4, 9, 14, 19]
+    assert all(r["solver"] == "FixedBarycenter" for r in records)
+    np.testing.assert_allclose([r["error"] for r in records],
+                               out.errors[:4, 0],
+                               rtol=1e-5)
+    np.testing.assert_allclose([r["epsilon"] for r in records], 1e-2)
+
   @pytest.mark.parametrize(("lse_mode", "epsilon"), [(True, 1e-3),
                                                      (False, 1e-2)],
                            ids=["lse", "scale"])
@@ -23,6 +23,7 @@ import numpy as np
 
 import optax
 
+from ott import utils
 from ott.geometry import costs
 from ott.geometry import semidiscrete_pointcloud as sdpc
 from ott.problems.linear import linear_problem
@@ -134,6 +135,35 @@ class TestSemidiscreteSolver:
     assert actual.out == expected
     assert actual.err == ""
 
+  def test_telemetry(self, rng: jax.Array):
+    rng_y, rng_solver = jr.split(rng, 2)
+    y = jr.normal(rng_y, (12, 2))
+    geom = sdpc.SemidiscretePointCloud(jr.normal, y, epsilon=1e-1)
+    prob = sdlp.SemidiscreteLinearProblem(geom)
+
+    with utils.Telemetry() as tel:
+      solver = semidiscrete.SemidiscreteSolver(
+          num_iterations=20,
+          batch_size=5,
+          error_eval_every=5,
+          error_num_repeats=4,
+          threshold=-1.0,
+          optimizer=optax.sgd(1e-1),
+          telemetry=tel,
+      )
+      out = jax.jit(solver)(rng_solver, prob)
+
+    records = tel.drain()
+    assert [r["evaluation"] for r in records] == [0, 1, 2, 3]
+    assert [r["iteration"] for r in records] == [4, 9, 14, 19]
+    assert all(r["solver"] == "SemidiscreteSolver" for r in records)
+    np.testing.assert_allclose([r["error"] for r in records],
+                               out.errors,
+                               rtol=1e-5)
+    np.testing.assert_allclose([r["loss"] for r in records],
+                               out.losses[4::5],
+                               rtol=1e-5)
+
   @pytest.mark.parametrize("epsilon", [0.0, 1e-2, None])
   def test_epsilon(self, rng: jax.Array, epsilon: Optional[float]):
     rng_prob, rng_solver, rng_sample = jr.split(rng, 3)
@@ -226,6 +256,36 @@ class TestSemidiscreteSolver:
     )
     np.testing.assert_array_equal(jnp.isfinite(out.losses), True)
 
+  @pytest.mark.parametrize("approximate", [False, True])
+  def test_sample_with_index(self, rng: jax.Array, approximate: bool):
+    rng_prob, rng_solver, rng_sample, rng_index = jr.split(rng, 4)
+    prob = _random_problem(rng_prob, m=32, d=3, epsilon=0.0)
+    solver = semidiscrete.SemidiscreteSolver(
+        num_iterations=10, batch_size=16, optimizer=optax.sgd(1e-1)
+    )
+    out = jax.jit(solver)(rng_solver, prob)
+    kwargs = {"num_clusters": 4, "num_probes": 4, "rng": rng_index}
+    kwargs = kwargs if approximate else {}
+    index = out.to_index(approximate, batch_size=8, **kwargs)
+
+    expected = out.sample(rng_sample, 50)
+    actual = out.sample(rng_sample, 50, index=index)
+
+    assert isinstance(actual, semidiscrete.HardAssignmentOutput)
+    np.testing.assert_array_equal(
+        actual.paired_indices, expected.paired_indices
+    )
+    np.testing.assert_allclose(actual.f, expected.f, rtol=1e-5, atol=1e-5)
+
+    x = jr.normal(rng_sample, (5, 3))
+    pot = out.to_dual_potentials(index=index)
+    np.testing.assert_allclose(
+        jax.vmap(pot.f)(x),
+        jax.vmap(out.to_dual_potentials().f)(x),
+        rtol=1e-5,
+        atol=1e-5,
+    )
+
   @pytest.mark.parametrize(("n", "epsilon"), [(17, 0.0), (20, 1e-3),
                                               (35, None)])
   def test_output(self, rng: jax.Array, n: int, epsilon: Optional[float]):
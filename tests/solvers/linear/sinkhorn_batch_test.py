@@ -0,0 +1,95 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Optional
+
+import pytest
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from ott.geometry import pointcloud
+from ott.solvers import linear
+
+
+class TestSinkhornBatch:
+
+  @pytest.fixture(autouse=True)
+  def initialize(self, rng: jax.Array):
+    rngs = jax.random.split(rng, 3)
+    self.batch, self.n, self.m, self.dim = 7, 13, 11, 3
+    self.x = jax.random.normal(rngs[0], (self.batch, self.n, self.dim))
+    self.y = jax.random.normal(rngs[1], (self.batch, self.m, self.dim))
+    # problems of increasing difficulty
+    self.y = self.y + jnp.linspace(0.0, 2.0, self.batch)[:, None, None]
+    self.b = jax.random.uniform(rngs[2], (self.batch, self.m))
+    self.b = self.b / jnp.sum(self.b, axis=-1, keepdims=True)
+
+  @pytest.mark.fast.with_args(num_slots=[None, 1, 3, 7], only_fast=-1)
+  def test_matches_vmap(self, num_slots: Optional[int]):
+    epsilon, threshold = 1e-1, 1e-4
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=epsilon)
+
+    out = jax.jit(
+        linear.solve_batch, static_argnames=["num_slots", "threshold"]
+    )(geom, b=self.b, num_slots=num_slots, threshold=threshold)
+
+    def solve(x: jnp.ndarray, y: jnp.ndarray, b: jnp.ndarray):
+      geom = pointcloud.PointCloud(x, y, epsilon=epsilon)
+      return linear.solve(geom, b=b, threshold=threshold)
+
+    expected = jax.vmap(solve)(self.x, self.y, self.b)
+
+    assert out.f.shape == (self.batch, self.n)
+    assert out.g.shape == (self.batch, self.m)
+    assert out.errors.shape == expected.errors.shape
+    np.testing.assert_array_equal(out.converged, expected.converged)
+    np.testing.assert_array_equal(out.n_iters, expected.n_iters)
+    np.testing.assert_allclose(out.f, expected.f, rtol=1e-4, atol=1e-4)
+    np.testing.assert_allclose(out.g, expected.g, rtol=1e-4, atol=1e-4)
+    np.testing.assert_allclose(
+        out.reg_ot_cost, expected.reg_ot_cost, rtol=1e-5, atol=1e-5
+    )
+
+  def test_per_problem_early_exit(self):
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=5e-2)
+    out = linear.solve_batch(
+        geom, b=self.b, num_slots=2, threshold=1e-3, max_iterations=5000
+    )
+
+    n_iters = np.asarray(out.n_iters)
+    assert n_iters.shape == (self.batch,)
+    assert np.all(out.converged)
+    # problems converge at different iterations and are not all run
+    # until the slowest one has converged
+    assert len(np.unique(n_iters)) > 1
+    assert np.all(n_iters % out.inner_iterations == 0)
+
+  def test_padded_problems(self):
+    n_valid = 8
+    a = jnp.zeros((self.batch, self.n)).at[:, :n_valid].set(1.0 / n_valid)
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=1e-1)
+
+    out = linear.solve_batch(geom, a=a, b=self.b, threshold=1e-4)
+
+    for i in range(self.batch):
+      geom_i = pointcloud.PointCloud(
+          self.x[i, :n_valid], self.y[i], epsilon=1e-1
+      )
+      expected = linear.solve(geom_i, b=self.b[i], threshold=1e-4)
+      np.testing.assert_allclose(out.g[i], expected.g, rtol=1e-4, atol=1e-4)
+      np.testing.assert_allclose(
+          out.f[i, :n_valid], expected.f, rtol=1e-4, atol=1e-4
+      )
+      assert jnp.all(jnp.isneginf(out.f[i, n_valid:]))
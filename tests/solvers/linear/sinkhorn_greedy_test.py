@@ -0,0 +1,96 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from ott.geometry import geometry, pointcloud
+from ott.problems.linear import linear_problem
+from ott.solvers import linear
+from ott.solvers.linear import sinkhorn_greedy
+
+
+class TestGreedySinkhorn:
+
+  @pytest.fixture(autouse=True)
+  def initialize(self, rng: jax.Array):
+    rngs = jax.random.split(rng, 4)
+    self.n, self.m, self.dim = 24, 19, 3
+    self.x = jax.random.normal(rngs[0], (self.n, self.dim))
+    self.y = jax.random.normal(rngs[1], (self.m, self.dim)) + 0.5
+    self.a = jax.random.uniform(rngs[2], (self.n,)) + 0.1
+    self.b = jax.random.uniform(rngs[3], (self.m,)) + 0.1
+    self.a = self.a / self.a.sum()
+    self.b = self.b / self.b.sum()
+
+  @pytest.mark.fast.with_args(
+      block_size=[1, 4, 100], dense=[False, True], only_fast=0
+  )
+  def test_matches_sinkhorn(self, block_size: int, dense: bool):
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=5e-2)
+    if dense:
+      geom = geometry.Geometry(geom.cost_matrix, epsilon=5e-2)
+    prob = linear_problem.LinearProblem(geom, a=self.a, b=self.b)
+    solver = sinkhorn_greedy.GreedySinkhorn(
+        block_size=block_size,
+        threshold=1e-4,
+        inner_iterations=20,
+        max_iterations=20000,
+    )
+
+    out = jax.jit(solver)(prob)
+    expected = linear.solve(geom, a=self.a, b=self.b, threshold=1e-4)
+
+    assert out.converged
+    np.testing.assert_allclose(
+        out.reg_ot_cost, expected.reg_ot_cost, rtol=1e-3, atol=1e-3
+    )
+    np.testing.assert_allclose(out.matrix.sum(1), self.a, rtol=1e-3, atol=1e-3)
+    np.testing.assert_allclose(out.matrix.sum(0), self.b, rtol=1e-3, atol=1e-3)
+
+  def test_full_blocks_fewer_iterations(self):
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=5e-2)
+    prob = linear_problem.LinearProblem(geom, a=self.a, b=self.b)
+    kwargs = {"inner_iterations": 1, "max_iterations": 5000}
+
+    solver = sinkhorn_greedy.GreedySinkhorn(
+        block_size=max(self.n, self.m), **kwargs
+    )
+    out_full = solver(prob)
+    out_greedy = sinkhorn_greedy.GreedySinkhorn(block_size=2, **kwargs)(prob)
+
+    assert out_full.converged
+    assert out_greedy.converged
+    assert out_full.n_iters < out_greedy.n_iters
+
+  def test_dense_lines_are_indexed(self):
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=5e-2)
+    geom = geometry.Geometry(geom.cost_matrix, epsilon=5e-2)
+    prob = linear_problem.LinearProblem(geom, a=self.a, b=self.b)
+    solver = sinkhorn_greedy.GreedySinkhorn(block_size=2)
+    state = solver.init_state(prob, (jnp.zeros(self.n), jnp.zeros(self.m)))
+
+    jaxpr = jax.make_jaxpr(lambda s: solver.lse_step(prob, s, 0))(state)
+
+    # the rows and columns of the cost are not computed with matrix products
+    assert "dot_general" not in str(jaxpr)
+
+  def test_unbalanced_not_supported(self):
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=5e-2)
+    prob = linear_problem.LinearProblem(geom, tau_a=0.9)
+
+    with pytest.raises(AssertionError, match=r"balanced"):
+      sinkhorn_greedy.GreedySinkhorn(block_size=2)(prob)
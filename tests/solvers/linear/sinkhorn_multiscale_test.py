@@ -0,0 +1,99 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Optional
+
+import pytest
+
+import jax
+import numpy as np
+
+from ott.geometry import pointcloud, truncated
+from ott.problems.linear import linear_problem
+from ott.solvers import linear
+from ott.solvers.linear import sinkhorn_multiscale
+
+
+class TestMultiscaleSinkhorn:
+
+  @pytest.fixture(autouse=True)
+  def initialize(self, rng: jax.Array):
+    rngs = jax.random.split(rng, 4)
+    self.n, self.m, self.dim = 64, 48, 2
+    self.x = jax.random.normal(rngs[0], (self.n, self.dim))
+    self.y = jax.random.normal(rngs[1], (self.m, self.dim)) + 1.0
+    self.a = jax.random.uniform(rngs[2], (self.n,)) + 0.1
+    self.b = jax.random.uniform(rngs[3], (self.m,)) + 0.1
+    self.a = self.a / self.a.sum()
+    self.b = self.b / self.b.sum()
+
+  @pytest.mark.fast.with_args(truncation_threshold=[None, 100.0], only_fast=-1)
+  def test_matches_single_scale(self, truncation_threshold: Optional[float]):
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=1e-2)
+    prob = linear_problem.LinearProblem(geom, a=self.a, b=self.b)
+    solver = sinkhorn_multiscale.MultiscaleSinkhorn(
+        num_clusters=(4, 16),
+        truncation_threshold=truncation_threshold,
+        kmeans_kwargs={"n_init": 2},
+    )
+
+    out = jax.jit(solver)(prob)
+    expected = linear.solve(geom, a=self.a, b=self.b)
+
+    assert out.converged
+    if truncation_threshold is None:
+      assert isinstance(out.geom, pointcloud.PointCloud)
+    else:
+      assert isinstance(out.geom, truncated.TruncatedGeometry)
+    np.testing.assert_allclose(
+        out.reg_ot_cost, expected.reg_ot_cost, rtol=1e-3, atol=1e-3
+    )
+    np.testing.assert_allclose(
+        out.matrix, expected.matrix, rtol=1e-3, atol=1e-3
+    )
+
+  def test_fewer_iterations(self):
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=1e-2)
+
+    out = linear.solve(
+        geom,
+        a=self.a,
+        b=self.b,
+        num_clusters=(8, 32),
+        truncation_threshold=None,
+        kmeans_kwargs={"n_init": 2},
+        max_iterations=5000,
+    )
+    expected = linear.solve(geom, a=self.a, b=self.b, max_iterations=5000)
+
+    assert isinstance(out.geom, pointcloud.PointCloud)
+    assert out.converged
+    assert out.n_iters < expected.n_iters
+
+  def test_init(self):
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=1e-2)
+    prob = linear_problem.LinearProblem(geom, a=self.a, b=self.b)
+    solver = sinkhorn_multiscale.MultiscaleSinkhorn(
+        num_clusters=(4,), kmeans_kwargs={"n_init": 2}
+    )
+    expected = linear.solve(geom, a=self.a, b=self.b)
+
+    # the aux data must be hashable for the solver to be passed to `jit`
+    out = jax.jit(lambda solver, prob, init: solver(prob, init=init)
+                 )(solver, prob, (expected.f, expected.g))
+
+    assert isinstance(out.geom, truncated.TruncatedGeometry)
+    assert out.n_iters <= solver.inner_iterations
+    np.testing.assert_allclose(
+        out.reg_ot_cost, expected.reg_ot_cost, rtol=1e-3, atol=1e-3
+    )
@@ -0,0 +1,94 @@
+# Copyright OTT-JAX
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+
+from ott.geometry import geometry, pointcloud
+from ott.problems.linear import linear_problem
+from ott.solvers import linear
+from ott.solvers.linear import sinkhorn, sinkhorn_screened
+
+
+class TestScreenedSinkhorn:
+
+  @pytest.fixture(autouse=True)
+  def initialize(self, rng: jax.Array):
+    rngs = jax.random.split(rng, 4)
+    self.n, self.m, self.dim = 40, 30, 2
+    self.x = jax.random.normal(rngs[0], (self.n, self.dim))
+    self.y = jax.random.normal(rngs[1], (self.m, self.dim)) + 0.5
+    # heavy-tailed weights, most of the mass is on a few points
+    self.a = jnp.exp(3.0 * jax.random.normal(rngs[2], (self.n,)))
+    self.b = jnp.exp(3.0 * jax.random.normal(rngs[3], (self.m,)))
+    self.a = self.a / self.a.sum()
+    self.b = self.b / self.b.sum()
+
+  @pytest.mark.fast.with_args(tau_a=[1.0, 0.9], dense=[False, True])
+  def test_no_screening(self, tau_a: float, dense: bool):
+    geom = pointcloud.PointCloud(
+        self.x, self.y, epsilon=1e-1, scale_cost="mean"
+    )
+    if dense:
+      geom = geometry.Geometry(geom.cost_matrix, epsilon=1e-1)
+
+    out = linear.solve_screened(
+        geom,
+        self.a,
+        self.b,
+        tau_a=tau_a,
+        num_active_a=self.n,
+        num_active_b=self.m
+    )
+    expected = linear.solve(geom, self.a, self.b, tau_a=tau_a)
+
+    assert out.converged
+    assert out.matrix.shape == (self.n, self.m)
+    np.testing.assert_allclose(out.f, expected.f, rtol=1e-3, atol=1e-3)
+    np.testing.assert_allclose(out.g, expected.g, rtol=1e-3, atol=1e-3)
+    np.testing.assert_allclose(
+        out.reg_ot_cost, expected.reg_ot_cost, rtol=1e-4, atol=1e-4
+    )
+
+  def test_screening(self):
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=1e-1)
+    prob = linear_problem.LinearProblem(geom, a=self.a, b=self.b)
+    num_active_a, num_active_b = self.n // 2, self.m // 2
+
+    screening = sinkhorn_screened.screen(prob, num_active_a, num_active_b)
+    out = jax.jit(
+        sinkhorn_screened.run_screened, static_argnums=(2, 3)
+    )(prob, sinkhorn.Sinkhorn(), num_active_a, num_active_b)
+    expected = linear.solve(geom, self.a, self.b)
+
+    assert screening.reduced_problem.geom.shape == (num_active_a, num_active_b)
+    np.testing.assert_allclose(
+        screening.reduced_problem.a.sum(), 1.0, rtol=1e-5
+    )
+    # the error is controlled by the mass of the inactive points
+    mass_out = self.a[screening.inactive_a].sum() + \
+        self.b[screening.inactive_b].sum()
+    assert out.converged
+    assert out.matrix.shape == (self.n, self.m)
+    np.testing.assert_allclose(
+        out.matrix.sum(1), self.a, rtol=0.0, atol=mass_out + 1e-3
+    )
+    np.testing.assert_allclose(
+        out.matrix.sum(0), self.b, rtol=0.0, atol=mass_out + 1e-3
+    )
+    np.testing.assert_allclose(
+        out.matrix, expected.matrix, rtol=0.0, atol=mass_out + 1e-3
+    )
@@ -13,6 +13,7 @@
 # limitations under the License.
 import functools
 import io
+import json
 import os
 import sys
 from typing import Optional, Tuple
@@ -30,7 +31,9 @@ from ott import utils
 from ott.geometry import costs, epsilon_scheduler, geometry, grid, pointcloud
 from ott.problems.linear import linear_problem
 from ott.solvers import linear
-from ott.solvers.linear import acceleration, sinkhorn
+from ott.solvers.linear import acceleration
+from ott.solvers.linear import implicit_differentiation as implicit_lib
+from ott.solvers.linear import sinkhorn
 
 
 class TestSinkhorn:
@@ -245,6 +248,92 @@ class TestSinkhorn:
     f_1, f_2 = out_1.f, out_2.f
     np.testing.assert_allclose(f_1, f_2, rtol=1e-4, atol=1e-4)
 
+  @pytest.mark.fast.with_args(lse_mode=[False, True], only_fast=1)
+  def test_adaptive_epsilon(self, lse_mode: bool):
+    """Check that adaptive epsilon converges to the same solution."""
+    target, threshold = 5e-2, 1e-4
+    epsilon = epsilon_scheduler.AdaptiveEpsilon(
+        target, init=100.0, decay=0.5, tol=1e-2
+    )
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=target)
+    geom_eps = pointcloud.PointCloud(self.x, self.y, epsilon=epsilon)
+
+    out = jax.jit(
+        linear.solve, static_argnames=["lse_mode", "threshold"]
+    )(geom_eps, self.a, self.b, lse_mode=lse_mode, threshold=threshold)
+    expected = linear.solve(
+        geom, self.a, self.b, lse_mode=lse_mode, threshold=threshold
+    )
+
+    errors = out.errors[out.errors > -1]
+    assert out.converged
+    # epsilon was decayed at least once before reaching the target
+    assert jnp.sum(errors < threshold) < jnp.sum(errors < 1e-2)
+    np.testing.assert_allclose(
+        out.reg_ot_cost, expected.reg_ot_cost, rtol=1e-3, atol=1e-3
+    )
+    np.testing.assert_allclose(
+        out.matrix, expected.matrix, rtol=1e-3, atol=1e-3
+    )
+
+  def test_adaptive_epsilon_relative(self):
+    """Check that a relative epsilon is not rescaled at every iteration."""
+    geom = pointcloud.PointCloud(
+        self.x, self.y, epsilon=1e-1, relative_epsilon="mean"
+    )
+    epsilon = epsilon_scheduler.AdaptiveEpsilon(geom.epsilon, init=10.0)
+    geom_eps = pointcloud.PointCloud(
+        self.x, self.y, epsilon=epsilon, relative_epsilon="mean"
+    )
+
+    out = linear.solve(geom_eps, self.a, self.b)
+    expected = linear.solve(geom, self.a, self.b)
+
+    assert out.converged
+    np.testing.assert_allclose(
+        out.reg_ot_cost, expected.reg_ot_cost, rtol=1e-3, atol=1e-3
+    )
+
+  def test_adaptive_epsilon_not_converged(self):
+    """Check that convergence requires the target epsilon to be reached."""
+    epsilon = epsilon_scheduler.AdaptiveEpsilon(
+        5e-2, init=1e4, decay=0.9, tol=1e-1
+    )
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=epsilon)
+
+    out = linear.solve(geom, self.a, self.b, max_iterations=50)
+
+    assert not out.converged
+    np.testing.assert_array_equal(out.errors > -1, True)
+
+  @pytest.mark.fast.with_args(lse_mode=[False, True], only_fast=1)
+  def test_reduced_precision(self, lse_mode: bool):
+    """Check that the reduced precision falls back to full precision."""
+    threshold = 1e-4
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=5e-2, batch_size=8)
+    geom_bf16 = pointcloud.PointCloud(
+        self.x,
+        self.y,
+        epsilon=5e-2,
+        batch_size=8,
+        compute_dtype=jnp.bfloat16,
+    )
+
+    out = linear.solve(
+        geom_bf16, self.a, self.b, lse_mode=lse_mode, threshold=threshold
+    )
+    expected = linear.solve(
+        geom, self.a, self.b, lse_mode=lse_mode, threshold=threshold
+    )
+
+    assert out.converged
+    np.testing.assert_allclose(
+        out.reg_ot_cost, expected.reg_ot_cost, rtol=1e-4, atol=1e-4
+    )
+    np.testing.assert_allclose(
+        out.matrix, expected.matrix, rtol=1e-3, atol=1e-3
+    )
+
   @pytest.mark.fast()
   def test_euclidean_point_cloud_min_iter(self):
     """Testing the min_iterations parameter."""
@@ -307,6 +396,39 @@ class TestSinkhorn:
     err = errors[errors > -1][-1]
     assert threshold > err
 
+  @pytest.mark.fast.with_args("batch_size", [None, 5], only_fast=0)
+  def test_fused_error(self, batch_size: Optional[int]):
+    """Test that the fused error is the error of the previous iterate."""
+    num_iters = 20
+    geom = pointcloud.PointCloud(
+        self.x, self.y, epsilon=0.1, batch_size=batch_size
+    )
+    solve_fn = functools.partial(
+        linear.solve,
+        geom,
+        a=self.a,
+        b=self.b,
+        threshold=0.0,
+        inner_iterations=1,
+        max_iterations=num_iters,
+    )
+
+    out = solve_fn()
+    out_fused = solve_fn(fused_error=True)
+
+    np.testing.assert_allclose(out.f, out_fused.f, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(out.g, out_fused.g, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(
+        out_fused.errors[1:], out.errors[:-1], rtol=1e-5, atol=1e-6
+    )
+
+    out_fused = linear.solve(
+        geom, a=self.a, b=self.b, threshold=1e-3, fused_error=True
+    )
+    assert out_fused.converged
+    err = out_fused.errors[out_fused.errors > -1][-1]
+    assert err < 1e-3
+
   @pytest.mark.fast.with_args("lse_mode", [False, True], only_fast=0)
   def test_online_vs_batch_euclidean_point_cloud(self, lse_mode: bool):
     """Comparing online vs batch geometry."""
@@ -744,6 +866,179 @@ class TestSinkhorn:
         for _ in range(1, num_iterations // inner_iterations + 1)
     ]
 
+  @pytest.mark.fast.with_args(jit=[False, True], only_fast=0)
+  def test_telemetry(self, jit: bool):
+    stream = io.StringIO()
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=1e-2)
+    prob = linear_problem.LinearProblem(geom, a=self.a, b=self.b)
+
+    with utils.Telemetry(every=2, sinks=[utils.JSONLinesSink(stream)]) as tel:
+      solver = sinkhorn.Sinkhorn(
+          inner_iterations=5, max_iterations=40, threshold=-1.0, telemetry=tel
+      )
+      out = jax.jit(solver)(prob) if jit else solver(prob)
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [r["evaluation"] for r in records] == [0, 2, 4, 6]
+    assert [r["iteration"] for r in records] == [4, 14, 24, 34]
+    assert records[0]["block_time"] is None
+    assert all(r["block_time"] >= 0.0 for r in records[1:])
+    assert all(r["solver"] == "Sinkhorn" for r in records)
+    np.testing.assert_allclose([r["error"] for r in records],
+                               out.errors[::2],
+                               rtol=1e-5)
+    np.testing.assert_allclose([r["epsilon"] for r in records], 1e-2)
+    # 2 kernel applications per iteration, 1 per error evaluation
+    assert records[-1]["num_kernel_evals"] == 2 * 35 + 7
+
+  @pytest.mark.fast.with_args(lse_mode=[False, True], only_fast=1)
+  def test_track_stats(self, lse_mode: bool):
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=1e-1)
+    prob = linear_problem.LinearProblem(geom, a=self.a, b=self.b)
+
+    def solve(
+        max_iterations: int, track_stats: bool
+    ) -> sinkhorn.SinkhornOutput:
+      solver = sinkhorn.Sinkhorn(
+          lse_mode=lse_mode,
+          threshold=-1.0,
+          inner_iterations=5,
+          max_iterations=max_iterations,
+          track_stats=track_stats,
+      )
+      return jax.jit(solver)(prob)
+
+    out_20, out_40 = solve(20, True), solve(40, True)
+    expected = solve(40, False)
+
+    assert expected.stats is None
+    np.testing.assert_array_equal(out_40.f, expected.f)
+    np.testing.assert_array_equal(out_40.g, expected.g)
+    # 2 applications per iteration, 1 per error evaluation
+    num_evals = out_40.stats.num_lse_kernel + out_40.stats.num_kernel
+    num_evals -= out_20.stats.num_lse_kernel + out_20.stats.num_kernel
+    assert num_evals == 2 * 20 + 20 // 5
+    if lse_mode:
+      assert out_40.stats.num_kernel == out_20.stats.num_kernel
+    else:
+      assert out_40.stats.num_lse_kernel == out_20.stats.num_lse_kernel
+    assert out_40.stats.flops > out_20.stats.flops > 0.0
+
+  @pytest.mark.parametrize(("batch_size", "dense"), [(None, False), (5, False),
+                                                     (None, True)])
+  def test_streaming_coupling(self, batch_size: Optional[int], dense: bool):
+    geom = pointcloud.PointCloud(
+        self.x, self.y, epsilon=1e-1, batch_size=batch_size
+    )
+    if dense:
+      geom = geometry.Geometry(geom.cost_matrix, epsilon=1e-1)
+    out = linear.solve(geom, self.a, self.b)
+    matrix = out.matrix
+
+    values, col_ixs = out.top_k(3, batch_size=batch_size)
+    expected_values, expected_ixs = jax.lax.top_k(matrix, 3)
+    np.testing.assert_allclose(values, expected_values, rtol=1e-5, atol=1e-7)
+    np.testing.assert_array_equal(col_ixs, expected_ixs)
+    np.testing.assert_array_equal(
+        out.argmax(batch_size=batch_size), jnp.argmax(matrix, axis=1)
+    )
+
+    y = jax.random.normal(self.rng, (self.m, 2))
+    if not dense:
+      np.testing.assert_allclose(
+          out.barycentric_projection(),
+          (matrix @ self.y) / matrix.sum(1, keepdims=True),
+          rtol=1e-4,
+          atol=1e-4,
+      )
+    np.testing.assert_allclose(
+        out.barycentric_projection(y),
+        (matrix @ y) / matrix.sum(1, keepdims=True),
+        rtol=1e-4,
+        atol=1e-4,
+    )
+
+    num_samples = 200_000
+    row_ixs, col_ixs = out.sample(self.rng, num_samples, batch_size=batch_size)
+    counts = jnp.zeros_like(matrix).at[row_ixs, col_ixs].add(1.0)
+    np.testing.assert_allclose(
+        counts / num_samples, matrix / matrix.sum(), atol=5e-3
+    )
+
+  @pytest.mark.parametrize("kind", ["pointcloud", "cost", "kernel", "lrc"])
+  @pytest.mark.parametrize("axis", [0, 1])
+  def test_cost_lines(self, kind: str, axis: int):
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=1e-1, scale_cost=2.0)
+    if kind == "cost":
+      geom = geometry.Geometry(geom.cost_matrix, epsilon=1e-1, scale_cost=0.5)
+    elif kind == "kernel":
+      geom = geometry.Geometry(kernel_matrix=geom.kernel_matrix, epsilon=1e-1)
+    elif kind == "lrc":
+      geom = geom.to_LRCGeometry()
+    ids = jnp.array([3, 0, 3])
+    cost = geom.cost_matrix
+
+    lines_fn = functools.partial(sinkhorn._cost_lines, ids=ids, axis=axis)
+    expected = cost[ids] if axis == 1 else cost[:, ids].T
+    np.testing.assert_allclose(lines_fn(geom), expected, rtol=1e-5, atol=1e-5)
+    if kind == "cost":
+      # the lines are indexed, not computed with a matrix product
+      assert "dot_general" not in str(jax.make_jaxpr(lines_fn)(geom))
+
+  @pytest.mark.parametrize("batch_size", [None, 5])
+  def test_sample_without_replacement(self, batch_size: Optional[int]):
+    geom = pointcloud.PointCloud(
+        self.x, self.y, epsilon=1e-1, batch_size=batch_size
+    )
+    out = linear.solve(geom, self.a, self.b)
+    matrix = out.matrix
+
+    num_samples = 100
+    row_ixs, col_ixs = out.sample(
+        self.rng, num_samples, batch_size=batch_size, replace=False
+    )
+    pairs = np.asarray(row_ixs) * self.m + np.asarray(col_ixs)
+    assert np.unique(pairs).shape == (num_samples,)
+    assert np.all(matrix[row_ixs, col_ixs] > 0.0)
+
+    # the first pair is distributed according to the coupling
+    num_draws = 20_000
+    rngs = jax.random.split(self.rng, num_draws)
+    sample = functools.partial(
+        out.sample, num_samples=1, batch_size=batch_size, replace=False
+    )
+    row_ixs, col_ixs = jax.vmap(sample)(rngs)
+    counts = jnp.zeros_like(matrix).at[row_ixs[:, 0], col_ixs[:, 0]].add(1.0)
+    np.testing.assert_allclose(
+        counts / num_draws, matrix / matrix.sum(), atol=1e-2
+    )
+
+  @pytest.mark.parametrize("implicit", [False, True])
+  def test_static_error_flags(self, implicit: bool):
+    geom = pointcloud.PointCloud(self.x, self.y, epsilon=1e-1)
+    prob = linear_problem.LinearProblem(geom, a=self.a, b=self.b)
+
+    def loss(x: jnp.ndarray, inner_iterations: int) -> float:
+      geom = pointcloud.PointCloud(x, self.y, epsilon=1e-1)
+      prob = linear_problem.LinearProblem(geom, a=self.a, b=self.b)
+      solver = sinkhorn.Sinkhorn(
+          threshold=-1.0,
+          inner_iterations=inner_iterations,
+          max_iterations=20,
+          implicit_diff=implicit_lib.ImplicitDiff() if implicit else None,
+      )
+      return solver(prob).reg_ot_cost
+
+    # with `inner_iterations=1`, the error is computed without a conditional
+    solver = sinkhorn.Sinkhorn(threshold=-1.0, inner_iterations=1)
+    out = jax.jit(solver)(prob)
+    assert out.errors.shape == (solver.max_iterations,)
+    assert jnp.all(out.errors > 0.0)
+
+    grad_1 = jax.grad(loss)(self.x, 1)
+    grad_5 = jax.grad(loss)(self.x, 5)
+    np.testing.assert_allclose(grad_1, grad_5, rtol=1e-4, atol=1e-4)
+
   @pytest.mark.skipif(
       sys.platform == "darwin" and os.environ.get("CI", "false") == "true",
       reason="Segfaults on macOS 14."
@@ -19,6 +19,7 @@ import jax
 import jax.numpy as jnp
 import numpy as np
 
+from ott import utils
 from ott.geometry import pointcloud
 from ott.problems.quadratic import gw_barycenter as gwb
 from ott.solvers.linear import sinkhorn
@@ -124,6 +125,36 @@ class TestGWBarycenter:
         atol=tol
     )
 
+  def test_telemetry(self, rng: jax.Array):
+    num_per_segment = (9, 11)
+    rngs = jax.random.split(rng, len(num_per_segment))
+    ys = jnp.concatenate([
+        self.random_pc(n, d=self.ndim, rng=rng).x
+        for n, rng in zip(num_per_segment, rngs)
+    ])
+    bs = jnp.concatenate([jnp.ones(n) / n for n in num_per_segment])
+    problem = gwb.GWBarycenterProblem(
+        y=ys, b=bs, num_per_segment=num_per_segment
+    )
+
+    with utils.Telemetry() as tel:
+      quadratic_solver = gromov_wasserstein.GromovWasserstein(
+          sinkhorn.Sinkhorn()
+      )
+      solver = gwb_solver.GromovWassersteinBarycenter(
+          quadratic_solver, min_iterations=3, max_iterations=3, telemetry=tel
+      )
+      out = jax.jit(solver, static_argnames=["bar_size"])(problem, bar_size=8)
+
+    records = tel.drain()
+    assert [r["iteration"] for r in records] == list(range(3))
+    assert all(r["solver"] == "GromovWassersteinBarycenter" for r in records)
+    np.testing.assert_allclose([r["cost"] for r in records],
+                               out.costs,
+                               rtol=1e-5)
+    np.testing.assert_array_equal([r["gw_converged"] for r in records],
+                                  out.gw_convergence)
+
   @pytest.mark.fast(
       "jit,fused_penalty,scale_cost", [(False, 1.5, "mean"),
                                        (True, 3.1, "max_cost")],
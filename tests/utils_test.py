@@ -12,6 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import functools
+import io
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import textwrap
 from typing import Any, Optional
 
 import pytest
@@ -22,6 +29,8 @@ import jax.numpy as jnp
 import numpy as np
 
 from ott import utils
+from ott.geometry import pointcloud
+from ott.solvers import linear
 
 
 @pytest.mark.fast()
@@ -222,3 +231,94 @@ def test_deprecation_warning(version: Optional[str], msg: Optional[str]):
   with pytest.warns(DeprecationWarning, match=expected_msg):
     res = func()
   assert res == 42
+
+
+class TestTelemetry:
+
+  def test_ring_buffer(self):
+    tel = utils.Telemetry(every=3, capacity=4)
+
+    @jax.jit
+    def fn(x: jnp.ndarray) -> jnp.ndarray:
+
+      def body(i: int, x: jnp.ndarray) -> jnp.ndarray:
+        x = 0.5 * x
+        tel.record("foo", i, {"x": x}, when=i % 2 == 1)
+        return x
+
+      return jax.lax.fori_loop(0, 30, body, x)
+
+    _ = fn(1.0)
+    tel.flush()
+    records = tel.drain()
+
+    # odd multiples of 3 in [0, 30): 3, 9, 15, 21, 27
+    assert tel.num_dropped == 1
+    assert [r["evaluation"] for r in records] == [9, 15, 21, 27]
+    np.testing.assert_allclose([r["x"] for r in records],
+                               [0.5 ** (i + 1) for i in [9, 15, 21, 27]])
+    assert all(r["block_time"] >= 0.0 for r in records)
+    assert tel.drain() == []
+
+  def test_sinks(self):
+    batches = []
+    stream = io.StringIO()
+    sink = utils.JSONLinesSink(stream)
+
+    with utils.Telemetry(sinks=[batches.append, sink]) as tel:
+      for i in range(5):
+        tel.record("bar", i, {"y": 2.0 * i})
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [r["y"] for r in records] == [0.0, 2.0, 4.0, 6.0, 8.0]
+    assert sum(batches, []) == records
+    assert tel.drain() == []
+
+
+class TestPrecompile:
+
+  def test_precompile(self, rng: jax.Array):
+    rng_x, rng_y = jax.random.split(rng)
+    x = jax.random.normal(rng_x, (13, 3))
+    y = jax.random.normal(rng_y, (11, 3))
+    spec_x = jax.ShapeDtypeStruct(x.shape, x.dtype)
+    spec_y = jax.ShapeDtypeStruct(y.shape, y.dtype)
+
+    solve = utils.precompile(
+        linear.solve,
+        pointcloud.PointCloud(spec_x, spec_y, epsilon=1e-1),
+        max_iterations=50,
+    )
+    geom = pointcloud.PointCloud(x, y, epsilon=1e-1)
+    out = solve(geom)
+    expected = linear.solve(geom, max_iterations=50)
+
+    np.testing.assert_allclose(out.f, expected.f, rtol=1e-5, atol=1e-5)
+    np.testing.assert_allclose(out.g, expected.g, rtol=1e-5, atol=1e-5)
+
+  def test_compilation_cache(self, tmp_path: pathlib.Path):
+    # the cache is set up on the first compilation, run in a fresh process
+    script = textwrap.dedent(
+        """
+        import sys
+
+        import jax
+        import jax.numpy as jnp
+
+        from ott import utils
+
+        # importing ott does not enable the cache
+        assert jax.config.jax_compilation_cache_dir is None
+        utils.enable_compilation_cache(sys.argv[1])
+        compiled = utils.precompile(
+            lambda x: jnp.sin(x) ** 2, jax.ShapeDtypeStruct((7,), jnp.float32)
+        )
+        compiled(jnp.ones(7)).block_until_ready()
+        """
+    )
+    cache_dir = tmp_path / "cache"
+    env = {k: v for k, v in os.environ.items() if not k.startswith("JAX_")}
+    cmd = [sys.executable, "-c", script, str(cache_dir)]
+    subprocess.run(cmd, check=True, env=env)
+
+    assert os.listdir(cache_dir)